@@ -3,7 +3,10 @@ import os
 from pathlib import Path
 from typing import List, Optional
 from pydantic import BaseModel, Field, validator
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
+
+# Variables set by the process environment take precedence over .env, also on reload
+_PROCESS_ENV = frozenset(os.environ)
 
 # Load environment variables
 load_dotenv()
@@ -117,6 +120,15 @@ def get_settings() -> Settings:
         settings = Settings.load_from_env()
     return settings
 
+def reload_settings() -> Settings:
+    """Re-read settings from the environment and .env file"""
+    global settings
+    for key, value in dotenv_values().items():
+        if key not in _PROCESS_ENV and value is not None:
+            os.environ[key] = value
+    settings = Settings.load_from_env()
+    return settings
+
 def load_settings() -> dict:
     """Load settings as dictionary (backward compatibility)"""
     settings_obj = get_settings()
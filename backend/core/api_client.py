@@ -4,10 +4,15 @@ import json
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-import aiohttp
-from aiohttp import ClientTimeout, ClientError
+import httpx
 import backoff
-# Removed AsyncOpenAI - using direct aiohttp calls for better OpenRouter compatibility
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+# Removed AsyncOpenAI - using direct httpx calls for better OpenRouter compatibility
 
 from config.settings import get_settings
 from core.cache_manager import CacheManager
@@ -48,12 +53,30 @@ class OpenRouterClient:
             "X-Title": "Foresight Analyzer"
         }
 
-    @backoff.on_exception(
-        backoff.expo,
-        (ClientError, asyncio.TimeoutError),
-        max_tries=3,
-        max_time=60
-    )
+        # Shared HTTP client, opened on first use so it binds to the running loop.
+        # With HTTP/2 concurrent queries are multiplexed over one connection.
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it if needed"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=32,
+                    keepalive_expiry=60
+                )
+            )
+        return self._http
+
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+
     async def query_model(
         self,
         model: str,
@@ -85,6 +108,42 @@ class OpenRouterClient:
                 cached_response['response_source'] = 'cache'
                 return cached_response
 
+        result = await self._query_model_uncached(model, prompt, temperature, max_tokens, enable_web_search)
+
+        # Cache the successful response
+        if self.cache and result["status"] == "success":
+            self.cache.set(model, prompt, result)
+            logger.debug(f"Cached response for {model}")
+
+        return result
+
+    @backoff.on_exception(
+        backoff.expo,
+        (httpx.TransportError, asyncio.TimeoutError),
+        max_tries=3,
+        max_time=60
+    )
+    async def _query_model_uncached(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        enable_web_search: bool
+    ) -> Dict[str, Any]:
+        """
+        Query a model through the API, bypassing the cache
+
+        Args:
+            model: Model identifier (e.g., 'openai/gpt-4')
+            prompt: The prompt to send
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            enable_web_search: Enable web search for current information
+
+        Returns:
+            Response dictionary with model output and metadata
+        """
         # Apply model-specific token requirements
         # Model-specific token adjustments - Increased for better detailed responses
         if 'gemini' in model.lower() or 'gemma' in model.lower():
@@ -135,19 +194,17 @@ class OpenRouterClient:
             }
 
             # Make direct HTTP call to OpenRouter
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json=request_body,
-                    timeout=ClientTimeout(total=self.timeout)
-                ) as response:
-                    response_data = await response.json()
-
-                    # Check for errors
-                    if response.status != 200:
-                        error_msg = response_data.get('error', {}).get('message', 'Unknown error')
-                        raise Exception(f"API error {response.status}: {error_msg}")
+            response = await self._get_http().post(
+                f"{self.base_url}/chat/completions",
+                headers=self.headers,
+                json=request_body
+            )
+            response_data = response.json()
+
+            # Check for errors
+            if response.status_code != 200:
+                error_msg = response_data.get('error', {}).get('message', 'Unknown error')
+                raise Exception(f"API error {response.status_code}: {error_msg}")
 
             # Calculate response time
             response_time = (datetime.now() - start_time).total_seconds()
@@ -241,14 +298,9 @@ class OpenRouterClient:
                 "response_source": "api"
             }
 
-            # Cache the successful response
-            if self.cache and result["status"] == "success":
-                self.cache.set(model, prompt, result)
-                logger.debug(f"Cached response for {model}")
-
             return result
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, httpx.TimeoutException):
             logger.error(f"Timeout querying {model}")
             return {
                 "model": model,
@@ -682,14 +734,13 @@ class OpenRouterClient:
             List of model identifiers
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/models",
-                    headers={"Authorization": f"Bearer {self.api_key}"}
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [model["id"] for model in data.get("data", [])]
+            response = await self._get_http().get(
+                f"{self.base_url}/models",
+                headers={"Authorization": f"Bearer {self.api_key}"}
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return [model["id"] for model in data.get("data", [])]
         except Exception as e:
             logger.error(f"Failed to fetch models: {e}")
 
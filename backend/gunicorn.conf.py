@@ -0,0 +1,19 @@
+"""Gunicorn configuration for the Foresight Analyzer API"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+worker_connections = 1000
+
+# Forecast state is only shared between workers through Redis; without it,
+# status polls must land on the worker that started the forecast.
+workers = int(os.getenv(
+    "WEB_CONCURRENCY",
+    multiprocessing.cpu_count() if os.getenv("REDIS_URL") else 1
+))
+
+# Forecasts run inside the worker, so give long model calls room to finish
+timeout = 180
+graceful_timeout = 30
+keepalive = 5
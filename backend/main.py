@@ -2,19 +2,31 @@
 FastAPI Backend for Foresight Analyzer Web Application
 Integrates the real AI forecasting system with web interface
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict, Any, AsyncIterator, Sequence, Tuple
+from cachetools import TTLCache
 import uuid
 import asyncio
 import os
 import sys
 import json
+import orjson
+import hashlib
+import tempfile
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
+from functools import lru_cache
 from datetime import datetime
+from io import BytesIO
 from pathlib import Path
-import tempfile
 import threading
 import time
 
@@ -25,49 +37,147 @@ sys.path.append(str(current_dir))
 # Import the real forecasting components
 from core.api_client import OpenRouterClient
 from core.ensemble_manager import EnsembleManager
-from core.statistics import calculate_ensemble_probability, calculate_model_statistics
+from core.statistics import calculate_model_statistics
+from core.models import ForecastMetadata, ForecastResult, ModelResponse, ResponseStatus
 from config.prompts import PromptTemplates
-from config.settings import load_settings
+from config.settings import load_settings, reload_settings
 from analysis.aggregator import ForecastAggregator
 from export.excel_exporter import ExcelExporter
 from utils.logging import setup_logger
+from utils.forecast_store import ForecastStore
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Foresight Analyzer API",
     description="AI-powered probabilistic forecasting using ensemble methods",
-    version="2.0.1"  # Force redeploy with new API key
+    version="2.0.1",  # Force redeploy with new API key
+    default_response_class=ORJSONResponse
 )
 
-# Configure CORS
+# Configure CORS; CORS_ORIGINS takes a comma-separated list of frontend origins
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        'CORS_ORIGINS',
+        'https://foresight-analyzer.netlify.app,http://localhost:3000'
+    ).split(',')
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure for production
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,
 )
 
 # Global state
-running_forecasts = {}
+# Finished forecasts are evicted after an hour; the cap bounds memory under load
+running_forecasts: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+forecast_listeners: Dict[str, set] = {}
+forecast_tasks: Dict[str, asyncio.Task] = {}
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
 logger = setup_logger("foresight_api")
 settings = load_settings()
 
+# Settings-derived constants, parsed once (and again by /api/models/reload)
+ENABLED_MODELS: Tuple[str, ...] = ()
+DEFAULT_ITERATIONS = 5
+CONCURRENT_REQUESTS = 3
+REQUEST_TIMEOUT = 120.0
+
+def apply_settings(loaded: Dict[str, str]):
+    """Derive the module-level constants from a settings dictionary"""
+    global settings, ENABLED_MODELS, DEFAULT_ITERATIONS, CONCURRENT_REQUESTS, REQUEST_TIMEOUT
+    settings = loaded
+    ENABLED_MODELS = tuple(m.strip() for m in loaded.get('ENABLED_MODELS', '').split(',') if m.strip())
+    DEFAULT_ITERATIONS = int(loaded.get('ITERATIONS_PER_MODEL', 5))
+    CONCURRENT_REQUESTS = int(loaded.get('CONCURRENT_REQUESTS', 3))
+    REQUEST_TIMEOUT = float(loaded.get('REQUEST_TIMEOUT', 120))
+
+apply_settings(settings)
+forecast_store = ForecastStore(os.getenv('REDIS_URL'), ttl=int(os.getenv('FORECAST_TTL_SECONDS', 3600)))
+
+async def get_forecast_state(forecast_id: str) -> Optional[Dict[str, Any]]:
+    """Look up a forecast on this worker, falling back to the shared store"""
+    if forecast_id in running_forecasts:
+        return running_forecasts[forecast_id]
+    return await forecast_store.load(forecast_id)
+
+async def update_forecast(forecast_id: str, coalesce: bool = False, **fields) -> bool:
+    """
+    Apply a state change to a forecast and mirror it to the shared store
+
+    Returns True if another worker asked for the forecast to be cancelled.
+    """
+    state = running_forecasts.get(forecast_id)
+    if state is None:
+        # Evicted while running; nothing left to report to
+        return False
+    state.update(fields)
+    running_forecasts[forecast_id] = state  # refresh TTL
+    for event in forecast_listeners.get(forecast_id, ()):
+        event.set()
+    return await forecast_store.save(forecast_id, state, coalesce=coalesce)
+
+def forecast_snapshot(forecast_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a forecast's state, shaped like ForecastStatus"""
+    return {
+        "forecast_id": forecast_id,
+        "status": state["status"],
+        "progress": state["progress"],
+        "result": state["result"],
+        "error": state["error"]
+    }
+
+def forecast_event(forecast_id: str, state: Dict[str, Any]) -> str:
+    """Format a forecast status snapshot as a server-sent event"""
+    payload = forecast_snapshot(forecast_id, state)
+    return f"data: {orjson.dumps(payload, default=str).decode()}\n\n"
+
+# Coarse timestamp for the hot informational endpoints, refreshed by _tick()
+TICK_INTERVAL = 0.1
+_now_iso = datetime.now().isoformat()
+
+async def _tick():
+    """Refresh the cached timestamp every TICK_INTERVAL seconds"""
+    global _now_iso
+    while True:
+        _now_iso = datetime.now().isoformat()
+        await asyncio.sleep(TICK_INTERVAL)
+
+def get_client(request: Request) -> OpenRouterClient:
+    """Shared OpenRouter client created at startup"""
+    client = getattr(request.app.state, "client", None)
+    if client is None:
+        raise HTTPException(status_code=503, detail="OpenRouter client unavailable")
+    return client
+
 # Request/Response Models
+MAX_ITERATIONS = 100  # same bound as the ITERATIONS_PER_MODEL setting
+
 class ForecastRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True, str_max_length=8192)
+
     question: str
     definition: Optional[str] = ""
     timeframe: Optional[str] = "2026"
-    iterations: Optional[int] = 5
+    iterations: Optional[int] = Field(default=5, ge=1, le=MAX_ITERATIONS)
     models: Optional[List[str]] = None
 
 class ForecastResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     success: bool
     forecast_id: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
 class ForecastStatus(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     forecast_id: str
     status: str  # "running", "completed", "failed"
     progress: int  # 0-100
@@ -78,33 +188,44 @@ class ForecastStatus(BaseModel):
 @app.get("/api/models")
 async def get_available_models():
     """Get list of available AI models"""
-    enabled_models = settings.get('ENABLED_MODELS', '').split(',')
     return {
-        "models": [model.strip() for model in enabled_models if model.strip()],
-        "default_iterations": settings.get('ITERATIONS_PER_MODEL', 5)
+        "models": ENABLED_MODELS,
+        "default_iterations": DEFAULT_ITERATIONS
+    }
+
+@app.post("/api/models/reload")
+async def reload_models():
+    """Re-read model configuration from the environment"""
+    reload_settings()
+    apply_settings(load_settings())
+    logger.info(f"🔄 Reloaded settings: {len(ENABLED_MODELS)} models enabled")
+    return {
+        "models": ENABLED_MODELS,
+        "default_iterations": DEFAULT_ITERATIONS,
+        "concurrent_requests": CONCURRENT_REQUESTS
     }
 
 # Root endpoint with API information
 @app.get("/")
 async def root():
     """Root endpoint - API information and available endpoints"""
-    enabled_models = settings.get('ENABLED_MODELS', '').split(',')
     return {
         "message": "Foresight Analyzer API",
         "description": "AI-powered probabilistic forecasting using ensemble methods",
         "version": "2.0.1",
         "status": "online",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _now_iso,
         "endpoints": {
             "health": "/health",
             "models": "/api/models",
             "forecast": "/api/forecast",
+            "forecast_events": "/api/forecast/{forecast_id}/events",
             "simple_forecast": "/forecast",
             "docs": "/docs",
             "redoc": "/redoc"
         },
         "capabilities": {
-            "enabled_models": len([m.strip() for m in enabled_models if m.strip()]),
+            "enabled_models": len(ENABLED_MODELS),
             "ensemble_forecasting": True,
             "excel_export": True,
             "background_processing": True
@@ -123,7 +244,7 @@ async def docs_redirect():
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": _now_iso}
 
 # Debug endpoint
 @app.get("/debug/config")
@@ -135,8 +256,8 @@ async def debug_config():
     return {
         "api_key_configured": bool(api_key and api_key != 'NOT_SET' and api_key != 'your_openrouter_api_key_here'),
         "api_key_prefix": api_key[:10] + "..." if api_key and len(api_key) > 10 else api_key,
-        "enabled_models": settings.get('ENABLED_MODELS', '').split(','),
-        "iterations_per_model": settings.get('ITERATIONS_PER_MODEL', '10'),
+        "enabled_models": ENABLED_MODELS,
+        "iterations_per_model": DEFAULT_ITERATIONS,
         "environment": {
             "OPENROUTER_API_KEY1": bool(os.getenv('OPENROUTER_API_KEY1')),
             "BACKEND_URL": os.getenv('BACKEND_URL', 'NOT_SET')
@@ -145,7 +266,10 @@ async def debug_config():
 
 # Main forecast endpoint
 @app.post("/api/forecast", response_model=ForecastResponse)
-async def create_forecast(request: ForecastRequest, background_tasks: BackgroundTasks):
+async def create_forecast(
+    request: ForecastRequest,
+    client: OpenRouterClient = Depends(get_client)
+):
     """Create a new forecast using the real AI system"""
     try:
         forecast_id = str(uuid.uuid4())
@@ -158,17 +282,20 @@ async def create_forecast(request: ForecastRequest, background_tasks: Background
             "error": None,
             "start_time": datetime.now()
         }
+        await forecast_store.save(forecast_id, running_forecasts[forecast_id])
 
-        # Start forecast in background
-        background_tasks.add_task(
-            run_forecast,
+        # Start forecast immediately; keep a reference so it can be cancelled
+        task = asyncio.create_task(run_forecast(
+            client,
             forecast_id,
             request.question,
             request.definition or "",
             request.timeframe or "2026",
-            request.iterations or 5,
+            request.iterations or DEFAULT_ITERATIONS,
             request.models
-        )
+        ))
+        forecast_tasks[forecast_id] = task
+        task.add_done_callback(lambda _: forecast_tasks.pop(forecast_id, None))
 
         return ForecastResponse(
             success=True,
@@ -186,44 +313,137 @@ async def create_forecast(request: ForecastRequest, background_tasks: Background
 @app.get("/api/forecast/{forecast_id}", response_model=ForecastStatus)
 async def get_forecast_status(forecast_id: str):
     """Get the status of a running forecast"""
-    if forecast_id not in running_forecasts:
+    forecast_data = await get_forecast_state(forecast_id)
+    if forecast_data is None:
         raise HTTPException(status_code=404, detail="Forecast not found")
 
-    forecast_data = running_forecasts[forecast_id]
-    return ForecastStatus(
-        forecast_id=forecast_id,
-        status=forecast_data["status"],
-        progress=forecast_data["progress"],
-        result=forecast_data["result"],
-        error=forecast_data["error"]
+    # The stored state is built by this module, so skip re-validating the result
+    return ORJSONResponse(forecast_snapshot(forecast_id, forecast_data))
+
+# Forecast progress stream
+@app.get("/api/forecast/{forecast_id}/events")
+async def stream_forecast_events(forecast_id: str):
+    """Stream forecast status updates as server-sent events until it finishes"""
+    if await get_forecast_state(forecast_id) is None:
+        raise HTTPException(status_code=404, detail="Forecast not found")
+
+    async def local_events():
+        event = asyncio.Event()
+        listeners = forecast_listeners.setdefault(forecast_id, set())
+        listeners.add(event)
+        try:
+            while True:
+                event.clear()
+                state = running_forecasts.get(forecast_id)
+                if state is None:
+                    break
+                yield forecast_event(forecast_id, state)
+                if state["status"] in TERMINAL_STATUSES:
+                    break
+                await event.wait()
+        finally:
+            listeners.discard(event)
+            if not listeners:
+                forecast_listeners.pop(forecast_id, None)
+
+    async def remote_events():
+        # Forecast runs on another worker; follow it through the shared store
+        while (state := await forecast_store.load(forecast_id)) is not None:
+            yield forecast_event(forecast_id, state)
+            if state["status"] in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(1)
+
+    events = local_events() if forecast_id in running_forecasts else remote_events()
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+_RESPONSE_STATUSES = {status.value: status for status in ResponseStatus}
+
+def _forecast_result_model(state: Dict[str, Any]) -> ForecastResult:
+    """Rebuild the exporter's ForecastResult from a completed forecast's stored state"""
+    result = state["result"]
+    generated_at = result["generated_at"]
+
+    # Number each model's samples in completion order
+    iterations: Dict[str, int] = {}
+    responses = []
+    for r in result.get("detailed_results", []):
+        model = r["model"]
+        iteration = iterations[model] = iterations.get(model, 0) + 1
+        responses.append(ModelResponse(
+            model=model,
+            iteration=iteration,
+            ensemble_id=f"{model}_{iteration}",
+            timestamp=generated_at,
+            response_time=0.0,
+            status=_RESPONSE_STATUSES.get(r.get("status"), ResponseStatus.ERROR),
+            content=r.get("content"),
+            probability=r.get("probability"),
+            error=r.get("error"),
+            question=result["question"],
+            definition=result.get("definition"),
+            timeframe=result.get("timeframe")
+        ))
+
+    start_time = str(state.get("start_time") or generated_at)
+    end_time = str(state.get("end_time") or generated_at)
+    metadata = ForecastMetadata(
+        question=result["question"],
+        definition=result.get("definition") or "",
+        timeframe=result.get("timeframe"),
+        models=result["statistics"]["models_used"],
+        iterations_per_model=result.get("iterations", DEFAULT_ITERATIONS),
+        total_queries=result["statistics"].get("total_queries", len(responses)),
+        start_time=start_time,
+        end_time=end_time,
+        duration_seconds=(
+            datetime.fromisoformat(end_time) - datetime.fromisoformat(start_time)
+        ).total_seconds()
     )
 
+    return ForecastResult(
+        metadata=metadata,
+        prompt=forecaster_prompt(result["question"], result.get("definition") or "", result.get("timeframe") or "2026"),
+        responses=responses,
+        statistics=ForecastAggregator().aggregate_results(responses)
+    )
+
+def _render_excel(state_json: bytes) -> bytes:
+    """Build the Excel report for a serialized forecast state (runs in the process pool)"""
+    forecast_result = _forecast_result_model(orjson.loads(state_json))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = ExcelExporter().export_forecast(forecast_result, filename="report.xlsx", output_dir=Path(tmp_dir))
+        return path.read_bytes()
+
 # Excel export endpoint
 @app.get("/api/forecast/{forecast_id}/excel")
 async def download_excel_report(forecast_id: str):
     """Download Excel report for a completed forecast"""
-    if forecast_id not in running_forecasts:
+    forecast_data = await get_forecast_state(forecast_id)
+    if forecast_data is None:
         raise HTTPException(status_code=404, detail="Forecast not found")
 
-    forecast_data = running_forecasts[forecast_id]
     if forecast_data["status"] != "completed":
         raise HTTPException(status_code=400, detail="Forecast not completed")
 
     try:
-        # Generate Excel file
-        exporter = ExcelExporter()
-        excel_content = exporter.generate_report(forecast_data["result"])
-
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            tmp_file.write(excel_content)
-            tmp_file_path = tmp_file.name
-
-        # Return file
-        return FileResponse(
-            tmp_file_path,
+        # Generate Excel file in a worker process to keep the event loop free
+        excel_content = await asyncio.get_running_loop().run_in_executor(
+            getattr(app.state, "pool", None),
+            _render_excel,
+            orjson.dumps(forecast_data, default=str)
+        )
+
+        # Stream the workbook straight from memory
+        buffer = BytesIO(excel_content)
+        return StreamingResponse(
+            iter(lambda: buffer.read(65536), b''),
             media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            filename=f"forecast_{forecast_id}.xlsx"
+            headers={'Content-Disposition': f'attachment; filename="forecast_{forecast_id}.xlsx"'}
         )
 
     except Exception as e:
@@ -234,14 +454,135 @@ async def download_excel_report(forecast_id: str):
 @app.post("/api/forecast/{forecast_id}/cancel")
 async def cancel_forecast(forecast_id: str):
     """Cancel a running forecast"""
-    if forecast_id not in running_forecasts:
+    if forecast_id in running_forecasts:
+        task = forecast_tasks.get(forecast_id)
+        if task is not None:
+            task.cancel()
+        await update_forecast(forecast_id, status="cancelled")
+    elif await forecast_store.load(forecast_id) is not None:
+        await forecast_store.request_cancel(forecast_id)
+    else:
         raise HTTPException(status_code=404, detail="Forecast not found")
 
-    running_forecasts[forecast_id]["status"] = "cancelled"
     return {"message": "Forecast cancelled"}
 
+@lru_cache(maxsize=1024)
+def forecaster_prompt(question: str, definition: str, timeframe: str) -> str:
+    """Build the super-forecaster prompt, reusing it for repeated questions"""
+    return PromptTemplates.get_super_forecaster_prompt(
+        question=question,
+        definition=definition,
+        timeframe=timeframe
+    )
+
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', 86400))
+
+def response_cache_key(model: str, prompt: str, max_tokens: int, iteration: int = 0) -> str:
+    """Cache key for one sample of a model response"""
+    payload = f"{model}|{max_tokens}|{iteration}|{prompt}".encode()
+    # Keys only need to be collision-free, not cryptographic; xxh3 is much faster
+    if xxhash is not None:
+        return f"lmq:{xxhash.xxh3_128_hexdigest(payload)}"
+    return f"lmq:{hashlib.sha256(payload).hexdigest()}"
+
+async def cached_query(
+    client: OpenRouterClient,
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    iteration: int = 0,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Query a model through the shared response cache
+
+    Each iteration is cached under its own key so repeated forecasts reuse
+    earlier samples without collapsing the ensemble onto a single answer.
+    """
+    key = response_cache_key(model, prompt, max_tokens, iteration)
+    cached = await forecast_store.get_response(key)
+    if cached is not None:
+        cached['response_source'] = 'cache'
+        return cached
+
+    result = await client.query_model(model=model, prompt=prompt, max_tokens=max_tokens, **kwargs)
+    if result.get('status') == 'success' and result.get('probability') is not None:
+        await forecast_store.set_response(key, result, RESPONSE_CACHE_TTL)
+    return result
+
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 60.0
+
+# Per-model circuit breaker: model -> (consecutive failures, open until)
+_breaker: Dict[str, Tuple[int, float]] = {}
+
+def record_model_outcome(model: str, ok: bool):
+    """Reset or advance a model's circuit breaker after a query"""
+    if ok:
+        _breaker.pop(model, None)
+        return
+    fails = _breaker.get(model, (0, 0.0))[0] + 1
+    until = time.monotonic() + BREAKER_COOLDOWN if fails >= BREAKER_THRESHOLD else 0.0
+    _breaker[model] = (fails, until)
+    if until:
+        logger.warning(f"Circuit open for {model} after {fails} consecutive failures")
+
+async def query_models_concurrently(
+    client: OpenRouterClient,
+    models: Sequence[str],
+    prompt: str,
+    max_tokens: int,
+    iterations: int = 1
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Query every model `iterations` times concurrently, bounded by CONCURRENT_REQUESTS
+
+    Yields (model, result) pairs as each query completes; result is the raised
+    exception if the query failed. Pending queries are cancelled when the
+    consumer stops iterating.
+    """
+    semaphore = asyncio.Semaphore(CONCURRENT_REQUESTS)
+    jobs = [(model, k) for model in models for k in range(iterations)]
+
+    async def query(model: str, iteration: int) -> Tuple[str, Any]:
+        async with semaphore:
+            if time.monotonic() < _breaker.get(model, (0, 0.0))[1]:
+                return model, RuntimeError(f"Circuit open for {model}, skipping")
+
+            logger.info(f"Running forecast for model: {model} (iteration {iteration + 1})")
+            try:
+                result = await asyncio.wait_for(
+                    cached_query(
+                        client,
+                        model,
+                        prompt,
+                        max_tokens,
+                        iteration,
+                        enable_web_search=True
+                    ),
+                    timeout=REQUEST_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                record_model_outcome(model, ok=False)
+                return model, TimeoutError(f"{model} timed out after {REQUEST_TIMEOUT:.0f}s")
+            except Exception as e:
+                record_model_outcome(model, ok=False)
+                return model, e
+
+            record_model_outcome(model, ok=result.get('status') in ('success', 'rejected'))
+            return model, result
+
+    tasks = [asyncio.create_task(query(model, k)) for model, k in jobs]
+    try:
+        for future in asyncio.as_completed(tasks):
+            yield await future
+    finally:
+        for task in tasks:
+            task.cancel()
+
 # Background forecast execution
 async def run_forecast(
+    client: OpenRouterClient,
     forecast_id: str,
     question: str,
     definition: str,
@@ -252,50 +593,46 @@ async def run_forecast(
     """Execute the actual forecast using the real AI system"""
     try:
         # Update progress
-        running_forecasts[forecast_id]["progress"] = 10
+        await update_forecast(forecast_id, progress=10)
 
         # Initialize components
-        client = OpenRouterClient()
         manager = EnsembleManager(client)
 
         # Get enabled models
         if models is None:
-            enabled_models = settings.get('ENABLED_MODELS', '').split(',')
-            models = [model.strip() for model in enabled_models if model.strip()]
+            models = ENABLED_MODELS
 
         # Update progress
-        running_forecasts[forecast_id]["progress"] = 20
+        await update_forecast(forecast_id, progress=20)
 
         # Generate prompts
-        prompt = PromptTemplates.get_super_forecaster_prompt(
-            question=question,
-            definition=definition,
-            timeframe=timeframe
-        )
+        prompt = forecaster_prompt(question, definition, timeframe)
 
         # Update progress
-        running_forecasts[forecast_id]["progress"] = 30
+        await update_forecast(forecast_id, progress=30)
 
-        # Run forecasting for each model
+        # Run every iteration of every model concurrently
         model_results = []
-        total_models = len(models)
-
-        for i, model in enumerate(models):
-            if running_forecasts[forecast_id]["status"] == "cancelled":
-                return
-
-            try:
-                logger.info(f"Running forecast for model: {model}")
-
-                # Query model
-                result = await client.query_model(
-                    model=model,
-                    prompt=prompt,
-                    max_tokens=1000,
-                    enable_web_search=True
-                )
-
-                if result.get('probability') is not None:
+        total_jobs = len(models) * iterations
+
+        async with aclosing(query_models_concurrently(
+            client, models, prompt, max_tokens=1000, iterations=iterations
+        )) as completed:
+            done = 0
+            async for model, result in completed:
+                if forecast_id not in running_forecasts:
+                    return
+
+                done += 1
+                if isinstance(result, Exception):
+                    logger.error(f"Error with model {model}: {result}")
+                    model_results.append({
+                        'model': model,
+                        'probability': None,
+                        'error': str(result),
+                        'status': 'error'
+                    })
+                elif result.get('probability') is not None:
                     model_results.append({
                         'model': model,
                         'probability': result['probability'],
@@ -303,21 +640,14 @@ async def run_forecast(
                         'status': result.get('status', 'success')
                     })
 
-                # Update progress
-                progress = 30 + int((i + 1) / total_models * 50)
-                running_forecasts[forecast_id]["progress"] = progress
-
-            except Exception as e:
-                logger.error(f"Error with model {model}: {e}")
-                model_results.append({
-                    'model': model,
-                    'probability': None,
-                    'error': str(e),
-                    'status': 'error'
-                })
+                # Update progress; shared-store writes are coalesced
+                progress = 30 + int(done / total_jobs * 50)
+                if await update_forecast(forecast_id, coalesce=True, progress=progress):
+                    await update_forecast(forecast_id, status="cancelled")
+                    return
 
         # Update progress
-        running_forecasts[forecast_id]["progress"] = 85
+        await update_forecast(forecast_id, progress=85)
 
         # Calculate ensemble statistics
         valid_results = [r for r in model_results if r.get('probability') is not None]
@@ -325,25 +655,40 @@ async def run_forecast(
         if not valid_results:
             raise Exception("No valid model results obtained")
 
-        # Calculate ensemble probability
-        probabilities = [r['probability'] for r in valid_results]
-        ensemble_prob = calculate_ensemble_probability(probabilities)
-
-        # Calculate model statistics
-        model_stats = {}
-        for result in valid_results:
-            model_stats[result['model']] = {
-                'mean': result['probability'],
-                'status': result['status']
+        # Calculate ensemble probability over all samples
+        n = len(valid_results)
+        probs = np.fromiter((r['probability'] for r in valid_results), dtype=np.float64, count=n)
+        ensemble_prob = float(probs.mean())
+
+        # Calculate model statistics, grouping samples by model in completion order
+        model_index: Dict[str, int] = {}
+        model_ids = np.fromiter(
+            (model_index.setdefault(r['model'], len(model_index)) for r in valid_results),
+            dtype=np.intp,
+            count=n
+        )
+        counts = np.bincount(model_ids)
+        means = np.bincount(model_ids, weights=probs) / counts
+        variances = np.bincount(model_ids, weights=probs * probs) / counts - means * means
+        stds = np.sqrt(np.maximum(variances, 0.0))
+
+        model_stats = {
+            model: {
+                'mean': round(float(means[i]), 1),
+                'std': round(float(stds[i]), 1),
+                'count': int(counts[i]),
+                'status': 'success'
             }
+            for model, i in model_index.items()
+        }
 
         # Create final result
         forecast_result = {
             'ensemble_probability': round(ensemble_prob, 1),
             'statistics': {
                 'successful_queries': len(valid_results),
-                'total_queries': len(models),
-                'models_used': [r['model'] for r in valid_results],
+                'total_queries': total_jobs,
+                'models_used': list(model_index),
                 'model_stats': model_stats
             },
             'question': question,
@@ -355,61 +700,58 @@ async def run_forecast(
         }
 
         # Update final status
-        running_forecasts[forecast_id].update({
-            "status": "completed",
-            "progress": 100,
-            "result": forecast_result,
-            "end_time": datetime.now()
-        })
+        await update_forecast(
+            forecast_id,
+            status="completed",
+            progress=100,
+            result=forecast_result,
+            end_time=datetime.now()
+        )
 
         logger.info(f"Forecast {forecast_id} completed successfully")
 
+    except asyncio.CancelledError:
+        logger.info(f"Forecast {forecast_id} cancelled")
+        await update_forecast(forecast_id, status="cancelled", end_time=datetime.now())
+        raise
+
     except Exception as e:
         logger.error(f"Forecast {forecast_id} failed: {e}")
-        running_forecasts[forecast_id].update({
-            "status": "failed",
-            "error": str(e),
-            "end_time": datetime.now()
-        })
+        await update_forecast(
+            forecast_id,
+            status="failed",
+            error=str(e),
+            end_time=datetime.now()
+        )
 
 # Simplified endpoint for direct web interface compatibility
 @app.post("/forecast", response_model=ForecastResponse)
-async def create_forecast_simple(request: ForecastRequest):
+async def create_forecast_simple(
+    request: ForecastRequest,
+    client: OpenRouterClient = Depends(get_client)
+):
     """Simplified forecast endpoint for web interface"""
     try:
         # For web interface, we'll run a quick forecast synchronously
-        client = OpenRouterClient()
 
         # Get enabled models (limit to 3 for quick response)
-        enabled_models = settings.get('ENABLED_MODELS', '').split(',')
-        models = [model.strip() for model in enabled_models[:3] if model.strip()]
+        models = ENABLED_MODELS[:3]
 
         # Generate prompt
-        prompt = PromptTemplates.get_super_forecaster_prompt(
-            question=request.question,
-            definition=request.definition or "",
-            timeframe=request.timeframe or "2026"
-        )
+        prompt = forecaster_prompt(request.question, request.definition or "", request.timeframe or "2026")
 
-        # Run quick forecast
+        # Run quick forecast across all models concurrently
         model_results = []
-        for model in models:
-            try:
-                result = await client.query_model(
-                    model=model,
-                    prompt=prompt,
-                    max_tokens=800,
-                    enable_web_search=True
-                )
-
-                if result.get('probability') is not None:
+        async with aclosing(query_models_concurrently(client, models, prompt, max_tokens=800)) as completed:
+            async for model, result in completed:
+                if isinstance(result, Exception):
+                    logger.error(f"Error with model {model}: {result}")
+                elif result.get('probability') is not None:
                     model_results.append({
                         'model': model,
                         'probability': result['probability'],
                         'status': result.get('status', 'success')
                     })
-            except Exception as e:
-                logger.error(f"Error with model {model}: {e}")
 
         # Calculate result
         if not model_results:
@@ -457,14 +799,18 @@ async def create_forecast_simple(request: ForecastRequest):
 async def startup_event():
     """Initialize the application"""
     logger.info("🚀 Foresight Analyzer API starting up...")
-    logger.info(f"📊 Enabled models: {settings.get('ENABLED_MODELS', '')}")
-    logger.info(f"🔧 Iterations per model: {settings.get('ITERATIONS_PER_MODEL', 5)}")
-    logger.info(f"⚡ Concurrent requests: {settings.get('CONCURRENT_REQUESTS', 3)}")
-    logger.info(f"🕐 Request timeout: {settings.get('REQUEST_TIMEOUT', 120)}s")
+    logger.info(f"📊 Enabled models: {','.join(ENABLED_MODELS)}")
+    logger.info(f"🔧 Iterations per model: {DEFAULT_ITERATIONS}")
+    logger.info(f"⚡ Concurrent requests: {CONCURRENT_REQUESTS}")
+    logger.info(f"🕐 Request timeout: {REQUEST_TIMEOUT:.0f}s")
 
-    # Test OpenRouter API connectivity
+    app.state.ticker = asyncio.create_task(_tick())
+    # One renderer per worker by default: gunicorn may already run a worker per CPU
+    app.state.pool = ProcessPoolExecutor(max_workers=int(os.getenv('EXCEL_WORKERS', '1')))
+
+    # Create the OpenRouter client shared by all requests
     try:
-        client = OpenRouterClient()
+        app.state.client = OpenRouterClient()
         logger.info("✅ OpenRouter client initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize OpenRouter client: {e}")
@@ -484,13 +830,38 @@ async def shutdown_event():
     logger.info("🧹 Cleaning up running forecasts...")
 
     # Cancel any running forecasts
-    for forecast_id in list(running_forecasts.keys()):
-        if running_forecasts[forecast_id]["status"] == "running":
-            running_forecasts[forecast_id]["status"] = "cancelled"
+    for forecast_id, state in list(running_forecasts.items()):
+        if state["status"] == "running":
+            task = forecast_tasks.get(forecast_id)
+            if task is not None:
+                task.cancel()
+            await update_forecast(forecast_id, status="cancelled")
             logger.info(f"   ❌ Cancelled forecast: {forecast_id}")
 
+    ticker = getattr(app.state, "ticker", None)
+    if ticker is not None:
+        ticker.cancel()
+
+    pool = getattr(app.state, "pool", None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    client = getattr(app.state, "client", None)
+    if client is not None:
+        await client.aclose()
+    await forecast_store.close()
+
     logger.info("✅ Shutdown complete")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Multiple workers need REDIS_URL so forecast state is shared between them
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() if forecast_store.enabled else 1))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8000)),
+        workers=workers,
+        loop="uvloop",
+        http="httptools"
+    )
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Numeric kernels shared by the aggregation code
+
+The grouped reduction runs as a single JIT-compiled pass when numba is
+installed and falls back to an equivalent vectorized numpy implementation.
+Without numba, small rosters (the common case of a handful of models) use a
+pure-Python reducer generated for the exact group count, which avoids numpy's
+per-call overhead on tiny batches.
+"""
+import math
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence
+import numpy as np
+
+from utils.jit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _grouped_stats_jit(codes, probabilities, n_groups):
+    """Count, mean, std (ddof=1), min, max and median per group in compiled loops"""
+    counts = np.zeros(n_groups, dtype=np.int64)
+    sums = np.zeros(n_groups)
+    mins = np.zeros(n_groups)
+    maxs = np.zeros(n_groups)
+
+    for i in range(codes.shape[0]):
+        c = codes[i]
+        p = probabilities[i]
+        if counts[c] == 0:
+            mins[c] = p
+            maxs[c] = p
+        else:
+            mins[c] = min(mins[c], p)
+            maxs[c] = max(maxs[c], p)
+        counts[c] += 1
+        sums[c] += p
+
+    means = np.zeros(n_groups)
+    for c in range(n_groups):
+        if counts[c] > 0:
+            means[c] = sums[c] / counts[c]
+
+    # Centered second pass keeps the variance numerically stable; it also
+    # scatters values into group-contiguous slots for the medians
+    starts = np.zeros(n_groups, dtype=np.int64)
+    for c in range(1, n_groups):
+        starts[c] = starts[c - 1] + counts[c - 1]
+    fill = starts.copy()
+    grouped = np.empty(codes.shape[0])
+    sq_dev = np.zeros(n_groups)
+    for i in range(codes.shape[0]):
+        c = codes[i]
+        d = probabilities[i] - means[c]
+        sq_dev[c] += d * d
+        grouped[fill[c]] = probabilities[i]
+        fill[c] += 1
+
+    stds = np.zeros(n_groups)
+    medians = np.zeros(n_groups)
+    for c in range(n_groups):
+        n = counts[c]
+        if n > 1:
+            stds[c] = np.sqrt(sq_dev[c] / (n - 1))
+        if n > 0:
+            segment = np.sort(grouped[starts[c]:starts[c] + n])
+            medians[c] = (segment[(n - 1) // 2] + segment[n // 2]) / 2
+
+    return counts, means, stds, mins, maxs, medians
+
+
+def _grouped_stats_numpy(codes, probabilities, n_groups):
+    """Vectorized numpy equivalent of _grouped_stats_jit"""
+    counts = np.bincount(codes, minlength=n_groups)
+    nonempty = counts > 0
+    safe_counts = np.maximum(counts, 1)
+
+    means = np.bincount(codes, weights=probabilities, minlength=n_groups) / safe_counts
+    deviations = probabilities - means[codes]
+    sq_dev = np.bincount(codes, weights=deviations * deviations, minlength=n_groups)
+    stds = np.where(counts > 1, np.sqrt(sq_dev / np.maximum(counts - 1, 1)), 0.0)
+
+    if not probabilities.size:
+        zeros = np.zeros(n_groups)
+        return counts, zeros, zeros, zeros, zeros, zeros
+
+    # Sort by group, then value: min/max/median become index lookups
+    ordered = probabilities[np.lexsort((probabilities, codes))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    last = ordered.size - 1
+    first = np.minimum(starts, last)
+    end = np.clip(starts + counts - 1, 0, last)
+    lower = np.minimum(starts + (counts - 1) // 2, last)
+    upper = np.minimum(starts + counts // 2, last)
+
+    return (
+        counts,
+        np.where(nonempty, means, 0.0),
+        stds,
+        np.where(nonempty, ordered[first], 0.0),
+        np.where(nonempty, ordered[end], 0.0),
+        np.where(nonempty, (ordered[lower] + ordered[upper]) / 2, 0.0),
+    )
+
+
+# Largest group count and batch size handled by the generated reducers
+SPECIALIZE_MAX_GROUPS = 8
+SPECIALIZE_MAX_VALUES = 256
+
+
+def _finish_groups(groups: Sequence[List[float]]):
+    """Reduce per-group value lists to the grouped_stats columns"""
+    n_groups = len(groups)
+    counts = np.zeros(n_groups, dtype=np.int64)
+    columns = np.zeros((5, n_groups))
+    for c, values in enumerate(groups):
+        n = len(values)
+        if not n:
+            continue
+        values.sort()
+        mean = math.fsum(values) / n
+        counts[c] = n
+        columns[0, c] = mean
+        if n > 1:
+            columns[1, c] = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+        columns[2, c] = values[0]
+        columns[3, c] = values[-1]
+        columns[4, c] = (values[(n - 1) // 2] + values[n // 2]) / 2
+    return (counts, *columns)
+
+
+@lru_cache(maxsize=SPECIALIZE_MAX_GROUPS)
+def _make_reducer(n_groups: int) -> Callable:
+    """
+    Compile a grouped reducer specialized for exactly n_groups groups
+
+    The partitioning loop is generated with one local list per group and an
+    unrolled comparison chain, so no per-value dict or index lookups remain.
+    """
+    lines = ["def reduce(codes, probabilities):"]
+    lines += [f"    g{c} = []" for c in range(n_groups)]
+    lines.append("    for c, p in zip(codes, probabilities):")
+    for c in range(n_groups):
+        keyword = "if" if c == 0 else "elif"
+        lines.append(f"        {keyword} c == {c}: g{c}.append(p)")
+    groups = ", ".join(f"g{c}" for c in range(n_groups))
+    lines.append(f"    return finish(({groups},))")
+
+    namespace = {"finish": _finish_groups}
+    exec("\n".join(lines), namespace)
+    return namespace["reduce"]
+
+
+def grouped_stats(codes: np.ndarray, probabilities: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    """
+    Per-group count, mean, std (ddof=1), min, max and median
+
+    Args:
+        codes: Group index (0..n_groups-1) of each probability
+        probabilities: Probability values
+        n_groups: Number of groups
+
+    Returns:
+        Dictionary of arrays indexed by group; empty groups report 0
+    """
+    small = 0 < n_groups <= SPECIALIZE_MAX_GROUPS and len(probabilities) <= SPECIALIZE_MAX_VALUES
+    if small and not NUMBA_AVAILABLE:
+        counts, means, stds, mins, maxs, medians = _make_reducer(n_groups)(
+            np.asarray(codes).tolist(), np.asarray(probabilities).tolist()
+        )
+    else:
+        kernel = _grouped_stats_jit if NUMBA_AVAILABLE else _grouped_stats_numpy
+        counts, means, stds, mins, maxs, medians = kernel(
+            np.ascontiguousarray(codes, dtype=np.int64),
+            np.ascontiguousarray(probabilities, dtype=np.float64),
+            n_groups
+        )
+    return {
+        "count": counts,
+        "mean": means,
+        "std": stds,
+        "min": mins,
+        "max": maxs,
+        "median": medians,
+    }
@@ -1,22 +1,120 @@
 """Statistical aggregation and analysis of ensemble forecast results"""
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 from scipy import stats
 from collections import defaultdict
 
-from services.core.models import ModelResponse, EnsembleStatistics, ModelStatistics
+from services.core.models import ModelResponse, EnsembleStatistics, ModelStatistics, ResponseStatus
 from services.analysis.calibration import BatchCalibrator, MultiModelCalibrator
 from services.analysis.consistency_scorer import ConsistencyScorer
 from services.analysis.bayesian_aggregator import BayesianAggregator
+from services.analysis._kernels import grouped_stats
 
 logger = logging.getLogger(__name__)
 
+# Module-level bindings for the numpy reductions used on Python sequences
+_mean = np.mean
+_std = np.std
+_median = np.median
+
+
+def _quartiles(values: np.ndarray) -> Tuple[float, float]:
+    """
+    25th and 75th percentiles (linear interpolation, as np.percentile)
+
+    Uses linear-time selection of the four bracketing order statistics
+    instead of sorting a copy.
+    """
+    last = values.size - 1
+    positions = (last * 0.25, last * 0.75)
+    lows = [int(pos) for pos in positions]
+    highs = [min(low + 1, last) for low in lows]
+    part = np.partition(values, sorted(set(lows + highs))).tolist()
+    return tuple(
+        part[low] + (part[high] - part[low]) * (pos - low)
+        for pos, low, high in zip(positions, lows, highs)
+    )
+
+# Compact status encoding for the columnar response layout
+_STATUS_CODES = {status: code for code, status in enumerate(ResponseStatus)}
+_SUCCESS_CODE = _STATUS_CODES[ResponseStatus.SUCCESS]
+
+# Number of distinct probability batches whose calibration is remembered
+CALIBRATION_CACHE_SIZE = 32
+
+
+class ResponseColumns(NamedTuple):
+    """Model responses as parallel arrays, one entry per response"""
+    probs: np.ndarray     # float64, NaN where no probability was extracted
+    statuses: np.ndarray  # uint8 ResponseStatus codes
+    models: np.ndarray    # object
+    ids: np.ndarray       # object (ensemble_id)
+    times: np.ndarray     # float64 response time in seconds
+
+    @classmethod
+    def from_responses(cls, responses: List[ModelResponse]) -> "ResponseColumns":
+        """Build the columns in a single walk over the responses"""
+        n = len(responses)
+        probs = np.empty(n)
+        statuses = np.empty(n, dtype=np.uint8)
+        times = np.empty(n)
+        models = np.empty(n, dtype=object)
+        ids = np.empty(n, dtype=object)
+
+        for i, r in enumerate(responses):
+            probs[i] = np.nan if r.probability is None else r.probability
+            statuses[i] = _STATUS_CODES[r.status]
+            times[i] = r.response_time
+            models[i] = r.model
+            ids[i] = r.ensemble_id
+
+        return cls(probs, statuses, models, ids, times)
+
+    @property
+    def success_mask(self) -> np.ndarray:
+        return self.statuses == _SUCCESS_CODE
+
+
+Responses = Union[List[ModelResponse], ResponseColumns]
+
+
+class _ResponseCache:
+    """
+    Derived data for one set of responses within a single aggregator call
+
+    Each field past the columns is computed on first use, so a method that
+    needs both the valid probabilities and their per-model grouping extracts
+    them once. Nothing is kept between calls: callers running several methods
+    on the same responses can build ResponseColumns once and pass those.
+    """
+
+    def __init__(self, responses: Responses):
+        self.columns = ForecastAggregator._columns(responses)
+
+    @cached_property
+    def valid(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        return ForecastAggregator._extract_valid(self.columns)
+
+    @cached_property
+    def encoding(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        return ForecastAggregator._encode_models(self.columns, self.valid[1])
+
+    @cached_property
+    def model_predictions(self) -> Dict[str, List[float]]:
+        probs, models = self.valid[:2]
+        return ForecastAggregator._group_by_model(models, probs)
+
 
 class ForecastAggregator:
     """Aggregates and analyzes ensemble forecast results with multiple advanced methods"""
 
+    # Shared by all instances; the sub-aggregators are independent and numpy-heavy
+    _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aggregator")
+
     def __init__(self, method: str = "ensemble"):
         """
         Initialize aggregator with specified method
@@ -29,233 +127,301 @@ class ForecastAggregator:
         self.multi_calibrator = MultiModelCalibrator()
         self.consistency_scorer = ConsistencyScorer()
         self.bayesian_aggregator = BayesianAggregator()
+        self._calibration_cache: Dict[Tuple, np.ndarray] = {}
 
-    def aggregate_results(self, responses: List[ModelResponse]) -> EnsembleStatistics:
+    def aggregate_results(self, responses: Responses) -> EnsembleStatistics:
         """
         Aggregate forecast results into comprehensive statistics
 
         Args:
-            responses: List of model responses
+            responses: List of model responses or their ResponseColumns
 
         Returns:
             EnsembleStatistics with aggregated data
         """
-        # Separate successful responses
-        successful_responses = [r for r in responses if r.status.value == "success"]
-        valid_probabilities = [r.probability for r in successful_responses if r.probability is not None]
+        ctx = self._ctx(responses)
+        probs, models, _, success_mask = ctx.valid
+        successful_count = int(success_mask.sum())
 
-        # Group by model
-        model_groups = defaultdict(list)
-        for response in responses:
-            model_groups[response.model].append(response)
+        model_names, codes, valid_codes = ctx.encoding
+        n_models = len(model_names)
 
         # Calculate per-model statistics
-        model_stats = {}
-        for model, model_responses in model_groups.items():
-            model_stats[model] = self._calculate_model_statistics(model, model_responses)
+        totals = np.bincount(codes, minlength=n_models)
+        successes = np.bincount(codes, weights=success_mask, minlength=n_models)
+        grouped = grouped_stats(valid_codes, probs, n_models)
+
+        model_stats = {
+            model: ModelStatistics(
+                model=model,
+                count=int(grouped["count"][i]),
+                mean=float(grouped["mean"][i]),
+                median=float(grouped["median"][i]),
+                std=float(grouped["std"][i]),
+                min=float(grouped["min"][i]),
+                max=float(grouped["max"][i]),
+                success_rate=float(successes[i] / totals[i]) if grouped["count"][i] else 0.0
+            )
+            for i, model in enumerate(model_names)
+        }
 
         # Calculate overall statistics
         overall_stats = {}
-        if valid_probabilities:
+        if probs.size:
             overall_stats = {
-                "mean": float(np.mean(valid_probabilities)),
-                "median": float(np.median(valid_probabilities)),
-                "std": float(np.std(valid_probabilities, ddof=1) if len(valid_probabilities) > 1 else 0),
-                "min": float(min(valid_probabilities)),
-                "max": float(max(valid_probabilities))
+                "mean": float(probs.mean()),
+                "median": float(_median(probs)),
+                "std": float(probs.std(ddof=1)) if probs.size > 1 else 0.0,
+                "min": float(probs.min()),
+                "max": float(probs.max())
             }
 
         # Create ensemble statistics
         stats_obj = EnsembleStatistics(
-            total_queries=len(responses),
-            successful_queries=len(successful_responses),
-            failed_queries=len(responses) - len(successful_responses),
-            valid_probabilities=len(valid_probabilities),
-            models_used=list(model_groups.keys()),
+            total_queries=len(success_mask),
+            successful_queries=successful_count,
+            failed_queries=len(success_mask) - successful_count,
+            valid_probabilities=int(probs.size),
+            models_used=model_names,
             model_stats=model_stats,
             **overall_stats
         )
 
         return stats_obj
 
-    def _calculate_model_statistics(self, model: str, responses: List[ModelResponse]) -> ModelStatistics:
+    @staticmethod
+    def _ctx(responses: Responses) -> _ResponseCache:
+        """Lazily derived data for these responses, for use within one call"""
+        return _ResponseCache(responses)
+
+    @staticmethod
+    def _columns(responses: Responses) -> ResponseColumns:
+        """Columnar view of the responses, converting a list once"""
+        if isinstance(responses, ResponseColumns):
+            return responses
+        return ResponseColumns.from_responses(responses)
+
+    @classmethod
+    def _extract_valid(
+        cls,
+        responses: Responses
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
-        Calculate statistics for a single model
+        Extract valid probabilities and their labels
 
         Args:
-            model: Model identifier
-            responses: List of responses for this model
+            responses: List of model responses or their columns
 
         Returns:
-            ModelStatistics object
+            Tuple of (probabilities, models, ensemble_ids) for successful responses
+            with a probability, and a success mask over all responses
         """
-        successful_responses = [r for r in responses if r.status.value == "success"]
-        valid_probabilities = [r.probability for r in successful_responses if r.probability is not None]
+        columns = cls._columns(responses)
+        success_mask = columns.success_mask
+        valid = np.flatnonzero(success_mask & ~np.isnan(columns.probs))
+
+        return (
+            columns.probs[valid],
+            columns.models[valid],
+            columns.ids[valid],
+            success_mask
+        )
 
-        if not valid_probabilities:
-            # Return empty statistics if no valid probabilities
-            return ModelStatistics(
-                model=model,
-                count=0,
-                mean=0.0,
-                median=0.0,
-                std=0.0,
-                min=0.0,
-                max=0.0,
-                success_rate=0.0
-            )
+    @staticmethod
+    def _encode_models(
+        columns: ResponseColumns,
+        valid_models: np.ndarray
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Encode model names as integer codes numbered in order of first appearance
+
+        Args:
+            columns: Columnar responses
+            valid_models: Models of the valid responses, as returned by _extract_valid
 
-        return ModelStatistics(
-            model=model,
-            count=len(valid_probabilities),
-            mean=float(np.mean(valid_probabilities)),
-            median=float(np.median(valid_probabilities)),
-            std=float(np.std(valid_probabilities, ddof=1) if len(valid_probabilities) > 1 else 0),
-            min=float(min(valid_probabilities)),
-            max=float(max(valid_probabilities)),
-            success_rate=len(successful_responses) / len(responses) if responses else 0.0
+        Returns:
+            Tuple of (model names, code per response, code per valid response)
+        """
+        uniq, first_seen, inverse = np.unique(columns.models, return_index=True, return_inverse=True)
+        appearance = np.argsort(first_seen)
+        rank = np.empty_like(appearance)
+        rank[appearance] = np.arange(appearance.size)
+
+        if valid_models.size:
+            valid_codes = rank[np.searchsorted(uniq, valid_models)]
+        else:
+            valid_codes = np.zeros(0, dtype=np.intp)
+        return uniq[appearance].tolist(), rank[inverse], valid_codes
+
+    def _calibrate_cached(self, probabilities: np.ndarray) -> np.ndarray:
+        """
+        Calibrate a batch, reusing the result for an identical batch
+
+        The key includes the calibrator's fitted state, so refitting or a new
+        temperature never serves a stale result.
+        """
+        if not self.calibrator.is_fitted:
+            self.calibrator.fit(probabilities)
+
+        key = (
+            probabilities.tobytes(),
+            self.calibrator.temperature,
+            id(self.calibrator.calibration_model)
         )
+        calibrated = self._calibration_cache.get(key)
+        if calibrated is None:
+            if len(self._calibration_cache) >= CALIBRATION_CACHE_SIZE:
+                self._calibration_cache.pop(next(iter(self._calibration_cache)))
+            calibrated = self.calibrator.calibrate_batch_arr(probabilities)
+            self._calibration_cache[key] = calibrated
+        return calibrated
+
+    @staticmethod
+    def _model_means(models: np.ndarray, probabilities: np.ndarray) -> pd.Series:
+        """Mean probability per model, in order of first appearance"""
+        return pd.Series(probabilities).groupby(models, sort=False).mean()
+
+    @staticmethod
+    def _group_by_model(models: np.ndarray, probabilities: np.ndarray) -> Dict[str, List[float]]:
+        """Group extracted probabilities into per-model lists"""
+        model_predictions = defaultdict(list)
+        for model, probability in zip(models, probabilities.tolist()):
+            model_predictions[model].append(probability)
+        return model_predictions
 
-    def calculate_ensemble_probability(self, responses: List[ModelResponse]) -> Optional[float]:
+    def calculate_ensemble_probability(self, responses: Responses) -> Optional[float]:
         """
         Calculate the ensemble probability using specified method
 
         Args:
-            responses: List of model responses
+            responses: List of model responses or their ResponseColumns
 
         Returns:
             Ensemble probability or None if no valid responses
         """
-        valid_probabilities = [r.probability for r in responses
-                             if r.status.value == "success" and r.probability is not None]
+        ctx = self._ctx(responses)
+        probs, models, _, _ = ctx.valid
 
-        if not valid_probabilities:
+        if not probs.size:
             return None
 
         if self.method == "simple":
-            return float(np.mean(valid_probabilities))
+            return float(probs.mean())
 
         elif self.method == "calibrated":
             # Apply batch calibration
-            calibrated = self.calibrator.calibrate_batch(valid_probabilities)
-            return float(np.mean(calibrated))
+            calibrated = self._calibrate_cached(probs)
+            return float(calibrated.mean())
 
         elif self.method == "consistency":
-            # Group by model for consistency scoring
-            model_predictions = defaultdict(list)
-            for r in responses:
-                if r.status.value == "success" and r.probability is not None:
-                    model_predictions[r.model].append(r.probability)
-
             # Calculate consistency-weighted aggregate
-            return self.consistency_scorer.calculate_weighted_aggregate(model_predictions)
+            return self.consistency_scorer.calculate_weighted_aggregate(
+                ctx.model_predictions
+            )
 
         elif self.method == "bayesian":
             # Use Bayesian aggregation
-            expert_ids = [r.model for r in responses if r.status.value == "success" and r.probability is not None]
-            result = self.bayesian_aggregator.aggregate_forecasts(valid_probabilities, expert_ids)
+            result = self.bayesian_aggregator.aggregate_forecasts(probs, models.tolist())
             return result.get("aggregated_probability")
 
         elif self.method == "ensemble":
-            # Ensemble of methods
-            methods_results = []
-
-            # Simple mean
-            methods_results.append(np.mean(valid_probabilities))
-
-            # Calibrated mean
-            calibrated = self.calibrator.calibrate_batch(valid_probabilities)
-            methods_results.append(np.mean(calibrated))
-
-            # Consistency weighted
-            model_predictions = defaultdict(list)
-            for r in responses:
-                if r.status.value == "success" and r.probability is not None:
-                    model_predictions[r.model].append(r.probability)
-            if model_predictions:
-                methods_results.append(
-                    self.consistency_scorer.calculate_weighted_aggregate(model_predictions)
-                )
-
-            # Bayesian
-            expert_ids = [r.model for r in responses if r.status.value == "success" and r.probability is not None]
-            bayesian_result = self.bayesian_aggregator.aggregate_forecasts(valid_probabilities, expert_ids)
-            methods_results.append(bayesian_result.get("aggregated_probability"))
+            # Ensemble of methods: run the sub-aggregators concurrently
+            calibrated = self._executor.submit(self._calibrate_cached, probs)
+            consistency = self._executor.submit(
+                self.consistency_scorer.calculate_weighted_aggregate, ctx.model_predictions
+            )
+            bayesian = self._executor.submit(
+                self.bayesian_aggregator.aggregate_forecasts, probs, models.tolist()
+            )
+
+            methods_results = [
+                probs.mean(),
+                calibrated.result().mean(),
+                consistency.result(),
+                bayesian.result().get("aggregated_probability")
+            ]
 
             # Return mean of all methods
-            return float(np.mean([r for r in methods_results if r is not None]))
+            return float(_mean([r for r in methods_results if r is not None]))
 
         else:
             # Default to simple mean
-            return float(np.mean(valid_probabilities))
+            return float(probs.mean())
 
     def calculate_weighted_ensemble_probability(
         self,
-        responses: List[ModelResponse],
+        responses: Responses,
         model_weights: Optional[Dict[str, float]] = None
     ) -> Optional[float]:
         """
         Calculate weighted ensemble probability
 
         Args:
-            responses: List of model responses
+            responses: List of model responses or their ResponseColumns
             model_weights: Dictionary of model weights (defaults to equal weights)
 
         Returns:
             Weighted ensemble probability
         """
         # Group by model
-        model_groups = defaultdict(list)
-        for response in responses:
-            if response.status.value == "success" and response.probability is not None:
-                model_groups[response.model].append(response.probability)
+        probs, models, _, _ = self._ctx(responses).valid
 
-        if not model_groups:
+        if not probs.size:
             return None
 
+        model_means = self._model_means(models, probs)
+
         # Default to equal weights
         if model_weights is None:
-            model_weights = {model: 1.0 for model in model_groups.keys()}
+            model_weights = dict.fromkeys(model_means.index, 1.0)
 
         # Calculate weighted average
         weighted_sum = 0.0
         total_weight = 0.0
 
-        for model, probabilities in model_groups.items():
+        for model, model_mean in model_means.items():
             if model in model_weights:
                 weight = model_weights[model]
-                model_mean = np.mean(probabilities)
                 weighted_sum += weight * model_mean
                 total_weight += weight
 
         return weighted_sum / total_weight if total_weight > 0 else None
 
-    def analyze_consensus(self, responses: List[ModelResponse]) -> Dict[str, Any]:
+    def analyze_consensus(self, responses: Responses, full: bool = True) -> Dict[str, Any]:
         """
         Analyze consensus between models
 
         Args:
-            responses: List of model responses
+            responses: List of model responses or their ResponseColumns
+            full: Include percentile and range metrics; False returns only the
+                score and the dispersion it is derived from
 
         Returns:
             Dictionary with consensus metrics
         """
-        valid_probabilities = [r.probability for r in responses
-                             if r.status.value == "success" and r.probability is not None]
+        probs = self._ctx(responses).valid[0]
 
-        if len(valid_probabilities) < 2:
+        if probs.size < 2:
             return {"consensus_score": None, "message": "Insufficient valid responses"}
 
         # Calculate various consensus metrics
-        std_dev = np.std(valid_probabilities, ddof=1)
-        coefficient_of_variation = std_dev / np.mean(valid_probabilities) if np.mean(valid_probabilities) > 0 else None
+        std_dev = probs.std(ddof=1)
+        mean = probs.mean()
+        coefficient_of_variation = std_dev / mean if mean > 0 else None
 
         # Consensus score (inverse of coefficient of variation, normalized)
         consensus_score = max(0, 1 - (coefficient_of_variation or 1)) if coefficient_of_variation is not None else None
 
+        if not full:
+            return {
+                "consensus_score": consensus_score,
+                "std_deviation": std_dev,
+                "coefficient_of_variation": coefficient_of_variation,
+                "count": int(probs.size)
+            }
+
         # Calculate percentile ranges
-        p25 = np.percentile(valid_probabilities, 25)
-        p75 = np.percentile(valid_probabilities, 75)
+        p25, p75 = _quartiles(probs)
         iqr = p75 - p25
 
         return {
@@ -265,94 +431,99 @@ class ForecastAggregator:
             "iqr": iqr,
             "p25": p25,
             "p75": p75,
-            "range": max(valid_probabilities) - min(valid_probabilities),
-            "count": len(valid_probabilities)
+            "range": probs.max() - probs.min(),
+            "count": int(probs.size)
         }
 
-    def identify_outliers(self, responses: List[ModelResponse], method: str = "iqr") -> List[str]:
+    def identify_outliers(self, responses: Responses, method: str = "iqr") -> List[str]:
         """
         Identify outlier responses
 
         Args:
-            responses: List of model responses
+            responses: List of model responses or their ResponseColumns
             method: Outlier detection method ('iqr' or 'zscore')
 
         Returns:
             List of ensemble_ids of outlier responses
         """
-        valid_responses = [r for r in responses
-                          if r.status.value == "success" and r.probability is not None]
+        probs, _, ensemble_ids, _ = self._ctx(responses).valid
 
-        if len(valid_responses) < 4:  # Need minimum responses for outlier detection
+        if probs.size < 4:  # Need minimum responses for outlier detection
             return []
 
-        probabilities = [r.probability for r in valid_responses]
-        outlier_ids = []
-
         if method == "iqr":
-            q1 = np.percentile(probabilities, 25)
-            q3 = np.percentile(probabilities, 75)
+            q1, q3 = _quartiles(probs)
             iqr = q3 - q1
             lower_bound = q1 - 1.5 * iqr
             upper_bound = q3 + 1.5 * iqr
-
-            for response in valid_responses:
-                if response.probability < lower_bound or response.probability > upper_bound:
-                    outlier_ids.append(response.ensemble_id)
+            outliers = (probs < lower_bound) | (probs > upper_bound)
 
         elif method == "zscore":
-            z_scores = np.abs(stats.zscore(probabilities))
+            std = probs.std()
+            if std == 0:
+                return []
+            z_scores = probs - probs.mean()
+            z_scores /= std
+            np.abs(z_scores, out=z_scores)
             threshold = 2.5  # Standard threshold for outliers
+            outliers = z_scores > threshold
 
-            for i, response in enumerate(valid_responses):
-                if z_scores[i] > threshold:
-                    outlier_ids.append(response.ensemble_id)
+        else:
+            return []
 
-        return outlier_ids
+        return ensemble_ids[np.flatnonzero(outliers)].tolist()
 
-    def compare_models(self, responses: List[ModelResponse]) -> Dict[str, Any]:
+    def compare_models(self, responses: Responses) -> Dict[str, Any]:
         """
         Compare performance between different models
 
         Args:
-            responses: List of model responses
+            responses: List of model responses or their ResponseColumns
 
         Returns:
             Dictionary with model comparison metrics
         """
-        # Group by model
-        model_groups = defaultdict(list)
-        for response in responses:
-            model_groups[response.model].append(response)
+        ctx = self._ctx(responses)
+        probs, models, _, success_mask = ctx.valid
+        model_names, codes, valid_codes = ctx.encoding
+        n_models = len(model_names)
 
-        if len(model_groups) < 2:
+        if n_models < 2:
             return {"message": "Need at least 2 models for comparison"}
 
-        model_comparison = {}
-
-        for model, model_responses in model_groups.items():
-            valid_probs = [r.probability for r in model_responses
-                          if r.status.value == "success" and r.probability is not None]
+        # Per-model reductions over (code, probability) and (code, response time) columns
+        grouped = grouped_stats(valid_codes, probs, n_models)
+        counts = grouped["count"]
+        totals = np.bincount(codes, minlength=n_models)
+        success_rates = np.bincount(codes, weights=success_mask, minlength=n_models) / totals
+        avg_times = np.bincount(codes, weights=ctx.columns.times, minlength=n_models) / totals
+
+        multiple = counts > 1
+        stds = np.where(multiple, grouped["std"], 0.0)
+        consistencies = np.where(multiple, 1 / (1 + stds), 1.0)
+
+        metrics = pd.DataFrame(
+            {
+                "count": counts,
+                "success_rate": success_rates,
+                "mean": np.where(counts > 0, grouped["mean"], None),
+                "std": stds,
+                "consistency": consistencies,
+                "avg_response_time": avg_times
+            },
+            index=model_names
+        )
+        model_comparison = metrics.to_dict(orient="index")
 
-            model_comparison[model] = {
-                "count": len(valid_probs),
-                "success_rate": len([r for r in model_responses if r.status.value == "success"]) / len(model_responses),
-                "mean": np.mean(valid_probs) if valid_probs else None,
-                "std": np.std(valid_probs, ddof=1) if len(valid_probs) > 1 else 0,
-                "consistency": 1 / (1 + np.std(valid_probs, ddof=1)) if len(valid_probs) > 1 else 1,
-                "avg_response_time": np.mean([r.response_time for r in model_responses])
-            }
+        # Rank models by different criteria (stable, so ties keep first-appearance order)
+        def ranked(column: str, descending: bool = False) -> List[str]:
+            values = metrics[column].to_numpy()
+            return metrics.index[np.argsort(-values if descending else values, kind="stable")].tolist()
 
-        # Rank models by different criteria
         rankings = {
-            "by_consistency": sorted(model_comparison.keys(),
-                                   key=lambda x: model_comparison[x]["consistency"],
-                                   reverse=True),
-            "by_success_rate": sorted(model_comparison.keys(),
-                                    key=lambda x: model_comparison[x]["success_rate"],
-                                    reverse=True),
-            "by_speed": sorted(model_comparison.keys(),
-                             key=lambda x: model_comparison[x]["avg_response_time"])
+            "by_consistency": ranked("consistency", descending=True),
+            "by_success_rate": ranked("success_rate", descending=True),
+            "by_speed": ranked("avg_response_time")
         }
 
         return {
@@ -360,49 +531,48 @@ class ForecastAggregator:
             "rankings": rankings
         }
 
-    def get_advanced_aggregation(self, responses: List[ModelResponse]) -> Dict[str, Any]:
+    def get_advanced_aggregation(self, responses: Responses) -> Dict[str, Any]:
         """
         Get comprehensive aggregation results using all available methods
 
         Args:
-            responses: List of model responses
+            responses: List of model responses or their ResponseColumns
 
         Returns:
             Dictionary with results from all aggregation methods
         """
-        valid_responses = [r for r in responses if r.status.value == "success" and r.probability is not None]
-        if not valid_responses:
+        ctx = self._ctx(responses)
+        probs, models, _, _ = ctx.valid
+        if not probs.size:
             return {"error": "No valid responses for aggregation"}
 
-        valid_probabilities = [r.probability for r in valid_responses]
-
         # Group by model
-        model_predictions = defaultdict(list)
-        for r in valid_responses:
-            model_predictions[r.model].append(r.probability)
+        model_predictions = ctx.model_predictions
 
         results = {
-            "simple_mean": float(np.mean(valid_probabilities)),
-            "median": float(np.median(valid_probabilities)),
-            "trimmed_mean": float(stats.trim_mean(valid_probabilities, 0.1)),  # 10% trimmed
+            "simple_mean": float(probs.mean()),
+            "median": float(_median(probs)),
+            "trimmed_mean": float(stats.trim_mean(probs, 0.1)),  # 10% trimmed
         }
 
+        # Run the independent sub-aggregators concurrently
+        calibrated = self._executor.submit(self._calibrate_cached, probs)
+        consistency = self._executor.submit(self.consistency_scorer.score_and_aggregate, model_predictions)
+        bayesian = self._executor.submit(
+            self.bayesian_aggregator.aggregate_forecasts, probs, models.tolist()
+        )
+
         # Calibrated aggregation
-        calibrated = self.calibrator.calibrate_batch(valid_probabilities)
-        results["calibrated_mean"] = float(np.mean(calibrated))
+        results["calibrated_mean"] = float(calibrated.result().mean())
         results["calibration_temperature"] = self.calibrator.temperature
 
         # Consistency-weighted aggregation
-        consistency_result = self.consistency_scorer.score_ensemble(model_predictions)
-        results["consistency_weighted"] = self.consistency_scorer.calculate_weighted_aggregate(model_predictions)
+        consistency_result, results["consistency_weighted"] = consistency.result()
         results["ensemble_consistency"] = consistency_result["ensemble_consistency"]
         results["consistency_scores"] = consistency_result["model_scores"]
 
         # Bayesian aggregation
-        expert_ids = [r.model for r in valid_responses]
-        bayesian_result = self.bayesian_aggregator.aggregate_forecasts(
-            valid_probabilities, expert_ids
-        )
+        bayesian_result = bayesian.result()
         results["bayesian_aggregated"] = bayesian_result["aggregated_probability"]
         results["bayesian_confidence_interval"] = bayesian_result["confidence_interval"]
         results["bayesian_uncertainty"] = bayesian_result["uncertainty"]
@@ -414,12 +584,12 @@ class ForecastAggregator:
             results["consistency_weighted"],
             results["bayesian_aggregated"]
         ]
-        results["ensemble_of_methods"] = float(np.mean(all_estimates))
-        results["methods_std"] = float(np.std(all_estimates))
+        results["ensemble_of_methods"] = float(_mean(all_estimates))
+        results["methods_std"] = float(_std(all_estimates))
 
         # Add method recommendations
         results["recommended_estimate"] = self._get_recommended_estimate(results, consistency_result)
-        results["confidence_in_estimate"] = self._calculate_confidence_score(results, valid_probabilities)
+        results["confidence_in_estimate"] = self._calculate_confidence_score(results, probs)
 
         return results
 
@@ -445,13 +615,13 @@ class ForecastAggregator:
         # Default to ensemble of methods
         return results["ensemble_of_methods"]
 
-    def _calculate_confidence_score(self, results: Dict[str, Any], probabilities: List[float]) -> float:
+    def _calculate_confidence_score(self, results: Dict[str, Any], probs: np.ndarray) -> float:
         """
         Calculate confidence in the estimate
 
         Args:
             results: Aggregation results
-            probabilities: List of probabilities
+            probs: Valid probabilities, as returned by _extract_valid
 
         Returns:
             Confidence score (0-1)
@@ -465,24 +635,23 @@ class ForecastAggregator:
         consistency = results.get("ensemble_consistency", 0.5)
 
         # 3. Sample size
-        n_samples = len(probabilities)
-        sample_score = min(1.0, n_samples / 50)  # Max confidence at 50+ samples
+        sample_score = min(1.0, probs.size / 50)  # Max confidence at 50+ samples
 
         # 4. Spread of predictions
-        spread = np.std(probabilities)
+        spread = float(probs.std())
         spread_score = 1.0 / (1.0 + spread / 20)
 
         # Combine scores
         confidence = (agreement_score + consistency + sample_score + spread_score) / 4
 
-        return float(np.clip(confidence, 0, 1))
+        return min(max(float(confidence), 0.0), 1.0)
 
-    def calculate_brier_score(self, responses: List[ModelResponse], actual_outcome: bool) -> Dict[str, float]:
+    def calculate_brier_score(self, responses: Responses, actual_outcome: bool) -> Dict[str, float]:
         """
         Calculate Brier scores for post-event evaluation
 
         Args:
-            responses: List of model responses
+            responses: List of model responses or their ResponseColumns
             actual_outcome: True if event occurred, False otherwise
 
         Returns:
@@ -491,25 +660,23 @@ class ForecastAggregator:
         outcome_binary = 1.0 if actual_outcome else 0.0
 
         # Calculate overall Brier score
-        valid_probabilities = [r.probability / 100.0 for r in responses
-                             if r.status.value == "success" and r.probability is not None]
+        probs, models, _, _ = self._ctx(responses).valid
 
-        if not valid_probabilities:
+        if probs.size == 0:
             return {"error": "No valid probabilities for Brier score calculation"}
 
-        ensemble_prob = np.mean(valid_probabilities)
-        ensemble_brier = (ensemble_prob - outcome_binary) ** 2
+        # Per-model sums and counts; the ensemble mean reuses their totals
+        uniq, first_seen, codes = np.unique(models, return_index=True, return_inverse=True)
+        sums = np.bincount(codes, weights=probs / 100.0)
+        counts = np.bincount(codes)
 
-        # Calculate per-model Brier scores
-        model_groups = defaultdict(list)
-        for response in responses:
-            if response.status.value == "success" and response.probability is not None:
-                model_groups[response.model].append(response.probability / 100.0)
+        ensemble_prob = sums.sum() / counts.sum()
+        ensemble_brier = (ensemble_prob - outcome_binary) ** 2
 
-        model_brier_scores = {}
-        for model, probabilities in model_groups.items():
-            model_mean = np.mean(probabilities)
-            model_brier_scores[model] = (model_mean - outcome_binary) ** 2
+        # Calculate per-model Brier scores, in order of first appearance
+        briers = (sums / counts - outcome_binary) ** 2
+        order = np.argsort(first_seen)
+        model_brier_scores = dict(zip(uniq[order].tolist(), briers[order].tolist()))
 
         return {
             "ensemble_brier_score": ensemble_brier,
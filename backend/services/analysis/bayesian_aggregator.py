@@ -45,7 +45,7 @@ class BayesianAggregator:
         Returns:
             Dictionary with aggregated forecast and metadata
         """
-        if not forecasts:
+        if len(forecasts) == 0:
             return {"error": "No forecasts provided"}
 
         # Convert to 0-1 range
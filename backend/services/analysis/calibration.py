@@ -1,14 +1,132 @@
 """Batch Calibration for improving forecast accuracy and reducing overconfidence"""
 import logging
+import math
 from typing import List, Dict, Any, Tuple, Optional
 import numpy as np
-from scipy.optimize import minimize
-from scipy.special import expit, logit
-from sklearn.isotonic import IsotonicRegression
+from scipy.optimize import minimize_scalar
+from scipy.special import expit
 from sklearn.linear_model import LogisticRegression
 
+from utils.jit import njit, NUMBA_AVAILABLE
+
 logger = logging.getLogger(__name__)
 
+# Logit bound equivalent to clipping probabilities to [1e-7, 1 - 1e-7]
+LOGIT_MAX = math.log((1 - 1e-7) / 1e-7)
+
+# Fits and metrics within this tolerance of identity calibration skip the full computation
+IDENTITY_TOLERANCE = 1e-3
+
+# Number of on-the-fly calibrator fits MultiModelCalibrator keeps for reuse
+FIT_CACHE_SIZE = 32
+
+# fastmath flags that still honour infinities, which the logit of 0 or 1 produces
+_FASTMATH_INF_SAFE = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+def _stable_logit(p: np.ndarray) -> np.ndarray:
+    """Logit as log(p) - log1p(-p), clipped once in logit space to +/-LOGIT_MAX"""
+    with np.errstate(divide="ignore"):
+        z = np.log(p) - np.log1p(-p)
+    return np.clip(z, -LOGIT_MAX, LOGIT_MAX, out=z)
+
+
+@njit(fastmath=True, cache=True)
+def _temperature_nll_jit(T, base_logits, labs):
+    """Negative log likelihood of temperature-scaled logits, fused into one pass"""
+    total = 0.0
+    n = base_logits.shape[0]
+    for i in range(n):
+        p = 1.0 / (1.0 + math.exp(-base_logits[i] / T))
+        total += labs[i] * math.log(max(p, 1e-7)) + (1.0 - labs[i]) * math.log(max(1.0 - p, 1e-7))
+    return -total / n
+
+
+def _temperature_nll_numpy(T, base_logits, labs):
+    """Vectorized numpy equivalent of _temperature_nll_jit"""
+    scaled_probs = expit(base_logits / T)
+    return -np.mean(
+        labs * np.log(np.clip(scaled_probs, 1e-7, 1)) +
+        (1 - labs) * np.log(np.clip(1 - scaled_probs, 1e-7, 1))
+    )
+
+
+_temperature_nll = _temperature_nll_jit if NUMBA_AVAILABLE else _temperature_nll_numpy
+
+
+@njit(fastmath=_FASTMATH_INF_SAFE, cache=True)
+def _temperature_calibrate_jit(p, T, out):
+    """Temperature-scale 0-100 probabilities into out, in one fused pass"""
+    for i in range(p.shape[0]):
+        x = p[i] * 0.01
+        z = min(max(math.log(x) - math.log1p(-x), -LOGIT_MAX), LOGIT_MAX)
+        scaled = 1.0 / (1.0 + math.exp(-z / T))
+        out[i] = min(max(scaled * 100.0, 0.0), 100.0)
+    return out
+
+
+@njit(cache=True)
+def _pav(x, y, w):
+    """
+    Weighted isotonic (increasing) regression by pool-adjacent-violators
+
+    Args:
+        x: Inputs sorted ascending
+        y: Targets
+        w: Sample weights
+
+    Returns:
+        Tuple of (unique x knots, fitted value at each knot)
+    """
+    n = x.shape[0]
+
+    # Merge tied inputs into one weighted point
+    knots = np.empty(n)
+    values = np.empty(n)
+    weights = np.empty(n)
+    k = -1
+    for i in range(n):
+        if k >= 0 and x[i] == knots[k]:
+            values[k] += w[i] * y[i]
+            weights[k] += w[i]
+        else:
+            k += 1
+            knots[k] = x[i]
+            values[k] = w[i] * y[i]
+            weights[k] = w[i]
+    m = k + 1
+    for i in range(m):
+        values[i] /= weights[i]
+
+    # Pool adjacent blocks while they violate monotonicity
+    block_value = np.empty(m)
+    block_weight = np.empty(m)
+    block_end = np.empty(m, dtype=np.int64)
+    b = -1
+    for i in range(m):
+        b += 1
+        block_value[b] = values[i]
+        block_weight[b] = weights[i]
+        block_end[b] = i
+        while b > 0 and block_value[b - 1] >= block_value[b]:
+            total = block_weight[b - 1] + block_weight[b]
+            block_value[b - 1] = (
+                block_weight[b - 1] * block_value[b - 1] + block_weight[b] * block_value[b]
+            ) / total
+            block_weight[b - 1] = total
+            block_end[b - 1] = block_end[b]
+            b -= 1
+
+    # Expand block values back onto the knots
+    fitted = np.empty(m)
+    start = 0
+    for j in range(b + 1):
+        for i in range(start, block_end[j] + 1):
+            fitted[i] = block_value[j]
+        start = block_end[j] + 1
+
+    return knots[:m].copy(), fitted
+
 
 class BatchCalibrator:
     """
@@ -27,6 +145,11 @@ class BatchCalibrator:
         self.calibration_model = None
         self.temperature = 1.0
         self.is_fitted = False
+        # Isotonic knots (for np.interp) and Platt sigmoid parameters
+        self._iso_x = None
+        self._iso_y = None
+        self._platt_a = None
+        self._platt_b = None
 
     def fit(self, probabilities: List[float], labels: Optional[List[bool]] = None):
         """
@@ -43,8 +166,15 @@ class BatchCalibrator:
             # Unsupervised calibration based on consistency
             self._fit_unsupervised(probabilities)
 
+        self._cache_model_params()
         self.is_fitted = True
 
+    def _cache_model_params(self):
+        """Copy what inference needs out of the fitted sklearn model"""
+        if self.method == "platt" and self.calibration_model is not None:
+            self._platt_a = float(self.calibration_model.coef_[0, 0])
+            self._platt_b = float(self.calibration_model.intercept_[0])
+
     def _fit_supervised(self, probabilities: List[float], labels: List[bool]):
         """
         Fit calibration with known outcomes (post-event)
@@ -64,8 +194,7 @@ class BatchCalibrator:
 
         elif self.method == "isotonic":
             # Isotonic regression for non-parametric calibration
-            self.calibration_model = IsotonicRegression(out_of_bounds='clip')
-            self.calibration_model.fit(X.ravel(), y)
+            self._fit_isotonic(X.ravel(), y)
             logger.info("Fitted isotonic regression calibration")
 
         elif self.method == "temperature":
@@ -80,15 +209,15 @@ class BatchCalibrator:
         Args:
             probabilities: List of predicted probabilities
         """
-        # Group probabilities into batches
-        batches = self._create_batches(probabilities)
+        # Group sorted probabilities into batches and reduce each one
+        sorted_probs, sizes, means, variances = self._batch_stats(probabilities)
+        multi = sizes > 1
 
         if self.method == "temperature":
             # Estimate temperature from batch variance
-            batch_variances = [np.var(batch) for batch in batches if len(batch) > 1]
-            if batch_variances:
+            if multi.any():
                 # Higher variance suggests overconfidence
-                avg_variance = np.mean(batch_variances)
+                avg_variance = variances[multi].mean()
                 # Heuristic: scale temperature based on variance
                 self.temperature = 1.0 + (avg_variance - 0.01) * 10
                 self.temperature = max(0.5, min(2.0, self.temperature))  # Clamp
@@ -97,38 +226,76 @@ class BatchCalibrator:
             logger.info(f"Estimated temperature T={self.temperature:.3f} from batch variance")
 
         else:
-            # For other methods, create pseudo-labels based on consistency
-            pseudo_X = []
-            pseudo_y = []
-
-            for batch in batches:
-                if len(batch) > 1:
-                    mean_prob = np.mean(batch)
-                    consistency = 1.0 / (1.0 + np.std(batch))
-
-                    # Create pseudo-labels based on consistency
-                    # High consistency -> prediction likely correct
-                    # Low consistency -> move toward 0.5
-                    for prob in batch:
-                        pseudo_X.append(prob)
-                        if consistency > 0.7:
-                            pseudo_y.append(1 if prob > 0.5 else 0)
-                        else:
-                            # Less confident, use softer labels
-                            pseudo_y.append(mean_prob)
-
-            if pseudo_X:
-                X = np.array(pseudo_X).reshape(-1, 1)
-                y = np.array(pseudo_y)
+            # For other methods, create pseudo-labels based on consistency,
+            # using only batches with more than one prediction
+            keep = np.repeat(multi, sizes)
+            pseudo_X = sorted_probs[keep]
+            mean_rep = np.repeat(means, sizes)[keep]
+            consistency_rep = np.repeat(1.0 / (1.0 + np.sqrt(variances)), sizes)[keep]
+
+            # High consistency -> prediction likely correct
+            # Low consistency -> move toward 0.5 (softer label: the batch mean)
+            pseudo_y = np.where(consistency_rep > 0.7, (pseudo_X > 0.5).astype(float), mean_rep)
+
+            if pseudo_X.size:
+                X = pseudo_X.reshape(-1, 1)
+                y = pseudo_y
 
                 if self.method == "platt":
                     self.calibration_model = LogisticRegression()
                     # Use sample weights based on consistency
-                    weights = [1.0 / (1.0 + abs(p - 0.5)) for p in pseudo_X]
+                    weights = 1.0 / (1.0 + np.abs(pseudo_X - 0.5))
                     self.calibration_model.fit(X, y > 0.5, sample_weight=weights)
                 elif self.method == "isotonic":
-                    self.calibration_model = IsotonicRegression(out_of_bounds='clip')
-                    self.calibration_model.fit(X.ravel(), y)
+                    self._fit_isotonic(X.ravel(), y)
+
+    def _fit_isotonic(self, x: np.ndarray, y: np.ndarray):
+        """
+        Fit increasing isotonic regression and keep its knots
+
+        Equivalent to sklearn's IsotonicRegression(out_of_bounds='clip'), whose
+        predictions are linear interpolation between the fitted knots.
+        """
+        order = np.argsort(x, kind="stable")
+        self._iso_x, self._iso_y = _pav(
+            np.ascontiguousarray(x[order], dtype=np.float64),
+            np.ascontiguousarray(y[order], dtype=np.float64),
+            np.ones(x.shape[0])
+        )
+
+    @staticmethod
+    def _batch_stats(
+        probabilities: List[float], batch_size: int = 10
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sort probabilities and reduce consecutive batches of batch_size
+
+        Args:
+            probabilities: List of probabilities
+            batch_size: Size of each batch
+
+        Returns:
+            Tuple of (sorted probabilities, batch sizes, batch means, batch variances)
+        """
+        sorted_probs = np.sort(np.asarray(probabilities, dtype=np.float64))
+        n = sorted_probs.size
+        if n == 0:
+            empty = np.zeros(0)
+            return sorted_probs, np.zeros(0, dtype=np.intp), empty, empty
+
+        # Full batches reduce as rows of a 2-D view; a short tail batch is reduced on its own
+        n_full = (n // batch_size) * batch_size
+        full = sorted_probs[:n_full].reshape(-1, batch_size)
+        tail = sorted_probs[n_full:]
+
+        sizes = np.full(full.shape[0], batch_size, dtype=np.intp)
+        means = full.mean(axis=1)
+        variances = full.var(axis=1)
+        if tail.size:
+            sizes = np.append(sizes, tail.size)
+            means = np.append(means, tail.mean())
+            variances = np.append(variances, tail.var())
+        return sorted_probs, sizes, means, variances
 
     def calibrate(self, probability: float) -> float:
         """
@@ -143,31 +310,8 @@ class BatchCalibrator:
         if not self.is_fitted:
             return probability
 
-        # Convert to 0-1 range
-        prob_01 = probability / 100.0
-
-        if self.method == "temperature":
-            # Temperature scaling
-            if self.temperature == 1.0:
-                calibrated = prob_01
-            else:
-                # Apply temperature to logits
-                logit_val = logit(np.clip(prob_01, 1e-7, 1 - 1e-7))
-                calibrated = expit(logit_val / self.temperature)
-
-        elif self.method in ["platt", "isotonic"] and self.calibration_model:
-            # Apply fitted model
-            X = np.array([[prob_01]])
-            if self.method == "platt":
-                calibrated = self.calibration_model.predict_proba(X)[0, 1]
-            else:
-                calibrated = self.calibration_model.predict(prob_01)
-
-        else:
-            calibrated = prob_01
-
-        # Convert back to 0-100 range
-        return float(np.clip(calibrated * 100, 0, 100))
+        calibrated = self._calibrate_arr(np.array([probability / 100.0]))
+        return float(np.clip(calibrated[0] * 100, 0, 100))
 
     def calibrate_batch(self, probabilities: List[float]) -> List[float]:
         """
@@ -179,32 +323,60 @@ class BatchCalibrator:
         Returns:
             List of calibrated probabilities (0-100)
         """
+        return self.calibrate_batch_arr(np.asarray(probabilities, dtype=np.float64)).tolist()
+
+    def calibrate_batch_arr(self, probabilities: np.ndarray) -> np.ndarray:
+        """
+        Array variant of calibrate_batch that skips the list round trip
+
+        Args:
+            probabilities: Array of uncalibrated probabilities (0-100)
+
+        Returns:
+            Array of calibrated probabilities (0-100)
+        """
         # First fit on the batch if not already fitted
         if not self.is_fitted:
             self.fit(probabilities)
 
-        return [self.calibrate(p) for p in probabilities]
+        if self.method == "temperature":
+            if self.temperature == 1.0:
+                # Identity calibration: the inputs come back as they are
+                return np.clip(np.asarray(probabilities, dtype=np.float64), 0, 100)
+            if NUMBA_AVAILABLE:
+                p = np.ascontiguousarray(probabilities, dtype=np.float64)
+                return _temperature_calibrate_jit(p, self.temperature, np.empty_like(p))
+
+        p = np.asarray(probabilities, dtype=np.float64) / 100.0
+        calibrated = self._calibrate_arr(p) * 100
+        return np.clip(calibrated, 0, 100, out=calibrated)
 
-    def _create_batches(self, probabilities: List[float], batch_size: int = 10) -> List[List[float]]:
+    def _calibrate_arr(self, p01: np.ndarray) -> np.ndarray:
         """
-        Group probabilities into batches for analysis
+        Apply the fitted calibration to a whole array
 
         Args:
-            probabilities: List of probabilities
-            batch_size: Size of each batch
+            p01: Uncalibrated probabilities in the 0-1 range (may be modified in place)
 
         Returns:
-            List of batches
+            Calibrated probabilities in the 0-1 range
         """
-        batches = []
-        sorted_probs = sorted(probabilities)
+        if self.method == "temperature":
+            # Temperature scaling
+            if self.temperature == 1.0:
+                return p01
+            # Apply temperature to logits
+            return expit(_stable_logit(p01) / self.temperature)
+
+        if self.method == "platt" and self._platt_a is not None:
+            # Platt scaling is a single sigmoid of the input
+            return expit(self._platt_a * p01 + self._platt_b)
 
-        for i in range(0, len(sorted_probs), batch_size):
-            batch = sorted_probs[i:i + batch_size]
-            if batch:
-                batches.append(batch)
+        if self.method == "isotonic" and self._iso_x is not None:
+            # Isotonic fit (clipped out of bounds) is linear interpolation between knots
+            return np.interp(p01, self._iso_x, self._iso_y)
 
-        return batches
+        return p01
 
     def _optimize_temperature(self, probabilities: List[float], labels: List[bool]) -> float:
         """
@@ -220,21 +392,22 @@ class BatchCalibrator:
         probs = np.array(probabilities) / 100.0
         labs = np.array(labels).astype(float)
 
-        def neg_log_likelihood(T):
-            # Apply temperature scaling
-            scaled_logits = logit(np.clip(probs, 1e-7, 1 - 1e-7)) / T[0]
-            scaled_probs = expit(scaled_logits)
+        # Logits do not depend on T: compute them once per fit, not per objective call
+        base_logits = _stable_logit(probs)
 
-            # Calculate negative log likelihood
-            nll = -np.mean(
-                labs * np.log(np.clip(scaled_probs, 1e-7, 1)) +
-                (1 - labs) * np.log(np.clip(1 - scaled_probs, 1e-7, 1))
-            )
-            return nll
+        # The NLL is convex in 1/T, so its slope at T=1 bounds the gain any T in
+        # [0.1, 10] could bring (1/T moves by at most 9). When that gain is
+        # negligible keep T=1 and let calibrate take its identity fast path.
+        slope = np.mean((expit(base_logits) - labs) * base_logits)
+        if abs(slope) * 9.0 < IDENTITY_TOLERANCE:
+            return 1.0
 
-        # Optimize temperature
-        result = minimize(neg_log_likelihood, [1.0], bounds=[(0.1, 10.0)])
-        return result.x[0]
+        # Optimize temperature (bounded Brent search over the single scalar)
+        result = minimize_scalar(
+            _temperature_nll, args=(base_logits, labs), bounds=(0.1, 10.0),
+            method="bounded", options={"xatol": 1e-4}
+        )
+        return float(result.x)
 
     def get_calibration_metrics(self, probabilities: List[float], labels: List[bool]) -> Dict[str, float]:
         """
@@ -250,30 +423,39 @@ class BatchCalibrator:
         probs = np.array(probabilities) / 100.0
         labs = np.array(labels).astype(float)
 
-        # Expected calibration error (ECE)
+        errors = probs - labs
+        if errors.size and np.abs(errors).max() < IDENTITY_TOLERANCE:
+            # Every prediction matches its outcome almost exactly: treat as perfectly calibrated
+            return {
+                "expected_calibration_error": 0.0,
+                "maximum_calibration_error": 0.0,
+                "brier_score": float(np.mean(errors ** 2)),
+                "temperature": self.temperature if self.method == "temperature" else None
+            }
+
+        # Bucket each probability into its (lower, upper] bin in one pass;
+        # values outside (0, 1] fall in no bin, as before
         n_bins = 10
         bin_boundaries = np.linspace(0, 1, n_bins + 1)
-        ece = 0.0
+        bins = np.searchsorted(bin_boundaries, probs, side="left") - 1
+        in_range = (bins >= 0) & (bins < n_bins)
+        bins, binned_probs, binned_labs = bins[in_range], probs[in_range], labs[in_range]
+
+        counts = np.bincount(bins, minlength=n_bins)
+        acc_sum = np.bincount(bins, weights=binned_labs, minlength=n_bins)
+        conf_sum = np.bincount(bins, weights=binned_probs, minlength=n_bins)
+
+        occupied = counts > 0
+        gaps = np.abs(acc_sum[occupied] - conf_sum[occupied]) / counts[occupied]
 
-        for i in range(n_bins):
-            mask = (probs > bin_boundaries[i]) & (probs <= bin_boundaries[i + 1])
-            if np.sum(mask) > 0:
-                bin_acc = np.mean(labs[mask])
-                bin_conf = np.mean(probs[mask])
-                bin_weight = np.sum(mask) / len(probs)
-                ece += bin_weight * np.abs(bin_acc - bin_conf)
+        # Expected calibration error (ECE)
+        ece = float(np.sum(counts[occupied] / len(probs) * gaps))
 
         # Maximum calibration error (MCE)
-        mce = 0.0
-        for i in range(n_bins):
-            mask = (probs > bin_boundaries[i]) & (probs <= bin_boundaries[i + 1])
-            if np.sum(mask) > 0:
-                bin_acc = np.mean(labs[mask])
-                bin_conf = np.mean(probs[mask])
-                mce = max(mce, np.abs(bin_acc - bin_conf))
+        mce = float(gaps.max()) if gaps.size else 0.0
 
         # Brier score
-        brier_score = np.mean((probs - labs) ** 2)
+        brier_score = np.mean(errors ** 2)
 
         return {
             "expected_calibration_error": float(ece),
@@ -291,6 +473,8 @@ class MultiModelCalibrator:
     def __init__(self):
         """Initialize multi-model calibrator"""
         self.model_calibrators = {}
+        # Temperatures fitted on the fly, keyed by their rounded, sorted input batch
+        self._fit_cache: Dict[bytes, float] = {}
 
     def fit_model(self, model_name: str, probabilities: List[float], labels: Optional[List[bool]] = None):
         """
@@ -316,19 +500,66 @@ class MultiModelCalibrator:
         Returns:
             Dictionary of calibrated predictions
         """
+        calibrated = self.calibrate_ensemble_arr({
+            model_name: np.asarray(predictions, dtype=np.float64)
+            for model_name, predictions in model_predictions.items()
+        })
+        return {model_name: values.tolist() for model_name, values in calibrated.items()}
+
+    def calibrate_ensemble_arr(self, model_predictions: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Calibrate predictions from all models, keeping them as arrays
+
+        Args:
+            model_predictions: Dictionary mapping model names to prediction arrays (0-100)
+
+        Returns:
+            Dictionary of calibrated prediction arrays
+        """
         calibrated_predictions = {}
 
         for model_name, predictions in model_predictions.items():
             if model_name in self.model_calibrators:
                 # Use fitted calibrator
                 calibrator = self.model_calibrators[model_name]
-                calibrated = calibrator.calibrate_batch(predictions)
             else:
-                # Fit new calibrator on the fly
-                calibrator = BatchCalibrator(method="temperature")
-                calibrated = calibrator.calibrate_batch(predictions)
+                # Fit new calibrator on the fly, reusing one fitted on an identical batch
+                calibrator = self._fitted_for(predictions)
                 self.model_calibrators[model_name] = calibrator
 
-            calibrated_predictions[model_name] = calibrated
+            calibrated_predictions[model_name] = calibrator.calibrate_batch_arr(predictions)
 
-        return calibrated_predictions
\ No newline at end of file
+        return calibrated_predictions
+
+    def _fitted_for(self, predictions: np.ndarray) -> 'BatchCalibrator':
+        """
+        Return a new temperature calibrator fitted on predictions
+
+        The unsupervised fit only depends on the sorted batch, so models whose
+        values land in the same uint8 buckets (0.4 points apart on the 0-100
+        scale) reuse one fitted temperature. Each call still returns its own
+        calibrator instance.
+        """
+        key = self._quantized_key(predictions)
+        temperature = self._fit_cache.pop(key, None)
+        calibrator = BatchCalibrator(method="temperature")
+        if temperature is None:
+            if len(self._fit_cache) >= FIT_CACHE_SIZE:
+                # Least recently used entry sits first in insertion order
+                self._fit_cache.pop(next(iter(self._fit_cache)))
+            calibrator.fit(predictions)
+        else:
+            calibrator.temperature = temperature
+            calibrator.is_fitted = True
+        self._fit_cache[key] = calibrator.temperature
+        return calibrator
+
+    @staticmethod
+    def _quantized_key(predictions: np.ndarray) -> bytes:
+        """Sorted predictions quantized to uint8, prefixed with the scale they were read on"""
+        values = np.asarray(predictions, dtype=np.float32)
+        # Batches already on the 0-1 scale get the full 256 buckets rather than three
+        scale = np.float32(255.0) if values.size and values.max() <= 1.0 else np.float32(2.55)
+        buckets = np.clip(np.rint(values * scale), 0, 255).astype(np.uint8)
+        buckets.sort()
+        return (b"u" if scale == 255 else b"p") + buckets.tobytes()
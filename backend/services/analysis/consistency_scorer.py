@@ -158,6 +158,37 @@ class ConsistencyScorer:
         Returns:
             Weighted ensemble probability
         """
+        consistencies = {
+            model_name: self.calculate_consistency(predictions)
+            for model_name, predictions in model_predictions.items()
+            if predictions
+        }
+        return self._weighted_mean(model_predictions, consistencies)
+
+    def score_and_aggregate(self, model_predictions: Dict[str, List[float]]) -> Tuple[Dict[str, Any], float]:
+        """
+        Score the ensemble and compute the consistency-weighted aggregate in one pass
+
+        Equivalent to calling score_ensemble and calculate_weighted_aggregate, but
+        each model's consistency is computed only once.
+
+        Args:
+            model_predictions: Dictionary mapping models to their predictions
+
+        Returns:
+            Tuple of (score_ensemble result, weighted ensemble probability)
+        """
+        scores = self.score_ensemble(model_predictions)
+        consistencies = {
+            model_name: metrics["consistency_score"]
+            for model_name, metrics in scores["model_scores"].items()
+            if model_predictions[model_name]
+        }
+        return scores, self._weighted_mean(model_predictions, consistencies)
+
+    @staticmethod
+    def _weighted_mean(model_predictions: Dict[str, List[float]], consistencies: Dict[str, float]) -> float:
+        """Mean of per-model means weighted by squared consistency"""
         weighted_sum = 0.0
         total_weight = 0.0
 
@@ -165,8 +196,7 @@ class ConsistencyScorer:
             if not predictions:
                 continue
 
-            # Calculate consistency weight
-            consistency = self.calculate_consistency(predictions)
+            consistency = consistencies[model_name]
 
             # Apply non-linear weighting (square to emphasize consistent models)
             weight = consistency ** 2
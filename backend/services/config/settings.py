@@ -1,8 +1,9 @@
 """Configuration management for Foresight Analyzer"""
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -10,13 +11,19 @@ load_dotenv()
 
 class APIConfig(BaseModel):
     """API configuration settings"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     api_key: str = Field(..., description="OpenRouter API key")
     base_url: str = Field(default="https://openrouter.ai/api/v1", description="API base URL")
     timeout: int = Field(default=120, description="Request timeout in seconds")
     retry_attempts: int = Field(default=3, description="Number of retry attempts")
     retry_delay: int = Field(default=5, description="Delay between retries in seconds")
+    max_connections: int = Field(default=200, description="Maximum concurrent HTTP connections")
+    max_keepalive: int = Field(default=50, description="Maximum idle keep-alive connections")
+    stream_early_stop: bool = Field(default=False, description="Stream completions and stop once the HAUPTPROGNOSE answer has arrived")
 
-    @validator('api_key')
+    @field_validator('api_key')
+    @classmethod
     def api_key_not_empty(cls, v):
         if not v or v == "your_openrouter_api_key_here":
             raise ValueError("Valid OpenRouter API key required")
@@ -24,8 +31,10 @@ class APIConfig(BaseModel):
 
 class ModelConfig(BaseModel):
     """Model configuration settings"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     enabled_models: List[str] = Field(
-        default=[
+        default_factory=lambda: [
             "google/gemini-2.0-flash-exp",
             "openai/gpt-4-turbo-preview",
             "anthropic/claude-3-opus-20240229",
@@ -37,7 +46,8 @@ class ModelConfig(BaseModel):
     iterations_per_model: int = Field(default=10, description="Number of iterations per model")
     concurrent_requests: int = Field(default=3, description="Number of concurrent API requests")
 
-    @validator('iterations_per_model')
+    @field_validator('iterations_per_model')
+    @classmethod
     def validate_iterations(cls, v):
         if v < 1 or v > 100:
             raise ValueError("Iterations must be between 1 and 100")
@@ -45,20 +55,43 @@ class ModelConfig(BaseModel):
 
 class OutputConfig(BaseModel):
     """Output configuration settings"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     output_dir: Path = Field(default=Path("data/results"), description="Output directory")
     excel_filename_prefix: str = Field(default="foresight_analysis", description="Excel filename prefix")
     save_raw_responses: bool = Field(default=True, description="Save raw API responses")
 
-    @validator('output_dir')
+    @field_validator('output_dir', mode='after')
+    @classmethod
     def create_output_dir(cls, v):
-        v.mkdir(parents=True, exist_ok=True)
+        if not v.exists():
+            v.mkdir(parents=True, exist_ok=True)
+        return v
+
+class CacheConfig(BaseModel):
+    """Response cache configuration settings"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
+    semantic_enabled: bool = Field(default=False, description="Serve near-duplicate prompts from the semantic cache")
+    semantic_threshold: float = Field(default=0.95, description="Minimum cosine similarity for a semantic cache hit")
+    semantic_ttl_hours: int = Field(default=24, description="Time-to-live of semantic cache entries in hours")
+    embedding_model: str = Field(default="openai/text-embedding-3-small", description="Embedding model for prompts")
+
+    @field_validator('semantic_threshold')
+    @classmethod
+    def validate_threshold(cls, v):
+        if not 0 < v <= 1:
+            raise ValueError("Semantic cache threshold must be in (0, 1]")
         return v
 
 class Settings(BaseModel):
     """Main settings container"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     api: APIConfig
     models: ModelConfig
     output: OutputConfig
+    cache: CacheConfig = Field(default_factory=CacheConfig)
 
     @classmethod
     def load_from_env(cls) -> 'Settings':
@@ -69,7 +102,10 @@ class Settings(BaseModel):
             base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
             timeout=int(os.getenv("REQUEST_TIMEOUT", "120")),
             retry_attempts=int(os.getenv("RETRY_ATTEMPTS", "3")),
-            retry_delay=int(os.getenv("RETRY_DELAY", "5"))
+            retry_delay=int(os.getenv("RETRY_DELAY", "5")),
+            max_connections=int(os.getenv("MAX_CONNECTIONS", "200")),
+            max_keepalive=int(os.getenv("MAX_KEEPALIVE_CONNECTIONS", "50")),
+            stream_early_stop=os.getenv("STREAM_EARLY_STOP", "false").lower() == "true"
         )
 
         # Model configuration
@@ -91,14 +127,17 @@ class Settings(BaseModel):
             save_raw_responses=os.getenv("SAVE_RAW_RESPONSES", "true").lower() == "true"
         )
 
-        return cls(api=api_config, models=model_config, output=output_config)
+        # Cache configuration
+        cache_config = CacheConfig(
+            semantic_enabled=os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true",
+            semantic_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+            semantic_ttl_hours=int(os.getenv("SEMANTIC_CACHE_TTL_HOURS", "24")),
+            embedding_model=os.getenv("EMBEDDING_MODEL", "openai/text-embedding-3-small")
+        )
 
-# Singleton instance
-settings = None
+        return cls(api=api_config, models=model_config, output=output_config, cache=cache_config)
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get or create settings instance"""
-    global settings
-    if settings is None:
-        settings = Settings.load_from_env()
-    return settings
\ No newline at end of file
+    return Settings.load_from_env()
\ No newline at end of file
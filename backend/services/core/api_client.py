@@ -1,20 +1,261 @@
 """OpenRouter API client wrapper for LLM interactions"""
 import asyncio
+import hashlib
 import json
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Optional, List, Pattern, Tuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import aiohttp
-from aiohttp import ClientTimeout, ClientError
-import backoff
+from aiohttp import ClientTimeout
+import httpx
+import numpy as np
+import openai
+import orjson
 from openai import AsyncOpenAI
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 from services.config.settings import get_settings
 from services.core.cache_manager import CacheManager
+from services.core.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
 
+class _PatternTier:
+    """
+    Patterns of one priority tier, gated on literals they all require
+
+    Every pattern in the tier contains at least one of the required literals,
+    so a tier whose literals are all absent from the lowercased response cannot
+    match and is skipped with a few substring checks instead of one regex scan
+    per pattern. Literals avoid i, k and s, whose IGNORECASE matching also
+    accepts non-ASCII letters that str.lower() leaves alone.
+    """
+    __slots__ = ("patterns", "required")
+
+    def __init__(self, patterns: Tuple[str, ...], flags: int, required: Tuple[str, ...]):
+        self.patterns: Tuple[Pattern, ...] = tuple(re.compile(p, flags) for p in patterns)
+        self.required = required
+
+    def _possible(self, content_lower: str) -> bool:
+        return any(literal in content_lower for literal in self.required)
+
+    def searches(self, content: str, content_lower: str) -> Iterator[re.Match]:
+        """Leftmost match of each pattern that matches, in priority order"""
+        if not self._possible(content_lower):
+            return
+        for pattern in self.patterns:
+            match = pattern.search(content)
+            if match:
+                yield match
+
+    def findalls(self, content: str, content_lower: str) -> Iterator[List[str]]:
+        """Non-empty findall results of each pattern, in priority order"""
+        if not self._possible(content_lower):
+            return
+        for pattern in self.patterns:
+            matches = pattern.findall(content)
+            if matches:
+                yield matches
+
+
+@lru_cache(maxsize=256)
+def _min_tokens_for(model: str) -> int:
+    """
+    Minimum max_tokens for a model family (0 for no adjustment)
+
+    Increased for better detailed responses; resolved once per model id.
+    """
+    ml = model.lower()
+    if 'gemini' in ml or 'gemma' in ml:
+        return 8000  # Minimum 8000 for Gemini/Gemma
+    if 'gpt-5' in ml:
+        return 4000  # Increased for detailed GPT-5 responses
+    if 'qwen' in ml or 'qwq' in ml:
+        # Special handling for Qwen variants
+        if 'qwen-2.5-72b' in ml:
+            return 10000  # Larger model can handle more tokens
+        return 8000  # Coder and other Qwen models
+    if 'deepseek' in ml:
+        return 8000  # Increased for detailed DeepSeek responses
+    if 'grok' in ml:
+        return 8000  # Increased for detailed Grok responses
+    if 'llama' in ml:
+        # Newer Llama-4 can handle more
+        return 8000 if 'llama-4-maverick' in ml else 6000
+    # Default for free tier models without specific settings
+    return 6000 if ':free' in ml else 0
+
+
+# Usage reported when the API returns none; copied into each result that carries it
+_EMPTY_USAGE = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+# HTTP statuses worth retrying: rate limits and transient server-side failures
+_RETRIABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# A complete HAUPTPROGNOSE answer, in a form the first extraction tier accepts;
+# the terminating % guarantees the number has fully arrived
+_STREAM_STOP_RE = re.compile(
+    r'HAUPTPROGNOSE:\s*(?:(\d+(?:\.\d+)?)\s*%|\*\*(\d+(?:\.\d+)?)\s*%\*\*)', re.IGNORECASE
+)
+# Streamed characters between checks for the answer, and how far each check
+# reaches back so that an answer split across chunks is still found
+_STREAM_CHECK_CHARS = 512
+_STREAM_CHECK_OVERLAP = 64
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Delay requested by a Retry-After header (seconds or HTTP date), if any"""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+# Phrases (lowercase) marking a response where the model refused the prompt
+_REJECTION_PHRASES = (
+    "cannot ignore my safety instructions",
+    "must decline this request",
+    "attempt to override",
+    "cannot comply with",
+    "against my programming",
+    "violates my guidelines",
+)
+
+# Probability extraction patterns, compiled once and grouped by priority tier
+_IC = re.IGNORECASE
+_ML_IC = re.MULTILINE | re.IGNORECASE
+
+_HAUPTPROGNOSE_TIER = _PatternTier((
+    r'HAUPTPROGNOSE:\s*(\d+(?:\.\d+)?)\s*%',  # Standard format
+    r'\*\*HAUPTPROGNOSE:\s*(\d+(?:\.\d+)?)\s*%\*\*',  # Bold markdown
+    r'HAUPTPROGNOSE:\s*\*\*(\d+(?:\.\d+)?)\s*%\*\*',  # Bold percentage only
+    r'HAUPTPROGNOSE:\s*(\d+(?:\.\d+)?)',  # Without % sign
+), _IC, ("hauptprogno",))
+
+_PROGNOSE_TIER = _PatternTier((
+    r'PROGNOSE:\s*(\d+(?:\.\d+)?)\s*%',  # Standard format
+    r'\*\*PROGNOSE:\s*(\d+(?:\.\d+)?)\s*%\*\*',  # Bold markdown
+    r'PROGNOSE:\s*\*\*(\d+(?:\.\d+)?)\s*%\*\*',  # Bold percentage only
+    r'PROGNOSE:\s*(\d+(?:\.\d+)?)',  # Without % sign
+), _IC, ("progno",))
+
+_FINAL_PROB_TIER = _PatternTier((
+    r'Final_Probability\s*=\s*(\d+(?:\.\d+)?)',
+    r'Final_Probability\s*=.*?(\d+(?:\.\d+)?)\s*%',
+    r'=\s*(\d+(?:\.\d+)?)\s*(?:%)?$',  # End of calculation
+), _ML_IC, ("=",))
+
+_DEEPSEEK_TIER = _PatternTier((
+    r'Therefore,?\s+the\s+probability\s+is\s+(\d+(?:\.\d+)?)\s*%',
+    r'I\s+estimate\s+(?:the\s+probability\s+)?(?:to\s+be\s+)?(\d+(?:\.\d+)?)\s*%',
+    r'My\s+assessment:\s*(\d+(?:\.\d+)?)\s*%',
+    r'Estimated\s+probability:\s*(\d+(?:\.\d+)?)\s*%',
+), _IC, ("%",))
+
+_QWEN_TIER = _PatternTier((
+    r'My\s+final\s+estimate:\s*(\d+(?:\.\d+)?)\s*%',
+    r'I\s+conclude\s+(?:with\s+)?(?:a\s+)?(\d+(?:\.\d+)?)\s*%',
+    r'Overall\s+probability:\s*(\d+(?:\.\d+)?)\s*%',
+    r'Assessment:\s*(\d+(?:\.\d+)?)\s*%',
+), _IC, ("%",))
+
+_JSON_TIER = _PatternTier((
+    r'\{"probability":\s*(\d+(?:\.\d+)?)\}',
+    r'"probability":\s*"?(\d+(?:\.\d+)?)"?%?',
+    r'probability:\s*(\d+(?:\.\d+)?)\s*%?',
+), _IC, ("probab",))
+
+def _json_probability(content: str) -> Optional[float]:
+    """Top-level "probability" of the JSON object spanning the outermost braces, if valid"""
+    if '"probability"' not in content:
+        return None
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end < start:
+        return None
+    try:
+        obj = orjson.loads(content[start:end + 1])
+        raw = obj["probability"]
+        if isinstance(raw, bool):
+            return None
+        value = float(raw)
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+    return value if 0 <= value <= 100 else None
+
+
+# Forecast section keywords, matched against lowercased text
+_FORECAST_KEYWORDS = (
+    "prognose:",
+    "forecast:",
+    "prediction:",
+    "probability:",
+    "wahrscheinlichkeit:",
+    "final probability:",
+    "ensemble probability:",
+    "result:",
+    "answer:",
+    "conclusion:",
+    "estimate:",
+    "assessment:",
+)
+
+_PERCENT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+_FIRST_NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)')
+# Numbers of up to three integer digits: longer runs (years, counts) and the
+# fractional part of a longer number are never probabilities
+_TAIL_NUMBER_RE = re.compile(r'(?<!\d\.)\b(\d{1,3}(?:\.\d+)?)\b')
+# Number of trailing characters searched for a standalone probability
+_TAIL_SPAN = 500
+
+_PERCENT_TIER = _PatternTier((
+    r'(\d+(?:\.\d+)?)\s*%',  # "45.2%"
+    r'(\d+(?:\.\d+)?)\s*percent',  # "45.2 percent"
+    r'probability\s*(?:of|is|:)?\s*(\d+(?:\.\d+)?)\s*%',  # "probability: 45%"
+    r'(\d+(?:\.\d+)?)\s*%\s*probability',  # "45% probability"
+    r'final.*?(\d+(?:\.\d+)?)\s*%',  # "final answer: 45%"
+    r'answer.*?(\d+(?:\.\d+)?)\s*%',  # "answer is 45%"
+    r'final_probability.*?(\d+(?:\.\d+)?)\s*%',  # "Final_Probability = 45%"
+    r'Final_Probability.*?(\d+(?:\.\d+)?)',  # GPT-5 format with formula result
+    r'=\s*(\d+(?:\.\d+)?)\s*%',  # "= 45%" calculation result
+    r'therefore.*?(\d+(?:\.\d+)?)\s*%',  # "Therefore, 45%"
+    r'conclusion.*?(\d+(?:\.\d+)?)\s*%',  # "In conclusion, 45%"
+    r'estimate.*?(\d+(?:\.\d+)?)\s*%',  # "I estimate 45%"
+    r'assess.*?(\d+(?:\.\d+)?)\s*%',  # "I assess 45%"
+    r'likely.*?(\d+(?:\.\d+)?)\s*%',  # "likely 45%"
+    r'around\s*(\d+(?:\.\d+)?)\s*%',  # "around 45%"
+    r'approximately\s*(\d+(?:\.\d+)?)\s*%',  # "approximately 45%"
+    r'roughly\s*(\d+(?:\.\d+)?)\s*%',  # "roughly 45%"
+    r'my\s+(?:final\s+)?(?:forecast|prediction|estimate)\s+is\s+(\d+(?:\.\d+)?)\s*%',  # "my forecast is X%"
+    r'i\s+(?:would\s+)?(?:forecast|predict|estimate)\s+(\d+(?:\.\d+)?)\s*%',  # "I forecast X%"
+), _IC, ("%", "percent", "_probab"))
+
+_FORMULA_TIER = _PatternTier((
+    r'Final_Probability\s*=.*?(\d+(?:\.\d+)?)',  # Formula calculation
+    r'\(\s*\d+(?:\.\d+)?\s*×.*?\)\s*/\s*100\s*=\s*(\d+(?:\.\d+)?)',  # Division result
+    r'=\s*(\d+(?:\.\d+)?)\s*(?:%)?$',  # End of line calculation result
+    r'Antwort:\s*(\d+(?:\.\d+)?)\s*%',  # German "Answer:"
+    r'Ergebnis:\s*(\d+(?:\.\d+)?)\s*%',  # German "Result:"
+), _ML_IC, ("=", "%"))
+
+
 class OpenRouterClient:
     """Async client for OpenRouter API interactions"""
 
@@ -32,6 +273,7 @@ class OpenRouterClient:
         self.timeout = settings.api.timeout
         self.retry_attempts = settings.api.retry_attempts
         self.retry_delay = settings.api.retry_delay
+        self.stream_early_stop = settings.api.stream_early_stop
         self.use_cache = use_cache
 
         # Initialize cache manager
@@ -40,22 +282,70 @@ class OpenRouterClient:
         else:
             self.cache = None
 
+        # Optional second tier serving near-duplicate prompts by embedding similarity
+        self.embedding_model = settings.cache.embedding_model
+        if self.use_cache and settings.cache.semantic_enabled:
+            self.semantic_cache = SemanticCache(
+                threshold=settings.cache.semantic_threshold,
+                ttl_hours=settings.cache.semantic_ttl_hours
+            )
+        else:
+            self.semantic_cache = None
+
+        # Pooled HTTP client for the OpenAI SDK, sized from settings rather than
+        # httpx's defaults; with HTTP/2 concurrent queries share connections
+        self._httpx = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=settings.api.max_connections,
+                max_keepalive_connections=settings.api.max_keepalive
+            )
+        )
+
         # Initialize OpenAI client with OpenRouter configuration
         self.client = AsyncOpenAI(
             base_url=self.base_url,
             api_key=self.api_key,
+            http_client=self._httpx,
             default_headers={
                 "HTTP-Referer": "https://github.com/foresight-analyzer",
                 "X-Title": "Foresight Analyzer"
             }
         )
 
-    @backoff.on_exception(
-        backoff.expo,
-        (ClientError, asyncio.TimeoutError),
-        max_tries=3,
-        max_time=60
-    )
+        # Models seen returning a single choice when asked for n > 1
+        self._single_sample_models = set()
+
+        # Coalescing key -> future of the API call currently serving it
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Shared aiohttp session for direct REST calls, opened on first use so it
+        # binds to the running loop; keeps connections and DNS lookups warm
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled aiohttp session, creating it if needed"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=32,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                ),
+                timeout=ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def aclose(self):
+        """Close the pooled HTTP clients; call once the client is no longer needed"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if not self._httpx.is_closed:
+            await self._httpx.aclose()
+
     async def query_model(
         self,
         model: str,
@@ -63,11 +353,19 @@ class OpenRouterClient:
         temperature: float = 0.7,
         max_tokens: int = 4000,
         enable_web_search: bool = True,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        return_logprobs: bool = False,
+        coalesce: bool = False
     ) -> Dict[str, Any]:
         """
         Query a specific model with retry logic and caching
 
+        Timeouts, connection failures, rate limits (429) and transient server
+        errors (5xx) are retried up to retry_attempts times with exponential
+        backoff, or after the server's Retry-After on 429; other failures such
+        as 400/401/404 are returned immediately. All attempts share one
+        deadline of timeout seconds, so retries never extend the call past it.
+
         Args:
             model: Model identifier (e.g., 'openai/gpt-4')
             prompt: The prompt to send
@@ -75,251 +373,498 @@ class OpenRouterClient:
             max_tokens: Maximum tokens in response
             enable_web_search: Enable web search for current information (default: True)
             force_refresh: Force API call even if cache exists (default: False)
+            return_logprobs: Request token log probabilities and return them (default: False)
+            coalesce: Share one API call between identical concurrent requests (default: False)
 
         Returns:
             Response dictionary with model output and metadata
         """
+        results = await self.query_samples(
+            model, prompt, 1, temperature, max_tokens, enable_web_search, force_refresh, return_logprobs, coalesce
+        )
+        return results[0]
+
+    async def query_samples(
+        self,
+        model: str,
+        prompt: str,
+        n: int = 1,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        enable_web_search: bool = True,
+        force_refresh: bool = False,
+        return_logprobs: bool = False,
+        coalesce: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Draw up to n completions for one prompt in a single request (n= parameter)
+
+        The prompt is sent and billed once, so the request's token usage is
+        reported on the first sample and the others carry zero usage. Models that
+        ignore n return fewer samples than requested. Failures are returned as n
+        copies of the error response; a cache hit serves every sample.
+
+        Identical requests issued while one is already in flight wait for it and
+        receive copies of its results instead of calling the API again. This
+        applies to deterministic requests (temperature 0) and, with coalesce=True,
+        to sampled ones, which otherwise expect distinct outputs.
+
+        Args:
+            model: Model identifier (e.g., 'openai/gpt-4')
+            prompt: The prompt to send
+            n: Number of completions to request
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            enable_web_search: Enable web search for current information (default: True)
+            force_refresh: Force API call even if cache exists (default: False)
+            return_logprobs: Request token log probabilities and return them (default: False)
+            coalesce: Share one API call between identical concurrent requests (default: False)
+
+        Returns:
+            List of response dictionaries, one per completion
+        """
         # Check cache first if enabled
         if self.cache and not force_refresh:
-            cached_response = self.cache.get(model, prompt)
+            cached_response = await self.cache.aget(model, prompt)
             if cached_response:
                 logger.info(f"Using cached response for {model} (saving API credits)")
                 cached_response['response_source'] = 'cache'
-                return cached_response
+                return [cached_response] + [dict(cached_response) for _ in range(n - 1)]
+
+        # Fall back to the semantic cache: the prompt is embedded once, for both
+        # the lookup and storing the new response
+        embedding = None
+        if self.semantic_cache:
+            embedding = await self._embed(prompt)
+            if embedding is not None and not force_refresh:
+                similar_response = self.semantic_cache.get(model, embedding)
+                if similar_response:
+                    logger.info(f"Using semantically cached response for {model} (saving API credits)")
+                    similar_response['response_source'] = 'semantic_cache'
+                    return [similar_response] + [dict(similar_response) for _ in range(n - 1)]
 
         # Apply model-specific token requirements
-        # Model-specific token adjustments - Increased for better detailed responses
-        if 'gemini' in model.lower() or 'gemma' in model.lower():
-            max_tokens = max(max_tokens, 8000)  # Minimum 8000 for Gemini/Gemma
-            logger.debug(f"Adjusting max_tokens for Gemini/Gemma to {max_tokens}")
-        elif 'gpt-5' in model.lower():
-            max_tokens = max(max_tokens, 4000)  # Increased for detailed GPT-5 responses
-            logger.debug(f"Adjusting max_tokens for GPT-5 to {max_tokens}")
-        elif 'qwen' in model.lower() or 'qwq' in model.lower():
-            # Special handling for Qwen variants
-            if 'qwen-2.5-72b' in model.lower():
-                max_tokens = max(max_tokens, 10000)  # Larger model can handle more tokens
-            elif 'qwen-2.5-coder' in model.lower():
-                max_tokens = max(max_tokens, 8000)  # Coder model optimized for detailed code
-            else:
-                max_tokens = max(max_tokens, 8000)  # Default for other Qwen models
-            logger.debug(f"Adjusting max_tokens for Qwen to {max_tokens}")
-        elif 'deepseek' in model.lower():
-            max_tokens = max(max_tokens, 8000)  # Increased for detailed DeepSeek responses
-            logger.debug(f"Adjusting max_tokens for DeepSeek to {max_tokens}")
-        elif 'grok' in model.lower():
-            max_tokens = max(max_tokens, 8000)  # Increased for detailed Grok responses
-            logger.debug(f"Adjusting max_tokens for Grok to {max_tokens}")
-        elif 'llama' in model.lower():
-            # Special handling for Llama variants
-            if 'llama-4-maverick' in model.lower():
-                max_tokens = max(max_tokens, 8000)  # Newer Llama-4 can handle more
-            else:
-                max_tokens = max(max_tokens, 6000)  # Default for other Llama models
-            logger.debug(f"Adjusting max_tokens for Llama to {max_tokens}")
-        else:
-            # Default for free tier models without specific settings
-            if ':free' in model.lower():
-                max_tokens = max(max_tokens, 6000)  # Default 6000 for free models
-                logger.debug(f"Adjusting max_tokens for free tier model to {max_tokens}")
-
-        start_time = datetime.now()
-
-        try:
-            # Prepare request parameters
-            request_params = {
-                "model": model,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-                "timeout": self.timeout
-            }
-
-            # Add web search configuration if enabled
-            if enable_web_search:
-                request_params["extra_body"] = {
-                    "web_search": {
-                        "engine": "native"
-                    }
-                }
+        min_tokens = _min_tokens_for(model)
+        if min_tokens:
+            max_tokens = max(max_tokens, min_tokens)
+            logger.debug(f"Adjusting max_tokens for {model} to {max_tokens}")
+
+        async def request() -> List[Dict[str, Any]]:
+            results = await self._request_samples(
+                model, prompt, n, temperature, max_tokens, enable_web_search, return_logprobs
+            )
 
-            response = await self.client.chat.completions.create(**request_params)
+            # Cache the first successful response
+            if self.cache:
+                for result in results:
+                    if result["status"] == "success":
+                        await self.cache.aset(model, prompt, result)
+                        if embedding is not None:
+                            self.semantic_cache.set(model, embedding, result)
+                        logger.debug(f"Cached response for {model}")
+                        break
 
-            # Calculate response time
-            response_time = (datetime.now() - start_time).total_seconds()
+            return results
 
-            # Extract the response
-            content = response.choices[0].message.content if response.choices else ""
+        if not (coalesce or temperature == 0):
+            return await request()
 
-            # Log response statistics
-            response_length = len(content) if content else 0
-            logger.debug(f"Response from {model}: {response_length} characters")
+        key = hashlib.blake2b(
+            f"{model}|{prompt}|{temperature}|{max_tokens}|{n}|{enable_web_search}|{return_logprobs}".encode(),
+            digest_size=16
+        ).hexdigest()
+        return await self._coalesced(key, request)
 
-            # Initialize is_rejected early to avoid reference errors
-            is_rejected = False
+    async def _coalesced(self, key: str, request) -> List[Dict[str, Any]]:
+        """
+        Run request() once for all concurrent callers sharing a key
 
-            # Check if the model rejected the prompt (safety filter)
-            rejection_patterns = [
-                "cannot ignore my safety instructions",
-                "must decline this request",
-                "attempt to override",
-                "cannot comply with",
-                "against my programming",
-                "violates my guidelines"
-            ]
+        Args:
+            key: Coalescing key of the request
+            request: Coroutine function performing the API call
 
-            content_lower = content.lower() if content else ""
-            is_rejected = any(pattern in content_lower for pattern in rejection_patterns)
+        Returns:
+            The request's results; callers that joined an in-flight request get copies
+        """
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # Shielded so that a cancelled waiter does not cancel the shared call
+            shared = await asyncio.shield(pending)
+            if shared is not None:
+                logger.debug("Joined an identical in-flight request")
+                return [dict(result) for result in shared]
+            # The request being joined was cancelled: elect a new one
+            return await self._coalesced(key, request)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            results = await request()
+            future.set_result(results)
+            return results
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.set_result(None)
+
+    async def _request_samples(
+        self,
+        model: str,
+        prompt: str,
+        n: int,
+        temperature: float,
+        max_tokens: int,
+        enable_web_search: bool,
+        return_logprobs: bool
+    ) -> List[Dict[str, Any]]:
+        """Call the API for n completions, retrying transient failures"""
+        # Single completions without logprobs can be streamed and cut short
+        streamed = self.stream_early_stop and n == 1 and not return_logprobs
+
+        # Wall-clock timestamp for the record; durations use the monotonic clock
+        timestamp = datetime.now().isoformat()
+        start_perf = time.perf_counter()
+        # One deadline for all attempts, so retries never extend the call past self.timeout
+        deadline = start_perf + self.timeout
+
+        attempts = max(1, self.retry_attempts)
+        for attempt in range(attempts):
+            try:
+                # Prepare request parameters
+                request_params = {
+                    "model": model,
+                    "messages": [
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                    "timeout": deadline - time.perf_counter()
+                }
+                if n > 1:
+                    request_params["n"] = n
+                if return_logprobs:
+                    request_params["logprobs"] = True
+
+                # Add web search configuration if enabled
+                if enable_web_search:
+                    request_params["extra_body"] = {
+                        "web_search": {
+                            "engine": "native"
+                        }
+                    }
 
-            # Warn if response is suspiciously short
-            if response_length < 100 and not is_rejected:
-                logger.warning(f"Short response from {model}: only {response_length} characters")
+                if streamed:
+                    content, usage = await self._stream_content(request_params)
+                    outputs = [(content, None)]
+                else:
+                    response = await self.client.chat.completions.create(**request_params)
+                    usage = response.usage
+                    outputs = [
+                        (choice.message.content, getattr(choice, 'logprobs', None) if return_logprobs else None)
+                        for choice in response.choices
+                    ] or [("", None)]
+
+                # Calculate response time
+                response_time = time.perf_counter() - start_perf
+
+                results = [
+                    self._choice_result(model, content, logprobs, timestamp, response_time)
+                    for content, logprobs in outputs
+                ]
 
-            # Check for empty or insufficient responses
-            if not content or len(content) < 10:
-                logger.warning(f"Empty or insufficient response from {model}")
-                # Mark as error for retry handling
-                return {
+                # The request's usage is billed once: attribute it to the first sample
+                request_usage = {
+                    "prompt_tokens": usage.prompt_tokens,
+                    "completion_tokens": usage.completion_tokens,
+                    "total_tokens": usage.total_tokens
+                } if usage else dict(_EMPTY_USAGE)
+                for index, result in enumerate(results):
+                    if "usage" in result:
+                        result["usage"] = request_usage if index == 0 else dict(_EMPTY_USAGE)
+
+                return results
+
+            except (asyncio.TimeoutError, openai.APITimeoutError, httpx.TimeoutException):
+                logger.error(f"Timeout querying {model}")
+                failure = {
+                    "model": model,
+                    "timestamp": timestamp,
+                    "response_time": self.timeout,
+                    "content": None,
+                    "probability": None,
+                    "error": "Request timeout",
+                    "status": "timeout"
+                }
+                retriable, retry_after = True, None
+
+            except Exception as e:
+                error_str = str(e)
+                logger.error(f"Error querying {model}: {error_str}")
+
+                status = "error"
+                retriable, retry_after = False, None
+                if isinstance(e, openai.APIStatusError):
+                    # Only rate limits and transient server errors are worth another attempt
+                    retriable = e.status_code in _RETRIABLE_STATUS_CODES
+                    if e.status_code == 429:
+                        status = "rate_limited"
+                        retry_after = _retry_after_seconds(e.response)
+                        logger.warning(f"Model {model} is rate limited - consider switching to alternative model")
+                    elif e.status_code == 404:
+                        status = "not_found"
+                        logger.error(f"Model {model} endpoint not found - may need to update model list")
+                    elif e.status_code == 400:
+                        status = "invalid_model"
+                        logger.error(f"Model {model} ID is invalid - check model configuration")
+                elif isinstance(e, (openai.APIConnectionError, httpx.TransportError)):
+                    # Connection resets and refused connections are transient
+                    retriable = True
+                # Errors raised outside the SDK are classified by their message, as before
+                elif "429" in error_str or "rate" in error_str.lower() or "too many requests" in error_str.lower():
+                    status = "rate_limited"
+                    logger.warning(f"Model {model} is rate limited - consider switching to alternative model")
+                elif "404" in error_str or "not found" in error_str.lower():
+                    status = "not_found"
+                    logger.error(f"Model {model} endpoint not found - may need to update model list")
+                elif "400" in error_str or "invalid" in error_str.lower():
+                    status = "invalid_model"
+                    logger.error(f"Model {model} ID is invalid - check model configuration")
+
+                failure = {
                     "model": model,
-                    "timestamp": start_time.isoformat(),
-                    "response_time": response_time,
-                    "content": content,
+                    "timestamp": timestamp,
+                    "response_time": time.perf_counter() - start_perf,
+                    "content": None,
                     "probability": None,
-                    "error": "Empty or insufficient response",
-                    "status": "empty_response",
-                    "response_source": "api"
+                    "error": error_str,
+                    "status": status
                 }
 
-            if is_rejected:
-                logger.warning(f"Model {model} appears to have rejected the prompt due to safety filters")
-                logger.debug(f"Rejection response snippet: {content[:200]}")
+            if not retriable or attempt + 1 >= attempts:
+                return [failure] + [dict(failure) for _ in range(n - 1)]
 
-            # Parse the response for PROGNOSE value
-            probability = self._extract_probability(content, model)
+            # Honour the server's Retry-After on rate limits, else back off exponentially
+            delay = min(60, retry_after if retry_after is not None else 2 ** attempt * self.retry_delay)
+            if time.perf_counter() + delay >= deadline:
+                logger.warning(f"Not retrying {model}: the {self.timeout}s request deadline would pass")
+                return [failure] + [dict(failure) for _ in range(n - 1)]
+            logger.warning(f"Retrying {model} in {delay}s (attempt {attempt + 2}/{attempts})")
+            await asyncio.sleep(delay)
 
-            # Log extraction failure for debugging
-            if probability is None and not is_rejected:
-                logger.debug(f"Could not extract probability from {model} response")
-                logger.debug(f"Response snippet (last 200 chars): {content[-200:] if content else 'Empty response'}")
+    async def _stream_content(self, request_params: Dict[str, Any]) -> Tuple[str, Any]:
+        """
+        Stream one completion, stopping as soon as its HAUPTPROGNOSE answer arrives
 
-            # Final validation to ensure probability is within bounds
-            if probability is not None and (probability < 0 or probability > 100):
-                logger.warning(f"Extracted probability {probability} is out of bounds, setting to None")
-                probability = None
+        Closing the stream early aborts generation of the remaining tokens. The
+        API reports usage in the final chunk, so a stopped stream has none.
 
-            # Extract log probabilities if available
-            log_probs = None
-            if hasattr(response.choices[0], 'logprobs') and response.choices[0].logprobs:
-                try:
-                    # Convert to serializable format
-                    log_probs = str(response.choices[0].logprobs)
-                except:
-                    log_probs = None
+        Args:
+            request_params: chat.completions.create parameters
 
-            result = {
-                "model": model,
-                "timestamp": start_time.isoformat(),
-                "response_time": response_time,
-                "content": content,
-                "probability": probability,
-                "log_probabilities": log_probs,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
-                    "completion_tokens": response.usage.completion_tokens if response.usage else 0,
-                    "total_tokens": response.usage.total_tokens if response.usage else 0
-                },
-                "status": "rejected" if is_rejected else "success",
-                "response_source": "api"
-            }
+        Returns:
+            Tuple of the content received and the usage (None if stopped early)
+        """
+        stream = await self.client.chat.completions.create(
+            **request_params, stream=True, stream_options={"include_usage": True}
+        )
+        content, pending, pending_chars, usage = "", [], 0, None
+        try:
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                pending.append(delta)
+                pending_chars += len(delta)
+                if pending_chars < _STREAM_CHECK_CHARS:
+                    continue
+
+                # Only the new text (plus an overlap) is searched for the answer
+                start = max(0, len(content) - _STREAM_CHECK_OVERLAP)
+                content += "".join(pending)
+                pending.clear()
+                pending_chars = 0
+                if any(
+                    0 <= float(match.group(1) or match.group(2)) <= 100
+                    for match in _STREAM_STOP_RE.finditer(content, start)
+                ):
+                    logger.debug(f"Answer received after {len(content)} characters, stopping stream")
+                    break
+        finally:
+            await stream.close()
+
+        return content + "".join(pending), usage
+
+    async def _embed(self, prompt: str) -> Optional[np.ndarray]:
+        """
+        Embed a prompt for the semantic cache
 
-            # Cache the successful response
-            if self.cache and result["status"] == "success":
-                self.cache.set(model, prompt, result)
-                logger.debug(f"Cached response for {model}")
+        Args:
+            prompt: Prompt text
 
-            return result
+        Returns:
+            Normalized embedding, or None if the embedding request failed
+        """
+        try:
+            response = await self.client.embeddings.create(model=self.embedding_model, input=prompt)
+            return SemanticCache.normalize(response.data[0].embedding)
+        except Exception as e:
+            logger.warning(f"Prompt embedding failed, skipping semantic cache: {e}")
+            return None
 
-        except asyncio.TimeoutError:
-            logger.error(f"Timeout querying {model}")
-            return {
-                "model": model,
-                "timestamp": start_time.isoformat(),
-                "response_time": self.timeout,
-                "content": None,
-                "probability": None,
-                "error": "Request timeout",
-                "status": "timeout"
-            }
+    def _choice_result(
+        self,
+        model: str,
+        content: Optional[str],
+        logprobs: Any,
+        timestamp: str,
+        response_time: float
+    ) -> Dict[str, Any]:
+        """
+        Build the response dictionary for one completion choice
 
-        except Exception as e:
-            error_str = str(e)
-            logger.error(f"Error querying {model}: {error_str}")
-
-            # Detect rate limiting (429 errors) for smart retry logic
-            status = "error"
-            if "429" in error_str or "rate" in error_str.lower() or "too many requests" in error_str.lower():
-                status = "rate_limited"
-                logger.warning(f"Model {model} is rate limited - consider switching to alternative model")
-            elif "404" in error_str or "not found" in error_str.lower():
-                status = "not_found"
-                logger.error(f"Model {model} endpoint not found - may need to update model list")
-            elif "400" in error_str or "invalid" in error_str.lower():
-                status = "invalid_model"
-                logger.error(f"Model {model} ID is invalid - check model configuration")
+        Args:
+            model: Model identifier
+            content: Text of the completion
+            logprobs: The choice's token log probabilities, if requested
+            timestamp: ISO timestamp of when the request was sent
+            response_time: Request duration in seconds
+
+        Returns:
+            Response dictionary; usage is filled in by the caller
+        """
+
+        # Log response statistics
+        response_length = len(content) if content else 0
+        logger.debug(f"Response from {model}: {response_length} characters")
+
+        # Check if the model rejected the prompt (safety filter); the lowercased
+        # copy is shared with probability extraction below
+        content_lower = content.lower() if content else ""
+        is_rejected = any(pattern in content_lower for pattern in _REJECTION_PHRASES)
 
+        # Warn if response is suspiciously short
+        if response_length < 100 and not is_rejected:
+            logger.warning(f"Short response from {model}: only {response_length} characters")
+
+        # Check for empty or insufficient responses
+        if not content or len(content) < 10:
+            logger.warning(f"Empty or insufficient response from {model}")
+            # Mark as error for retry handling
             return {
                 "model": model,
-                "timestamp": start_time.isoformat(),
-                "response_time": (datetime.now() - start_time).total_seconds(),
-                "content": None,
+                "timestamp": timestamp,
+                "response_time": response_time,
+                "content": content,
                 "probability": None,
-                "error": error_str,
-                "status": status
+                "error": "Empty or insufficient response",
+                "status": "empty_response",
+                "response_source": "api"
             }
 
+        if is_rejected:
+            logger.warning(f"Model {model} appears to have rejected the prompt due to safety filters")
+            logger.debug(f"Rejection response snippet: {content[:200]}")
+
+        # Parse the response for PROGNOSE value
+        probability = self._extract_probability(content, model, content_lower)
+
+        # Log extraction failure for debugging
+        if probability is None and not is_rejected:
+            logger.debug(f"Could not extract probability from {model} response")
+            logger.debug(f"Response snippet (last 200 chars): {content[-200:] if content else 'Empty response'}")
+
+        # Final validation to ensure probability is within bounds
+        if probability is not None and (probability < 0 or probability > 100):
+            logger.warning(f"Extracted probability {probability} is out of bounds, setting to None")
+            probability = None
+
+        # Log probabilities are returned as a plain dict
+        log_probs = logprobs.model_dump() if logprobs else None
+
+        return {
+            "model": model,
+            "timestamp": timestamp,
+            "response_time": response_time,
+            "content": content,
+            "probability": probability,
+            "log_probabilities": log_probs,
+            "usage": None,
+            "status": "rejected" if is_rejected else "success",
+            "response_source": "api"
+        }
+
     async def batch_query(
         self,
         model: str,
         prompt: str,
         iterations: int = 10,
         concurrent_limit: int = 3,
-        enable_web_search: bool = True
+        enable_web_search: bool = True,
+        n_per_request: int = 5
     ) -> List[Dict[str, Any]]:
         """
         Query a model multiple times with concurrency control
 
+        Iterations are drawn n_per_request at a time through the n= parameter,
+        so the prompt is sent once per bucket; models that ignore n fall back to
+        one completion per request.
+
         Args:
             model: Model identifier
             prompt: The prompt to send
             iterations: Number of times to query
             concurrent_limit: Maximum concurrent requests
             enable_web_search: Enable web search for current information (default: True)
+            n_per_request: Maximum completions requested per API call
 
         Returns:
             List of response dictionaries
         """
         semaphore = asyncio.Semaphore(concurrent_limit)
+        n_per_request = max(1, n_per_request)
+        if model in self._single_sample_models:
+            n_per_request = 1
 
-        async def limited_query(iteration: int):
+        async def limited_query(n: int) -> List[Dict[str, Any]]:
             async with semaphore:
-                logger.info(f"Querying {model} - Iteration {iteration + 1}/{iterations}")
-                result = await self.query_model(model, prompt, enable_web_search=enable_web_search)
-                result["iteration"] = iteration + 1
-                return result
-
-        tasks = [limited_query(i) for i in range(iterations)]
-        results = await asyncio.gather(*tasks)
+                logger.info(f"Querying {model} - {n} completion(s)")
+                return await self.query_samples(model, prompt, n, enable_web_search=enable_web_search)
+
+        buckets = [
+            min(n_per_request, iterations - start)
+            for start in range(0, iterations, n_per_request)
+        ]
+        batches = await asyncio.gather(*(limited_query(n) for n in buckets))
+
+        results = [result for batch in batches for result in batch]
+        missing = iterations - len(results)
+        if missing > 0:
+            # The model returned fewer choices than requested: it does not support n
+            logger.info(f"{model} ignores n > 1; querying remaining {missing} iteration(s) singly")
+            self._single_sample_models.add(model)
+            singles = await asyncio.gather(*(limited_query(1) for _ in range(missing)))
+            results.extend(batch[0] for batch in singles)
+
+        for iteration, result in enumerate(results):
+            result["iteration"] = iteration + 1
 
         return results
 
-    def _extract_probability(self, content: str, model: str = "") -> Optional[float]:
+    def _extract_probability(
+        self,
+        content: str,
+        model: str = "",
+        content_lower: Optional[str] = None
+    ) -> Optional[float]:
         """
         Enhanced probability extraction supporting multiple languages and formats
 
         Args:
             content: Response text containing forecast/prognose section
+            model: Model identifier, enabling model-specific patterns
+            content_lower: content.lower(), if the caller already has it
 
         Returns:
             Probability as float (0-100) or None if not found
@@ -327,132 +872,77 @@ class OpenRouterClient:
         if not content:
             return None
 
-        import re
+        model_lower = model.lower()
+        # Lowercased once for the tier gates and keyword checks below
+        if content_lower is None:
+            content_lower = content.lower()
 
         try:
             # PRIORITY 1: Look for enhanced structured format (HAUPTPROGNOSE:)
             # This is the new format from the ensemble-aware prompt
-            hauptprognose_patterns = [
-                r'HAUPTPROGNOSE:\s*(\d+(?:\.\d+)?)\s*%',  # Standard format
-                r'\*\*HAUPTPROGNOSE:\s*(\d+(?:\.\d+)?)\s*%\*\*',  # Bold markdown
-                r'HAUPTPROGNOSE:\s*\*\*(\d+(?:\.\d+)?)\s*%\*\*',  # Bold percentage only
-                r'HAUPTPROGNOSE:\s*(\d+(?:\.\d+)?)',  # Without % sign
-            ]
-
-            for pattern in hauptprognose_patterns:
-                hauptprognose_match = re.search(pattern, content, re.IGNORECASE)
-                if hauptprognose_match:
-                    value = float(hauptprognose_match.group(1))
-                    if 0 <= value <= 100:
-                        logger.debug(f"Found probability in HAUPTPROGNOSE section: {value}%")
-                        return value
+            for hauptprognose_match in _HAUPTPROGNOSE_TIER.searches(content, content_lower):
+                value = float(hauptprognose_match.group(1))
+                if 0 <= value <= 100:
+                    logger.debug(f"Found probability in HAUPTPROGNOSE section: {value}%")
+                    return value
 
             # PRIORITY 2: Look specifically for PROGNOSE: section (legacy format)
             # This should be the final answer according to our original prompt format
             # Handle various formatting (bold, markdown, etc.)
-            prognose_patterns = [
-                r'PROGNOSE:\s*(\d+(?:\.\d+)?)\s*%',  # Standard format
-                r'\*\*PROGNOSE:\s*(\d+(?:\.\d+)?)\s*%\*\*',  # Bold markdown
-                r'PROGNOSE:\s*\*\*(\d+(?:\.\d+)?)\s*%\*\*',  # Bold percentage only
-                r'PROGNOSE:\s*(\d+(?:\.\d+)?)',  # Without % sign
-            ]
-
-            for pattern in prognose_patterns:
-                prognose_match = re.search(pattern, content, re.IGNORECASE)
-                if prognose_match:
-                    value = float(prognose_match.group(1))
-                    if 0 <= value <= 100:
-                        logger.debug(f"Found probability in PROGNOSE section: {value}%")
-                        return value
+            for prognose_match in _PROGNOSE_TIER.searches(content, content_lower):
+                value = float(prognose_match.group(1))
+                if 0 <= value <= 100:
+                    logger.debug(f"Found probability in PROGNOSE section: {value}%")
+                    return value
 
             # PRIORITY 2: Look for Final_Probability calculation (from the formula)
-            final_prob_patterns = [
-                r'Final_Probability\s*=\s*(\d+(?:\.\d+)?)',
-                r'Final_Probability\s*=.*?(\d+(?:\.\d+)?)\s*%',
-                r'=\s*(\d+(?:\.\d+)?)\s*(?:%)?$'  # End of calculation
-            ]
-
-            for pattern in final_prob_patterns:
-                matches = re.findall(pattern, content, re.MULTILINE | re.IGNORECASE)
-                if matches:
-                    value = float(matches[-1])  # Take the last match (final result)
-                    if 0 <= value <= 100:
-                        logger.debug(f"Found probability in calculation: {value}%")
-                        return value
-
-            # Make content case-insensitive for pattern matching
-            content_lower = content.lower()
+            for matches in _FINAL_PROB_TIER.findalls(content, content_lower):
+                value = float(matches[-1])  # Take the last match (final result)
+                if 0 <= value <= 100:
+                    logger.debug(f"Found probability in calculation: {value}%")
+                    return value
 
             # PRIORITY 3: Look for model-specific patterns
             # DeepSeek R1 patterns
-            if 'deepseek' in model.lower():
-                deepseek_patterns = [
-                    r'Therefore,?\s+the\s+probability\s+is\s+(\d+(?:\.\d+)?)\s*%',
-                    r'I\s+estimate\s+(?:the\s+probability\s+)?(?:to\s+be\s+)?(\d+(?:\.\d+)?)\s*%',
-                    r'My\s+assessment:\s*(\d+(?:\.\d+)?)\s*%',
-                    r'Estimated\s+probability:\s*(\d+(?:\.\d+)?)\s*%'
-                ]
-                for pattern in deepseek_patterns:
-                    match = re.search(pattern, content, re.IGNORECASE)
-                    if match:
-                        value = float(match.group(1))
-                        if 0 <= value <= 100:
-                            logger.debug(f"Found DeepSeek-specific probability: {value}%")
-                            return value
+            if 'deepseek' in model_lower:
+                for match in _DEEPSEEK_TIER.searches(content, content_lower):
+                    value = float(match.group(1))
+                    if 0 <= value <= 100:
+                        logger.debug(f"Found DeepSeek-specific probability: {value}%")
+                        return value
 
             # Qwen patterns
-            if 'qwen' in model.lower():
-                qwen_patterns = [
-                    r'My\s+final\s+estimate:\s*(\d+(?:\.\d+)?)\s*%',
-                    r'I\s+conclude\s+(?:with\s+)?(?:a\s+)?(\d+(?:\.\d+)?)\s*%',
-                    r'Overall\s+probability:\s*(\d+(?:\.\d+)?)\s*%',
-                    r'Assessment:\s*(\d+(?:\.\d+)?)\s*%'
-                ]
-                for pattern in qwen_patterns:
-                    match = re.search(pattern, content, re.IGNORECASE)
-                    if match:
-                        value = float(match.group(1))
-                        if 0 <= value <= 100:
-                            logger.debug(f"Found Qwen-specific probability: {value}%")
-                            return value
-
-            # Look for JSON-like formats
-            json_patterns = [
-                r'\{"probability":\s*(\d+(?:\.\d+)?)\}',
-                r'"probability":\s*"?(\d+(?:\.\d+)?)"?%?',
-                r'probability:\s*(\d+(?:\.\d+)?)\s*%?'
-            ]
-            for pattern in json_patterns:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
+            if 'qwen' in model_lower:
+                for match in _QWEN_TIER.searches(content, content_lower):
                     value = float(match.group(1))
                     if 0 <= value <= 100:
-                        logger.debug(f"Found JSON-format probability: {value}%")
+                        logger.debug(f"Found Qwen-specific probability: {value}%")
                         return value
 
-            # PRIORITY 4: Look for forecast section keywords
-            forecast_patterns = [
-                "prognose:",
-                "forecast:",
-                "prediction:",
-                "probability:",
-                "wahrscheinlichkeit:",
-                "final probability:",
-                "ensemble probability:",
-                "result:",
-                "answer:",
-                "conclusion:",
-                "estimate:",
-                "assessment:"
-            ]
+            # Look for JSON-like formats: parse a clean JSON object directly,
+            # falling back to the regexes for anything orjson rejects
+            value = _json_probability(content)
+            if value is not None:
+                logger.debug(f"Found JSON probability: {value}%")
+                return value
+            for match in _JSON_TIER.searches(content, content_lower):
+                value = float(match.group(1))
+                if 0 <= value <= 100:
+                    logger.debug(f"Found JSON-format probability: {value}%")
+                    return value
 
-            # Look for forecast section keywords
-            for pattern in forecast_patterns:
+            # PRIORITY 4: Look for forecast section keywords
+            # Lines are split once for all keywords; lowercasing never adds or
+            # removes newlines, so lowercased lines line up with the originals
+            lines = lines_lower = None
+            for pattern in _FORECAST_KEYWORDS:
                 if pattern in content_lower:
-                    lines = content.split('\n')
-                    for i, line in enumerate(lines):
-                        line_lower = line.lower()
+                    if lines is None:
+                        lines = content.split('\n')
+                        lines_lower = content_lower.split('\n')
+                    for i, line_lower in enumerate(lines_lower):
                         if pattern in line_lower:
+                            line = lines[i]
                             # Check the same line first
                             if "%" in line:
                                 prob_text = line.split(":")[-1].strip() if ":" in line else line.strip()
@@ -465,7 +955,7 @@ class OpenRouterClient:
                                 continue
 
                             # Extract percentage value with improved regex
-                            percentage_match = re.search(r'(\d+(?:\.\d+)?)\s*%', prob_text)
+                            percentage_match = _PERCENT_RE.search(prob_text)
                             if percentage_match:
                                 value = float(percentage_match.group(1))
                                 if 0 <= value <= 100:
@@ -476,14 +966,14 @@ class OpenRouterClient:
                             # Handle ranges (e.g., "40-60" -> take midpoint)
                             if "-" in prob_text:
                                 try:
-                                    numbers = re.findall(r'\d+(?:\.\d+)?', prob_text)
+                                    numbers = _NUMBER_RE.findall(prob_text)
                                     if len(numbers) >= 2:
                                         return (float(numbers[0]) + float(numbers[1])) / 2
                                 except:
                                     pass
 
                             # Single value extraction
-                            number_match = re.search(r'(\d+(?:\.\d+)?)', prob_text)
+                            number_match = _FIRST_NUMBER_RE.search(prob_text)
                             if number_match:
                                 value = float(number_match.group(1))
                                 # Only convert 0-1 to percentage if it looks like a decimal probability
@@ -497,62 +987,30 @@ class OpenRouterClient:
 
             # Enhanced fallback: look for any percentage patterns in the content
             # Try multiple percentage patterns including GPT-5 specific formats
-            percentage_patterns = [
-                r'(\d+(?:\.\d+)?)\s*%',  # "45.2%"
-                r'(\d+(?:\.\d+)?)\s*percent',  # "45.2 percent"
-                r'probability\s*(?:of|is|:)?\s*(\d+(?:\.\d+)?)\s*%',  # "probability: 45%"
-                r'(\d+(?:\.\d+)?)\s*%\s*probability',  # "45% probability"
-                r'final.*?(\d+(?:\.\d+)?)\s*%',  # "final answer: 45%"
-                r'answer.*?(\d+(?:\.\d+)?)\s*%',  # "answer is 45%"
-                r'final_probability.*?(\d+(?:\.\d+)?)\s*%',  # "Final_Probability = 45%"
-                r'Final_Probability.*?(\d+(?:\.\d+)?)',  # GPT-5 format with formula result
-                r'=\s*(\d+(?:\.\d+)?)\s*%',  # "= 45%" calculation result
-                r'therefore.*?(\d+(?:\.\d+)?)\s*%',  # "Therefore, 45%"
-                r'conclusion.*?(\d+(?:\.\d+)?)\s*%',  # "In conclusion, 45%"
-                r'estimate.*?(\d+(?:\.\d+)?)\s*%',  # "I estimate 45%"
-                r'assess.*?(\d+(?:\.\d+)?)\s*%',  # "I assess 45%"
-                r'likely.*?(\d+(?:\.\d+)?)\s*%',  # "likely 45%"
-                r'around\s*(\d+(?:\.\d+)?)\s*%',  # "around 45%"
-                r'approximately\s*(\d+(?:\.\d+)?)\s*%',  # "approximately 45%"
-                r'roughly\s*(\d+(?:\.\d+)?)\s*%',  # "roughly 45%"
-                r'my\s+(?:final\s+)?(?:forecast|prediction|estimate)\s+is\s+(\d+(?:\.\d+)?)\s*%',  # "my forecast is X%"
-                r'i\s+(?:would\s+)?(?:forecast|predict|estimate)\s+(\d+(?:\.\d+)?)\s*%',  # "I forecast X%"
-            ]
-
-            for pattern in percentage_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                if matches:
-                    # Return the last match (likely the final answer)
-                    return float(matches[-1])
+            for matches in _PERCENT_TIER.findalls(content, content_lower):
+                # Return the last match (likely the final answer)
+                return float(matches[-1])
 
             # Special handling for Super-Forecaster formula calculations
             # Look for the specific formula result pattern from the prompt
-            formula_patterns = [
-                r'Final_Probability\s*=.*?(\d+(?:\.\d+)?)',  # Formula calculation
-                r'\(\s*\d+(?:\.\d+)?\s*×.*?\)\s*/\s*100\s*=\s*(\d+(?:\.\d+)?)',  # Division result
-                r'=\s*(\d+(?:\.\d+)?)\s*(?:%)?$',  # End of line calculation result
-                r'Antwort:\s*(\d+(?:\.\d+)?)\s*%',  # German "Answer:"
-                r'Ergebnis:\s*(\d+(?:\.\d+)?)\s*%',  # German "Result:"
-            ]
-
-            for pattern in formula_patterns:
-                matches = re.findall(pattern, content, re.MULTILINE | re.IGNORECASE)
-                if matches:
-                    try:
-                        value = float(matches[-1])
-                        if 0 <= value <= 100:
-                            return value
-                    except:
-                        continue
+            for matches in _FORMULA_TIER.findalls(content, content_lower):
+                try:
+                    value = float(matches[-1])
+                    if 0 <= value <= 100:
+                        return value
+                except:
+                    continue
 
             # Last resort: look for standalone numbers that might be probabilities
             # Look for numbers in reasonable probability range near end of text
-            end_content = content[-500:]  # Last 500 characters
-            number_matches = re.findall(r'\b(\d+(?:\.\d+)?)\b', end_content)
-            for match in reversed(number_matches):  # Check from end backwards
-                value = float(match)
-                if 0 <= value <= 100:  # Reasonable probability range
-                    return value
+            # (scanned in place from the tail offset, without copying it)
+            last_value = None
+            for match in _TAIL_NUMBER_RE.finditer(content, max(0, len(content) - _TAIL_SPAN)):
+                value = float(match.group(1))
+                if value <= 100:  # Reasonable probability range
+                    last_value = value
+            if last_value is not None:
+                return last_value
 
         except Exception as e:
             logger.warning(f"Could not extract probability: {e}")
@@ -572,8 +1030,6 @@ class OpenRouterClient:
         if not content:
             return {}
 
-        import re
-
         extracted_data = {}
 
         try:
@@ -674,14 +1130,14 @@ class OpenRouterClient:
             List of model identifiers
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/models",
-                    headers={"Authorization": f"Bearer {self.api_key}"}
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [model["id"] for model in data.get("data", [])]
+            session = self._get_session()
+            async with session.get(
+                f"{self.base_url}/models",
+                headers={"Authorization": f"Bearer {self.api_key}"}
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return [model["id"] for model in data.get("data", [])]
         except Exception as e:
             logger.error(f"Failed to fetch models: {e}")
 
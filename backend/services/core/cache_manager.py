@@ -1,4 +1,5 @@
 """Cache manager for storing and retrieving API responses to save credits"""
+import asyncio
 import json
 import sqlite3
 import hashlib
@@ -159,6 +160,14 @@ class CacheManager:
 
         logger.debug(f"Cached response for model {model}, expires at {expires_at}")
 
+    async def aget(self, model: str, prompt: str) -> Optional[Dict[str, Any]]:
+        """Async get(): runs the SQLite lookup in a worker thread off the event loop"""
+        return await asyncio.to_thread(self.get, model, prompt)
+
+    async def aset(self, model: str, prompt: str, response: Dict[str, Any]) -> None:
+        """Async set(): runs the SQLite write in a worker thread off the event loop"""
+        await asyncio.to_thread(self.set, model, prompt, response)
+
     def get_similar(self, prompt: str, similarity_threshold: float = 0.95) -> Optional[Dict[str, Any]]:
         """
         Find similar cached prompts (useful for slight variations)
@@ -43,6 +43,11 @@ class ModelResponse(BaseModel):
     definition: Optional[str] = None
     timeframe: Optional[str] = None
 
+    @property
+    def is_valid(self) -> bool:
+        """Successful response with an extracted probability"""
+        return self.status is ResponseStatus.SUCCESS and self.probability is not None
+
     @validator('probability')
     def validate_probability(cls, v):
         if v is not None and (v < 0 or v > 100):
@@ -125,7 +130,7 @@ class ForecastResult(BaseModel):
 
     def get_successful_responses(self) -> List[ModelResponse]:
         """Get only successful responses"""
-        return [r for r in self.responses if r.status == ResponseStatus.SUCCESS and r.probability is not None]
+        return [r for r in self.responses if r.is_valid]
 
     def get_probabilities(self, model: Optional[str] = None) -> List[float]:
         """Get probability values, optionally filtered by model"""
@@ -0,0 +1,106 @@
+"""Semantic cache serving responses for near-duplicate prompts"""
+import logging
+import time
+from typing import Dict, Any, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _ModelIndex:
+    """Flat inner-product index over the normalized prompt embeddings of one model"""
+
+    def __init__(self, dim: int):
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.expires = np.empty(0)
+        self.responses: List[Dict[str, Any]] = []
+
+
+class SemanticCache:
+    """
+    In-memory cache keyed by prompt embedding, scoped per model
+
+    Lookups compare the query embedding against every stored prompt of the
+    same model (cosine similarity via the dot product of L2-normalized vectors)
+    and only count as a hit at or above the similarity threshold, which is kept
+    high so that differently worded questions never share an answer.
+    """
+
+    def __init__(self, threshold: float = 0.95, ttl_hours: int = 24, max_entries_per_model: int = 1000):
+        """
+        Initialize semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            ttl_hours: Time-to-live for cache entries in hours
+            max_entries_per_model: Oldest entries beyond this are dropped
+        """
+        self.threshold = threshold
+        self.ttl = ttl_hours * 3600
+        self.max_entries = max_entries_per_model
+        self._indexes: Dict[str, _ModelIndex] = {}
+
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        """Return the embedding as an L2-normalized float32 vector"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _prune(self, index: _ModelIndex, now: float):
+        """Drop expired entries and the oldest ones beyond the size limit"""
+        keep = np.flatnonzero(index.expires > now)[-self.max_entries:]
+        if keep.size == len(index.responses):
+            return
+        index.vectors = index.vectors[keep]
+        index.expires = index.expires[keep]
+        index.responses = [index.responses[i] for i in keep]
+
+    def get(self, model: str, embedding: np.ndarray) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the response stored for the most similar prompt of this model
+
+        Args:
+            model: Model identifier
+            embedding: Normalized prompt embedding
+
+        Returns:
+            Copy of the cached response, or None below the threshold
+        """
+        index = self._indexes.get(model)
+        if index is None or index.vectors.shape[1] != embedding.shape[0]:
+            return None
+
+        self._prune(index, time.monotonic())
+        if not index.responses:
+            return None
+
+        similarities = index.vectors @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            logger.debug(f"Semantic cache MISS for model {model} (best similarity {similarities[best]:.3f})")
+            return None
+
+        logger.debug(f"Semantic cache HIT for model {model} (similarity {similarities[best]:.3f})")
+        response = dict(index.responses[best])
+        response['similarity'] = float(similarities[best])
+        return response
+
+    def set(self, model: str, embedding: np.ndarray, response: Dict[str, Any]) -> None:
+        """
+        Store a response under its prompt embedding
+
+        Args:
+            model: Model identifier
+            embedding: Normalized prompt embedding
+            response: Response data to cache
+        """
+        index = self._indexes.get(model)
+        if index is None or index.vectors.shape[1] != embedding.shape[0]:
+            index = self._indexes[model] = _ModelIndex(embedding.shape[0])
+
+        now = time.monotonic()
+        index.vectors = np.vstack((index.vectors, embedding[None, :]))
+        index.expires = np.append(index.expires, now + self.ttl)
+        index.responses.append(dict(response))
+        self._prune(index, now)
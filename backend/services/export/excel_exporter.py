@@ -1,7 +1,10 @@
 """Enhanced Excel export functionality with professional visualizations"""
 import logging
+import re
+from collections import defaultdict
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, NamedTuple
 from datetime import datetime
 import pandas as pd
 import numpy as np
@@ -22,6 +25,7 @@ from openpyxl.drawing.fill import SolidColorFillProperties, ColorChoice
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.formatting.rule import ColorScaleRule, DataBarRule, IconSetRule
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
 from openpyxl.drawing.image import Image
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -33,6 +37,63 @@ from utils.visual import visual
 
 logger = logging.getLogger(__name__)
 
+# Sentence scanner for key-factor extraction (length-capped to bound regex work)
+_SENTENCE_RE = re.compile(r'([^.!?]{1,300})[.!?]?')
+
+# Bounds for key-factor extraction per response
+KEY_FACTOR_SCAN_CHARS = 4000
+KEY_FACTOR_MAX_SENTENCES = 40
+
+# Write buffer used when flushing the in-memory workbook to disk
+SAVE_BUFFER_SIZE = 1 << 20
+
+# Shared cell formatting for heatmap-style grids
+CENTER = Alignment(horizontal="center", vertical="center")
+CELL_BORDER = Border(
+    left=Side(style='thin'), right=Side(style='thin'),
+    top=Side(style='thin'), bottom=Side(style='thin')
+)
+
+# Response length scoring: >500 -> 1, >1500 -> 2, >3000 -> 3
+_LEN_THRESHOLDS = np.array([500, 1500, 3000])
+_LEN_SCORES = np.array([0, 1, 2, 3])
+
+# Column widths per sheet
+WIDTHS_METADATA = {'A': 20, 'B': 80}
+WIDTHS_ALGORITHMS = {c: 20 for c in 'ABCDEFGH'}
+WIDTHS_HEATMAP = {'A': 20, **{c: 12 for c in 'BCDEFGHIJK'}}
+WIDTHS_BRIEF = {'A': 5, 'B': 20, 'C': 15, 'D': 15, 'E': 15, 'F': 15}
+
+# Heatmap gradients indexed by intensity (0-255), built once at import
+GREEN_FILLS = tuple(
+    PatternFill(start_color=f"{i:02X}FF{i:02X}", end_color=f"{i:02X}FF{i:02X}", fill_type="solid")
+    for i in range(256)
+)
+RED_FILLS = tuple(
+    PatternFill(start_color=f"FF{i:02X}{i:02X}", end_color=f"FF{i:02X}{i:02X}", fill_type="solid")
+    for i in range(256)
+)
+
+
+def _bin10(probs) -> np.ndarray:
+    """Count probabilities (0-100) into ten 10%-wide bins, 100 falling in the last"""
+    idx = np.clip(np.asarray(probs, dtype=np.float64) // 10, 0, 9).astype(np.intp)
+    return np.bincount(idx, minlength=10)
+
+
+class _ResponseColumns(NamedTuple):
+    """Column-wise view of the response fields used for quality scoring"""
+    lens: np.ndarray      # content length (0 when missing)
+    has_prob: np.ndarray  # probability was extracted
+
+    @classmethod
+    def from_responses(cls, responses) -> '_ResponseColumns':
+        n = len(responses)
+        return cls(
+            lens=np.fromiter((len(r.content or '') for r in responses), dtype=np.int64, count=n),
+            has_prob=np.fromiter((r.probability is not None for r in responses), dtype=bool, count=n),
+        )
+
 
 class ExcelExporter:
     """Enhanced Excel exporter with professional visualizations and styling"""
@@ -72,6 +133,33 @@ class ExcelExporter:
         self.highlight_style.fill = PatternFill(start_color="E74C3C", end_color="E74C3C", fill_type="solid")
         self.highlight_style.alignment = Alignment(horizontal="center", vertical="center")
 
+        # Section header style
+        self.section_style = NamedStyle(name="section_style")
+        self.section_style.font = Font(size=14, bold=True)
+
+        # Quality rating fills
+        self.quality_high_style = NamedStyle(name="quality_high_style")
+        self.quality_high_style.fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
+
+        self.quality_medium_style = NamedStyle(name="quality_medium_style")
+        self.quality_medium_style.fill = PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
+
+        self.quality_low_style = NamedStyle(name="quality_low_style")
+        self.quality_low_style.fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")
+
+        # Gold highlight for the consensus bin in the heatmap
+        self.consensus_style = NamedStyle(name="consensus_style")
+        self.consensus_style.font = Font(bold=True)
+        self.consensus_style.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")
+        self.consensus_style.alignment = CENTER
+        self.consensus_style.border = CELL_BORDER
+
+        self.named_styles = (
+            self.header_style, self.title_style, self.data_style, self.highlight_style,
+            self.section_style, self.quality_high_style, self.quality_medium_style,
+            self.quality_low_style, self.consensus_style
+        )
+
     def export_forecast(
         self,
         forecast_result: ForecastResult,
@@ -100,17 +188,42 @@ class ExcelExporter:
 
         output_path = output_dir / filename
 
+        # Build in memory, then flush to disk in a single large write
+        buffer = self.export_forecast_to_buffer(forecast_result, output_dir)
+        with open(output_path, 'wb', buffering=SAVE_BUFFER_SIZE) as f:
+            f.write(buffer.getbuffer())
+        logger.info(f"Enhanced Excel export saved to: {output_path}")
+
+        return output_path
+
+    def export_forecast_to_buffer(
+        self,
+        forecast_result: ForecastResult,
+        output_dir: Optional[Path] = None
+    ) -> BytesIO:
+        """
+        Build the Excel workbook in memory (e.g. for streaming over HTTP)
+
+        Args:
+            forecast_result: The forecast results to export
+            output_dir: Directory for generated chart images (uses config default if None)
+
+        Returns:
+            BytesIO positioned at the start of the .xlsx content
+        """
+        if output_dir is None:
+            output_dir = self.settings.output.output_dir
+
         # Create export data
         export_data = ExportData(forecast_result=forecast_result)
+        columns = _ResponseColumns.from_responses(forecast_result.responses)
 
         # Create workbook with enhanced styling
         workbook = Workbook()
 
         # Add custom styles to workbook
-        workbook.add_named_style(self.header_style)
-        workbook.add_named_style(self.title_style)
-        workbook.add_named_style(self.data_style)
-        workbook.add_named_style(self.highlight_style)
+        for style in self.named_styles:
+            workbook.add_named_style(style)
 
         # Remove default sheet
         if 'Sheet' in workbook.sheetnames:
@@ -133,13 +246,14 @@ class ExcelExporter:
 
         # Add new enhanced features
         self._create_probability_heatmap_sheet(workbook, export_data)
-        self._create_executive_brief_sheet(workbook, export_data)
+        self._create_executive_brief_sheet(workbook, export_data, columns)
 
         # Save workbook
-        workbook.save(output_path)
-        logger.info(f"Enhanced Excel export saved to: {output_path}")
+        buffer = BytesIO()
+        workbook.save(buffer)
+        buffer.seek(0)
 
-        return output_path
+        return buffer
 
     def _generate_visualizations(self, export_data: ExportData, chart_dir: Path):
         """Generate matplotlib visualizations for embedding"""
@@ -617,7 +731,7 @@ class ExcelExporter:
         # Overall statistics
         stats = export_data.forecast_result.statistics
         ws['A3'] = "Overall Statistics"
-        ws['A3'].font = Font(size=14, bold=True)
+        ws['A3'].style = self.section_style
 
         overall_stats = [
             ("Mean", f"{stats.mean:.2f}%" if stats.mean else "N/A"),
@@ -635,7 +749,7 @@ class ExcelExporter:
 
         # Model comparison table
         ws['A12'] = "Model Comparison"
-        ws['A12'].font = Font(size=14, bold=True)
+        ws['A12'].style = self.section_style
 
         # Convert model stats to DataFrame
         model_data = []
@@ -672,7 +786,7 @@ class ExcelExporter:
 
         # Key themes section
         ws['A3'] = "Common Reasoning Themes"
-        ws['A3'].font = Font(size=14, bold=True)
+        ws['A3'].style = self.section_style
 
         # Analyze reasoning content
         reasoning_texts = []
@@ -688,7 +802,7 @@ class ExcelExporter:
 
         # Model-specific patterns
         ws['A15'] = "Model-Specific Patterns"
-        ws['A15'].font = Font(size=14, bold=True)
+        ws['A15'].style = self.section_style
 
         # Group responses by model
         model_responses = {}
@@ -723,7 +837,7 @@ class ExcelExporter:
         # Forecast metadata
         metadata = export_data.forecast_result.metadata
         ws['A3'] = "Forecast Information"
-        ws['A3'].font = Font(size=14, bold=True)
+        ws['A3'].style = self.section_style
 
         metadata_items = [
             ("Question", metadata.question),
@@ -745,14 +859,14 @@ class ExcelExporter:
 
         # Prompt used
         ws['A15'] = "Prompt Template Used"
-        ws['A15'].font = Font(size=14, bold=True)
+        ws['A15'].style = self.section_style
         ws['A16'] = export_data.forecast_result.prompt
         ws['A16'].alignment = Alignment(wrap_text=True, vertical='top')
         ws.row_dimensions[16].height = 200
 
         # Export information
         ws['A20'] = "Export Information"
-        ws['A20'].font = Font(size=14, bold=True)
+        ws['A20'].style = self.section_style
         ws['A21'] = "Export Timestamp"
         ws['A21'].font = Font(bold=True)
         ws['B21'] = export_data.export_timestamp
@@ -761,8 +875,7 @@ class ExcelExporter:
         ws['B22'] = "Foresight Analyzer v1.0"
 
         # Auto-adjust column widths
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 80
+        self._set_column_widths(ws, WIDTHS_METADATA)
 
     def _extract_themes(self, texts: List[str]) -> List[str]:
         """
@@ -815,13 +928,12 @@ class ExcelExporter:
         stats = export_data.forecast_result.statistics
         advanced_analysis = None
 
-        # Try different possible attribute names for advanced analysis
-        if hasattr(stats, 'advanced_analysis') and stats.advanced_analysis:
-            advanced_analysis = stats.advanced_analysis
-        elif hasattr(stats, '__dict__'):
+        # Prefer the canonical attribute; scan the raw statistics only without it
+        advanced_analysis = getattr(stats, 'advanced_analysis', None)
+        if not advanced_analysis and hasattr(stats, '__dict__'):
             # Look for advanced analysis in the raw statistics
-            for key, value in stats.__dict__.items():
-                if 'advanced' in str(key).lower() and isinstance(value, dict):
+            for key, value in vars(stats).items():
+                if isinstance(value, dict) and 'advanced' in key.lower():
                     advanced_analysis = value
                     break
 
@@ -900,11 +1012,11 @@ class ExcelExporter:
 
                 # Color coding for quality
                 if quality == "High":
-                    ws[f'C{row}'].fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
+                    ws[f'C{row}'].style = self.quality_high_style
                 elif quality == "Medium":
-                    ws[f'C{row}'].fill = PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
+                    ws[f'C{row}'].style = self.quality_medium_style
                 else:
-                    ws[f'C{row}'].fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")
+                    ws[f'C{row}'].style = self.quality_low_style
 
         # Quality Assessment
         quality_assessment = advanced.get('quality_assessment', {})
@@ -929,9 +1041,9 @@ class ExcelExporter:
 
                 ws[f'A{row}'].font = Font(bold=True)
                 if "✅" in value:
-                    ws[f'B{row}'].fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
+                    ws[f'B{row}'].style = self.quality_high_style
                 elif "⚠️" in value:
-                    ws[f'B{row}'].fill = PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
+                    ws[f'B{row}'].style = self.quality_medium_style
 
         # Calibrated Predictions Detail
         calibrated_predictions = advanced.get('calibrated_predictions', {})
@@ -962,33 +1074,31 @@ class ExcelExporter:
                 ws[f'C{row}'] = cal_mean
 
         # Auto-adjust column widths
-        for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
-            ws.column_dimensions[col].width = 20
+        self._set_column_widths(ws, WIDTHS_ALGORITHMS)
 
     def _create_probability_heatmap_sheet(self, workbook: Workbook, export_data: ExportData):
         """Create probability distribution heatmap visualization"""
         ws = workbook.create_sheet("🔥 Probability Heatmap")
+        merges = []  # (min_row, min_col, max_row, max_col), registered at the end
 
         # Title
         ws['A1'] = "📊 Probability Distribution Heatmap"
         ws['A1'].style = self.title_style
-        ws.merge_cells('A1:J1')
+        merges.append((1, 1, 1, 10))
         ws.row_dimensions[1].height = 30
 
         # Collect all probabilities by model
-        model_probabilities = {}
+        model_probabilities = defaultdict(list)
         for response in export_data.forecast_result.responses:
             if response.probability is not None:
-                if response.model not in model_probabilities:
-                    model_probabilities[response.model] = []
                 model_probabilities[response.model].append(response.probability)
 
         if not model_probabilities:
             ws['A3'] = "No probability data available"
+            self._apply_merges(ws, merges)
             return
 
-        # Create probability bins (0-10, 10-20, ..., 90-100)
-        bins = list(range(0, 110, 10))
+        # Probability bins (0-10, 10-20, ..., 90-100)
         bin_labels = [f"{i}-{i+10}%" for i in range(0, 100, 10)]
 
         # Headers
@@ -999,69 +1109,57 @@ class ExcelExporter:
             cell.value = label
             cell.style = self.header_style
 
-        # Calculate distribution for each model
-        row = 4
+        # Calculate distribution for each model; rows are appended whole and
+        # only non-empty bins are styled afterwards
         for model, probs in model_probabilities.items():
             model_name = model.split('/')[-1] if '/' in model else model
-            ws[f'A{row}'] = model_name
-            ws[f'A{row}'].font = Font(bold=True)
 
             # Count probabilities in each bin
-            hist, _ = np.histogram(probs, bins=bins)
+            hist = _bin10(probs)
             max_count = max(hist) if max(hist) > 0 else 1
 
-            for i, count in enumerate(hist):
-                cell = ws.cell(row=row, column=i+2)
-                cell.value = count
-
-                # Color intensity based on count (heatmap effect)
-                if count > 0:
-                    intensity = int(255 - (count / max_count) * 200)
-                    color = f"{intensity:02X}FF{intensity:02X}"  # Green gradient
-                    cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+            ws.append([model_name, *hist.tolist()])
+            row = ws.max_row
+            ws.cell(row=row, column=1).font = Font(bold=True)
 
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = Border(
-                    left=Side(style='thin'), right=Side(style='thin'),
-                    top=Side(style='thin'), bottom=Side(style='thin')
-                )
+            for i in np.nonzero(hist)[0]:
+                count = hist[i]
+                cell = ws.cell(row=row, column=int(i) + 2)
 
-            row += 1
-
-        # Add consensus indicator row
-        row += 1
-        ws[f'A{row}'] = "📊 CONSENSUS"
-        ws[f'A{row}'].style = self.header_style
+                # Color intensity based on count (heatmap effect)
+                cell.fill = GREEN_FILLS[int(255 - (count / max_count) * 200)]
+                cell.alignment = CENTER
+                cell.border = CELL_BORDER
 
         # Calculate overall distribution
         all_probs = [p for probs in model_probabilities.values() for p in probs]
-        overall_hist, _ = np.histogram(all_probs, bins=bins)
+        overall_hist = _bin10(all_probs)
         max_overall = max(overall_hist) if max(overall_hist) > 0 else 1
 
-        for i, count in enumerate(overall_hist):
-            cell = ws.cell(row=row, column=i+2)
-            cell.value = count
+        # Add consensus indicator row (after one blank spacer row)
+        ws.append([])
+        ws.append(["📊 CONSENSUS", *overall_hist.tolist()])
+        row = ws.max_row
+        ws.cell(row=row, column=1).style = self.header_style
+
+        for i in np.nonzero(overall_hist)[0]:
+            count = overall_hist[i]
+            cell = ws.cell(row=row, column=int(i) + 2)
 
             # Highlight the bin with most predictions
-            if count == max_overall and count > 0:
-                cell.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")  # Gold
-                cell.font = Font(bold=True)
-            elif count > 0:
-                intensity = int(255 - (count / max_overall) * 150)
-                color = f"FF{intensity:02X}{intensity:02X}"  # Red gradient for consensus
-                cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
+            if count == max_overall:
+                cell.style = self.consensus_style  # Gold
+                continue
+
+            cell.fill = RED_FILLS[int(255 - (count / max_overall) * 150)]  # Red gradient for consensus
+            cell.alignment = CENTER
+            cell.border = CELL_BORDER
 
         # Add summary statistics
         row += 3
         ws[f'A{row}'] = "📈 Distribution Insights"
         ws[f'A{row}'].style = self.header_style
-        ws.merge_cells(f'A{row}:D{row}')
+        merges.append((row, 1, row, 4))
 
         # Find mode bin
         mode_bin_idx = np.argmax(overall_hist)
@@ -1083,51 +1181,52 @@ class ExcelExporter:
             ws[f'B{r}'] = value
             ws[f'C{r}'] = description
             ws[f'A{r}'].font = Font(bold=True)
-            ws.merge_cells(f'C{r}:D{r}')
+            merges.append((r, 3, r, 4))
+
+        self._apply_merges(ws, merges)
 
         # Auto-adjust column widths
-        ws.column_dimensions['A'].width = 20
-        for col in ['B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K']:
-            ws.column_dimensions[col].width = 12
+        self._set_column_widths(ws, WIDTHS_HEATMAP)
 
-    def _create_executive_brief_sheet(self, workbook: Workbook, export_data: ExportData):
+    def _create_executive_brief_sheet(self, workbook: Workbook, export_data: ExportData, columns: _ResponseColumns):
         """Create auto-generated executive brief"""
         ws = workbook.create_sheet("📋 Executive Brief", 0)  # Insert as first sheet
+        merges = []  # (min_row, min_col, max_row, max_col), registered at the end
 
         # Professional header
         ws['A1'] = "EXECUTIVE BRIEF"
         ws['A1'].font = Font(size=18, bold=True, color="2E5C8A")
         ws['A1'].alignment = Alignment(horizontal="center", vertical="center")
-        ws.merge_cells('A1:F1')
+        merges.append((1, 1, 1, 6))
         ws.row_dimensions[1].height = 35
 
         # Date and metadata
         ws['A2'] = f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
         ws['A2'].font = Font(italic=True, size=10)
-        ws.merge_cells('A2:F2')
+        merges.append((2, 1, 2, 6))
 
         # Question
         ws['A4'] = "FORECAST QUESTION"
         ws['A4'].font = Font(bold=True, size=12, color="366092")
-        ws.merge_cells('A4:F4')
+        merges.append((4, 1, 4, 6))
 
         ws['A5'] = export_data.forecast_result.metadata.question
         ws['A5'].font = Font(size=11)
         ws['A5'].alignment = Alignment(wrap_text=True, vertical='top')
-        ws.merge_cells('A5:F6')
+        merges.append((5, 1, 6, 6))
         ws.row_dimensions[5].height = 40
 
         # Main probability result (large and prominent)
         ensemble_prob = export_data.forecast_result.get_ensemble_probability()
         ws['A8'] = "FORECAST PROBABILITY"
         ws['A8'].font = Font(bold=True, size=12, color="366092")
-        ws.merge_cells('A8:C8')
+        merges.append((8, 1, 8, 3))
 
         if ensemble_prob:
             ws['A9'] = f"{ensemble_prob:.1f}%"
             ws['A9'].font = Font(size=36, bold=True, color="E74C3C")
             ws['A9'].alignment = Alignment(horizontal="center", vertical="center")
-            ws.merge_cells('A9:C10')
+            merges.append((9, 1, 10, 3))
             ws.row_dimensions[9].height = 50
 
             # Confidence interval
@@ -1137,24 +1236,24 @@ class ExcelExporter:
             ws['A11'] = f"Confidence Interval: {lower:.0f}% - {upper:.0f}%"
             ws['A11'].font = Font(italic=True, size=10)
             ws['A11'].alignment = Alignment(horizontal="center")
-            ws.merge_cells('A11:C11')
+            merges.append((11, 1, 11, 3))
 
         # Model consensus indicator
         ws['D8'] = "MODEL CONSENSUS"
         ws['D8'].font = Font(bold=True, size=12, color="366092")
-        ws.merge_cells('D8:F8')
+        merges.append((8, 4, 8, 6))
 
         consensus = self._get_consensus_level(export_data.forecast_result.statistics)
         consensus_color = "27AE60" if "Strong" in consensus else "F39C12" if "Moderate" in consensus else "E74C3C"
         ws['D9'] = consensus
         ws['D9'].font = Font(size=20, bold=True, color=consensus_color)
         ws['D9'].alignment = Alignment(horizontal="center", vertical="center")
-        ws.merge_cells('D9:F10')
+        merges.append((9, 4, 10, 6))
 
         # Key factors section
         ws['A13'] = "KEY FORECAST DRIVERS"
         ws['A13'].font = Font(bold=True, size=12, color="366092")
-        ws.merge_cells('A13:F13')
+        merges.append((13, 1, 13, 6))
 
         # Extract key factors from responses
         key_factors = self._extract_key_factors(export_data.forecast_result.responses)
@@ -1164,13 +1263,13 @@ class ExcelExporter:
             ws[f'B{row}'] = factor
             ws[f'A{row}'].font = Font(bold=True)
             ws[f'B{row}'].alignment = Alignment(wrap_text=True)
-            ws.merge_cells(f'B{row}:F{row}')
+            merges.append((row, 2, row, 6))
 
         # Model performance summary
         row = 18
         ws[f'A{row}'] = "MODEL PERFORMANCE SUMMARY"
         ws[f'A{row}'].font = Font(bold=True, size=12, color="366092")
-        ws.merge_cells(f'A{row}:F{row}')
+        merges.append((row, 1, row, 6))
 
         # Performance metrics
         row += 1
@@ -1184,7 +1283,7 @@ class ExcelExporter:
         performance_metrics = [
             ("Models Used", len(export_data.forecast_result.metadata.models)),
             ("Success Rate", f"{export_data.forecast_result.statistics.success_rate * 100:.1f}%"),
-            ("Average Response Quality", self._calculate_avg_quality_score(export_data.forecast_result)),
+            ("Average Response Quality", self._calculate_avg_quality_score(columns)),
             ("Analysis Duration", f"{export_data.forecast_result.metadata.duration_seconds:.1f} seconds"),
         ]
 
@@ -1199,48 +1298,59 @@ class ExcelExporter:
         row += 2
         ws[f'A{row}'] = "RISK ASSESSMENT"
         ws[f'A{row}'].font = Font(bold=True, size=12, color="366092")
-        ws.merge_cells(f'A{row}:F{row}')
+        merges.append((row, 1, row, 6))
 
         row += 1
         risk_level = self._assess_risk_level(ensemble_prob, export_data.forecast_result.statistics.std)
         risk_color = "27AE60" if risk_level == "Low" else "F39C12" if risk_level == "Medium" else "E74C3C"
         ws[f'A{row}'] = f"Risk Level: {risk_level}"
         ws[f'A{row}'].font = Font(size=11, bold=True, color=risk_color)
-        ws.merge_cells(f'A{row}:F{row}')
+        merges.append((row, 1, row, 6))
 
         # Recommendations
         row += 2
         ws[f'A{row}'] = "RECOMMENDATIONS"
         ws[f'A{row}'].font = Font(bold=True, size=12, color="366092")
-        ws.merge_cells(f'A{row}:F{row}')
+        merges.append((row, 1, row, 6))
 
         recommendations = self._generate_recommendations(ensemble_prob, consensus, risk_level)
         for i, rec in enumerate(recommendations, 1):
             row += 1
             ws[f'A{row}'] = f"• {rec}"
             ws[f'A{row}'].alignment = Alignment(wrap_text=True)
-            ws.merge_cells(f'A{row}:F{row}')
+            merges.append((row, 1, row, 6))
 
         # Footer
         row += 2
         ws[f'A{row}'] = "This brief was automatically generated based on ensemble AI forecasting analysis."
         ws[f'A{row}'].font = Font(italic=True, size=9, color="808080")
         ws[f'A{row}'].alignment = Alignment(horizontal="center")
-        ws.merge_cells(f'A{row}:F{row}')
+        merges.append((row, 1, row, 6))
 
         # Format column widths
-        ws.column_dimensions['A'].width = 5
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 15
+        self._set_column_widths(ws, WIDTHS_BRIEF)
 
         # Add borders to main sections
         for section_start in [4, 8, 13, 18]:
             for col in range(1, 7):
                 ws.cell(row=section_start, column=col).border = Border(top=Side(style='medium'))
 
+        self._apply_merges(ws, merges)
+
+    @staticmethod
+    def _set_column_widths(ws, widths: Dict[str, float]):
+        """Apply a column letter -> width mapping"""
+        for col, width in widths.items():
+            ws.column_dimensions[col].width = width
+
+    @staticmethod
+    def _apply_merges(ws, merges):
+        """Register collected merge ranges in one batch, skipping range-string parsing"""
+        ws.merged_cells.ranges.update(
+            CellRange(min_row=r1, min_col=c1, max_row=r2, max_col=c2)
+            for r1, c1, r2, c2 in merges
+        )
+
     def _calculate_consensus_strength(self, histogram):
         """Calculate consensus strength from probability histogram"""
         if sum(histogram) == 0:
@@ -1262,12 +1372,15 @@ class ExcelExporter:
 
         for response in responses[:5]:  # Sample first 5 responses
             if response.content:
-                content_lower = response.content.lower()
+                # Only the head of each response is scanned to bound the work
+                haystack = response.content[:KEY_FACTOR_SCAN_CHARS]
+                content_lower = haystack.lower()
                 for keyword in keywords:
                     if keyword in content_lower and keyword not in [f.lower() for f in factors]:
                         # Extract sentence containing keyword
-                        sentences = response.content.split('.')
-                        for sent in sentences:
+                        sentences = islice(_SENTENCE_RE.finditer(haystack), KEY_FACTOR_MAX_SENTENCES)
+                        for match in sentences:
+                            sent = match.group(1)
                             if keyword in sent.lower():
                                 factor = sent.strip()[:100] + "..." if len(sent) > 100 else sent.strip()
                                 if factor and factor not in factors:
@@ -1280,34 +1393,20 @@ class ExcelExporter:
 
         return factors if factors else ["Military developments", "Diplomatic negotiations", "Economic pressures"]
 
-    def _calculate_avg_quality_score(self, forecast_result):
+    def _calculate_avg_quality_score(self, columns: _ResponseColumns):
         """Calculate average quality score based on response characteristics"""
-        total_score = 0
-        count = 0
-
-        for response in forecast_result.responses:
-            if response.content:
-                score = 0
-                # Length score
-                length = len(response.content)
-                if length > 3000:
-                    score += 3
-                elif length > 1500:
-                    score += 2
-                elif length > 500:
-                    score += 1
-
-                # Probability extraction success
-                if response.probability is not None:
-                    score += 2
-
-                total_score += score
-                count += 1
-
-        if count == 0:
+        has_content = columns.lens > 0
+        if not has_content.any():
             return "N/A"
 
-        avg = total_score / count
+        # Length score plus probability extraction success
+        lens = columns.lens[has_content]
+        scores = (
+            _LEN_SCORES[np.searchsorted(_LEN_THRESHOLDS, lens, side='left')]
+            + columns.has_prob[has_content] * 2
+        )
+
+        avg = scores.mean()
         if avg >= 4:
             return "⭐⭐⭐⭐⭐ Excellent"
         elif avg >= 3:
@@ -1407,4 +1506,4 @@ class ExcelExporter:
         else:
             confidence_score["stars"] = 1
 
-        return confidence_score
\ No newline at end of file
+        return confidence_score
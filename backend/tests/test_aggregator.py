@@ -0,0 +1,219 @@
+"""Tests for the columnar aggregation code and its numeric kernels"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.analysis import _kernels
+from services.analysis._kernels import grouped_stats
+from services.analysis.aggregator import ForecastAggregator, _quartiles
+from services.core.models import ModelResponse, ResponseStatus
+
+
+COLUMNS = ("count", "mean", "std", "min", "max", "median")
+
+
+def _reference_stats(codes, probabilities, n_groups):
+    """Per-group statistics computed with a pandas groupby"""
+    grouped = pd.Series(probabilities, dtype=float).groupby(np.asarray(codes, dtype=np.int64))
+    frame = grouped.agg(list(COLUMNS)).reindex(range(n_groups))
+    # Empty groups report 0, and a single sample has no spread
+    return frame.fillna(0.0)
+
+
+def _jit(codes, probabilities, n_groups):
+    return dict(zip(COLUMNS, _kernels._grouped_stats_jit(codes, probabilities, n_groups)))
+
+
+def _numpy(codes, probabilities, n_groups):
+    return dict(zip(COLUMNS, _kernels._grouped_stats_numpy(codes, probabilities, n_groups)))
+
+
+def _generated(codes, probabilities, n_groups):
+    reduce = _kernels._make_reducer(n_groups)
+    return dict(zip(COLUMNS, reduce(codes.tolist(), probabilities.tolist())))
+
+
+# Every grouped reduction, not only the one grouped_stats picks in this environment
+KERNELS = [
+    pytest.param(grouped_stats, id="grouped_stats"),
+    pytest.param(_jit, id="jit"),
+    pytest.param(_numpy, id="numpy"),
+    pytest.param(_generated, id="generated"),
+]
+
+
+GROUPED_CASES = [
+    pytest.param([0], [42.0], 1, id="single-value"),
+    pytest.param([0, 0, 0, 0], [30.0] * 4, 1, id="all-identical"),
+    pytest.param([0, 1, 0, 1, 2], [10.0, 20.0, 30.0, 40.0, 50.0], 3, id="three-groups"),
+    pytest.param([2, 2, 0], [5.0, 95.0, 50.0], 4, id="empty-groups"),
+    pytest.param([1, 0, 1, 1, 0, 1], [0.0, 100.0, 33.3, 66.7, 0.0, 12.5], 2, id="bounds"),
+]
+
+
+@pytest.mark.parametrize("reduce", KERNELS)
+@pytest.mark.parametrize("codes, probabilities, n_groups", GROUPED_CASES)
+def test_grouped_stats_matches_pandas(reduce, codes, probabilities, n_groups):
+    codes = np.asarray(codes, dtype=np.int64)
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+
+    result = reduce(codes, probabilities, n_groups)
+    expected = _reference_stats(codes, probabilities, n_groups)
+
+    for column in COLUMNS:
+        np.testing.assert_allclose(result[column], expected[column].to_numpy(), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("reduce", KERNELS)
+def test_grouped_stats_random_batches_match_pandas(reduce):
+    rng = np.random.default_rng(7)
+    for n_groups, size in ((1, 1), (3, 40), (8, 256), (12, 500)):
+        codes = rng.integers(0, n_groups, size)
+        probabilities = rng.uniform(0, 100, size).round(1)
+
+        result = reduce(codes, probabilities, n_groups)
+        expected = _reference_stats(codes, probabilities, n_groups)
+
+        for column in COLUMNS:
+            np.testing.assert_allclose(result[column], expected[column].to_numpy(), rtol=1e-10, atol=1e-10)
+
+
+@pytest.mark.parametrize("kernel", [_kernels._grouped_stats_jit, _kernels._grouped_stats_numpy])
+def test_grouped_stats_empty_input(kernel):
+    counts, *columns = kernel(np.zeros(0, dtype=np.int64), np.zeros(0), 2)
+    np.testing.assert_array_equal(counts, [0, 0])
+    for column in columns:
+        np.testing.assert_array_equal(column, [0.0, 0.0])
+
+
+@pytest.mark.parametrize("values", [
+    pytest.param([42.0], id="single-value"),
+    pytest.param([10.0, 90.0], id="two-values"),
+    pytest.param([55.0] * 7, id="all-identical"),
+    pytest.param([5.0, 1.0, 4.0, 2.0, 3.0], id="unsorted"),
+    pytest.param([0.0, 100.0, 50.0, 50.0, 0.0, 100.0], id="ties"),
+])
+def test_quartiles_match_percentile(values):
+    values = np.asarray(values)
+    assert _quartiles(values) == pytest.approx(tuple(np.percentile(values, [25, 75])), abs=1e-12)
+
+
+def test_quartiles_random_sizes_match_percentile():
+    rng = np.random.default_rng(3)
+    for size in range(1, 60):
+        values = rng.uniform(0, 100, size).round(1)
+        assert _quartiles(values) == pytest.approx(tuple(np.percentile(values, [25, 75])), abs=1e-12)
+
+
+def test_quartiles_leave_input_untouched():
+    values = np.array([9.0, 1.0, 7.0, 3.0, 5.0])
+    _quartiles(values)
+    np.testing.assert_array_equal(values, [9.0, 1.0, 7.0, 3.0, 5.0])
+
+
+def _response(model, iteration, probability, status=ResponseStatus.SUCCESS):
+    return ModelResponse(
+        model=model,
+        iteration=iteration,
+        ensemble_id=f"{model}_{iteration}",
+        timestamp="2026-01-01T00:00:00",
+        response_time=1.0 + iteration,
+        status=status,
+        probability=probability,
+    )
+
+
+def _responses(rows):
+    iterations = {}
+    responses = []
+    for model, probability, status in rows:
+        iterations[model] = iterations.get(model, 0) + 1
+        responses.append(_response(model, iterations[model], probability, status))
+    return responses
+
+
+AGGREGATE_CASES = [
+    pytest.param([("a", 40.0, ResponseStatus.SUCCESS)], id="single-response"),
+    pytest.param([("a", 25.0, ResponseStatus.SUCCESS)] * 5, id="all-identical"),
+    pytest.param(
+        [("a", 10.0, ResponseStatus.SUCCESS), ("b", 70.0, ResponseStatus.SUCCESS),
+         ("a", 30.0, ResponseStatus.SUCCESS), ("b", None, ResponseStatus.SUCCESS),
+         ("c", None, ResponseStatus.ERROR), ("b", 90.0, ResponseStatus.SUCCESS),
+         ("a", 55.5, ResponseStatus.TIMEOUT)],
+        id="mixed-statuses",
+    ),
+]
+
+
+@pytest.mark.parametrize("rows", AGGREGATE_CASES)
+def test_aggregate_results_matches_pandas(rows):
+    responses = _responses(rows)
+    stats = ForecastAggregator(method="simple").aggregate_results(responses)
+
+    frame = pd.DataFrame({
+        "model": [r.model for r in responses],
+        "probability": [r.probability for r in responses],
+        "success": [r.status is ResponseStatus.SUCCESS for r in responses],
+    })
+    valid = frame[frame["success"] & frame["probability"].notna()]
+
+    assert stats.total_queries == len(responses)
+    assert stats.successful_queries == int(frame["success"].sum())
+    assert stats.valid_probabilities == len(valid)
+    assert stats.models_used == list(dict.fromkeys(frame["model"]))
+
+    expected = valid.groupby("model")["probability"].agg(["count", "mean", "median", "std", "min", "max"])
+    success_rates = frame.groupby("model")["success"].mean()
+    for model, model_stats in stats.model_stats.items():
+        if model not in expected.index:
+            assert model_stats.count == 0
+            assert model_stats.success_rate == 0.0
+            continue
+        row = expected.loc[model].fillna(0.0)
+        assert model_stats.count == row["count"]
+        for field in ("mean", "median", "std", "min", "max"):
+            assert getattr(model_stats, field) == pytest.approx(row[field], abs=1e-12)
+        assert model_stats.success_rate == pytest.approx(success_rates[model])
+
+    probabilities = valid["probability"]
+    assert stats.mean == pytest.approx(probabilities.mean())
+    assert stats.median == pytest.approx(probabilities.median())
+    assert stats.std == pytest.approx(probabilities.std() if len(probabilities) > 1 else 0.0)
+
+
+def test_aggregate_results_without_valid_probabilities():
+    responses = _responses([("a", None, ResponseStatus.ERROR), ("b", None, ResponseStatus.TIMEOUT)])
+    stats = ForecastAggregator(method="simple").aggregate_results(responses)
+
+    assert stats.valid_probabilities == 0
+    assert stats.successful_queries == 0
+    assert stats.mean is None
+    assert {model: s.count for model, s in stats.model_stats.items()} == {"a": 0, "b": 0}
+
+
+def test_aggregate_results_empty():
+    stats = ForecastAggregator(method="simple").aggregate_results([])
+
+    assert stats.total_queries == 0
+    assert stats.models_used == []
+    assert stats.model_stats == {}
+
+
+@pytest.mark.parametrize("method", ["iqr", "zscore"])
+def test_identify_outliers_needs_four_responses(method):
+    aggregator = ForecastAggregator(method="simple")
+    assert aggregator.identify_outliers([], method=method) == []
+    responses = _responses([("a", 10.0, ResponseStatus.SUCCESS), ("b", 90.0, ResponseStatus.SUCCESS)])
+    assert aggregator.identify_outliers(responses, method=method) == []
+
+
+def test_identify_outliers_iqr_matches_percentile_bounds():
+    probabilities = [40.0, 42.0, 41.0, 43.0, 44.0, 99.0, 1.0, 42.5]
+    responses = _responses([(f"m{i}", p, ResponseStatus.SUCCESS) for i, p in enumerate(probabilities)])
+
+    q1, q3 = np.percentile(probabilities, [25, 75])
+    low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    expected = [r.ensemble_id for r in responses if not low <= r.probability <= high]
+
+    assert ForecastAggregator(method="simple").identify_outliers(responses) == expected
+    assert expected == ["m5_1", "m6_1"]
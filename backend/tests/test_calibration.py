@@ -0,0 +1,248 @@
+"""Tests for batch calibration, its kernels and its shortcuts"""
+import numpy as np
+import pytest
+from scipy.optimize import minimize
+from scipy.special import expit, logit
+from sklearn.isotonic import IsotonicRegression
+
+from services.analysis.calibration import IDENTITY_TOLERANCE, BatchCalibrator, MultiModelCalibrator, _pav
+
+
+def _isotonic_reference(x, y, queries):
+    """Predictions of the sklearn model the PAV kernel replaces"""
+    model = IsotonicRegression(out_of_bounds="clip")
+    model.fit(x, y)
+    return model.predict(queries)
+
+
+def _pav_predict(x, y, queries):
+    order = np.argsort(x, kind="stable")
+    knots, fitted = _pav(
+        np.ascontiguousarray(x[order], dtype=np.float64),
+        np.ascontiguousarray(y[order], dtype=np.float64),
+        np.ones(x.shape[0])
+    )
+    return np.interp(queries, knots, fitted)
+
+
+ISOTONIC_CASES = [
+    pytest.param([0.3], [1.0], id="single-value"),
+    pytest.param([0.4, 0.4, 0.4, 0.4], [1.0, 0.0, 1.0, 1.0], id="all-identical-inputs"),
+    pytest.param([0.1, 0.5, 0.9], [0.7, 0.7, 0.7], id="all-identical-targets"),
+    pytest.param([0.1, 0.2, 0.3, 0.4], [0.0, 0.2, 0.6, 1.0], id="already-monotone"),
+    pytest.param([0.1, 0.2, 0.3, 0.4], [1.0, 0.6, 0.2, 0.0], id="decreasing"),
+    pytest.param([0.9, 0.2, 0.5, 0.2, 0.7, 0.5], [1.0, 0.0, 1.0, 1.0, 0.0, 0.0], id="unsorted-ties"),
+]
+
+
+@pytest.mark.parametrize("x, y", ISOTONIC_CASES)
+def test_pav_matches_sklearn_isotonic(x, y):
+    x, y = np.asarray(x), np.asarray(y)
+    queries = np.linspace(0, 1, 21)
+    np.testing.assert_allclose(_pav_predict(x, y, queries), _isotonic_reference(x, y, queries), atol=1e-12)
+
+
+def test_pav_random_batches_match_sklearn_isotonic():
+    rng = np.random.default_rng(11)
+    queries = np.linspace(-0.1, 1.1, 61)
+    for size in (2, 5, 30, 200):
+        x = rng.integers(0, 20, size) / 20  # plenty of tied inputs
+        y = (rng.random(size) < x).astype(float)
+        np.testing.assert_allclose(_pav_predict(x, y, queries), _isotonic_reference(x, y, queries), atol=1e-12)
+
+
+def test_pav_empty_input():
+    knots, fitted = _pav(np.zeros(0), np.zeros(0), np.zeros(0))
+    assert knots.size == 0
+    assert fitted.size == 0
+
+
+def test_pav_honours_weights():
+    x = np.array([0.2, 0.8])
+    y = np.array([1.0, 0.0])
+    w = np.array([3.0, 1.0])
+    knots, fitted = _pav(x, y, w)
+
+    model = IsotonicRegression(out_of_bounds="clip").fit(x, y, sample_weight=w)
+    np.testing.assert_allclose(np.interp(x, knots, fitted), model.predict(x), atol=1e-12)
+
+
+def test_isotonic_calibrator_matches_sklearn():
+    rng = np.random.default_rng(5)
+    probabilities = (rng.random(50) * 100).round(1)
+    labels = rng.random(50) < probabilities / 100
+
+    calibrator = BatchCalibrator(method="isotonic")
+    calibrator.fit(probabilities.tolist(), labels.tolist())
+
+    reference = _isotonic_reference(probabilities, labels.astype(float), probabilities / 100.0)
+    expected = np.clip(reference * 100, 0, 100)
+    np.testing.assert_allclose(calibrator.calibrate_batch(probabilities.tolist()), expected, atol=1e-9)
+
+
+def _reference_metrics(probabilities, labels):
+    """ECE, MCE and Brier score computed bin by bin, as the original implementation did"""
+    probs = np.array(probabilities) / 100.0
+    labs = np.array(labels).astype(float)
+    bin_boundaries = np.linspace(0, 1, 11)
+    ece = mce = 0.0
+    for low, high in zip(bin_boundaries[:-1], bin_boundaries[1:]):
+        mask = (probs > low) & (probs <= high)
+        if mask.sum() > 0:
+            gap = abs(labs[mask].mean() - probs[mask].mean())
+            ece += mask.sum() / len(probs) * gap
+            mce = max(mce, gap)
+    return ece, mce, np.mean((probs - labs) ** 2)
+
+
+METRIC_CASES = [
+    pytest.param([100.0] * 999 + [55.0], [True] * 1000, id="one-outlier-in-identity"),
+    pytest.param([42.0], [True], id="single-value"),
+    pytest.param([30.0] * 8, [True, False] * 4, id="all-identical"),
+    pytest.param([5.0, 15.0, 55.0, 85.0, 95.0, 100.0], [False, False, True, True, True, True], id="spread"),
+    pytest.param([0.0, 10.0, 20.0, 90.0], [False, True, False, True], id="bin-edges"),
+]
+
+
+@pytest.mark.parametrize("probabilities, labels", METRIC_CASES)
+def test_calibration_metrics_match_reference(probabilities, labels):
+    metrics = BatchCalibrator().get_calibration_metrics(probabilities, labels)
+    ece, mce, brier = _reference_metrics(probabilities, labels)
+
+    assert metrics["expected_calibration_error"] == pytest.approx(ece, abs=1e-12)
+    assert metrics["maximum_calibration_error"] == pytest.approx(mce, abs=1e-12)
+    assert metrics["brier_score"] == pytest.approx(brier, abs=1e-12)
+
+
+def test_calibration_metrics_one_outlier_is_not_hidden_by_the_mean():
+    metrics = BatchCalibrator().get_calibration_metrics([100.0] * 999 + [55.0], [True] * 1000)
+    assert metrics["expected_calibration_error"] == pytest.approx(0.00045)
+    assert metrics["maximum_calibration_error"] == pytest.approx(0.45)
+
+
+@pytest.mark.parametrize("probabilities, labels", [
+    pytest.param([100.0, 0.0, 100.0], [True, False, True], id="exact"),
+    pytest.param([99.95, 0.05, 99.99, 0.0], [True, False, True, False], id="within-tolerance"),
+    pytest.param([100.0], [True], id="single-value"),
+])
+def test_calibration_metrics_identity_shortcut(probabilities, labels):
+    metrics = BatchCalibrator().get_calibration_metrics(probabilities, labels)
+    ece, mce, brier = _reference_metrics(probabilities, labels)
+
+    # The shortcut reports perfect calibration; the full computation is within the tolerance
+    assert metrics["expected_calibration_error"] == 0.0
+    assert metrics["maximum_calibration_error"] == 0.0
+    assert ece < IDENTITY_TOLERANCE and mce < IDENTITY_TOLERANCE
+    assert metrics["brier_score"] == pytest.approx(brier, abs=1e-15)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_calibration_metrics_empty():
+    metrics = BatchCalibrator().get_calibration_metrics([], [])
+    assert metrics["expected_calibration_error"] == 0.0
+    assert metrics["maximum_calibration_error"] == 0.0
+    assert np.isnan(metrics["brier_score"])
+
+
+def _reference_nll(T, probabilities, labels):
+    """Temperature-scaled negative log likelihood, as the original objective computed it"""
+    probs = np.array(probabilities) / 100.0
+    labs = np.array(labels).astype(float)
+    scaled = expit(logit(np.clip(probs, 1e-7, 1 - 1e-7)) / T)
+    return -np.mean(
+        labs * np.log(np.clip(scaled, 1e-7, 1)) + (1 - labs) * np.log(np.clip(1 - scaled, 1e-7, 1))
+    )
+
+
+def _reference_temperature(probabilities, labels):
+    objective = lambda T: _reference_nll(T[0], probabilities, labels)
+    return minimize(objective, [1.0], bounds=[(0.1, 10.0)]).x[0]
+
+
+TEMPERATURE_CASES = [
+    pytest.param([50.0] * 6, [True, False] * 3, id="uninformative"),
+    pytest.param([99.99999, 0.00001] * 4, [True, False] * 4, id="confident-and-right"),
+    pytest.param([90.0] * 10, [True, False] * 5, id="overconfident"),
+    pytest.param([70.0], [True], id="single-value"),
+    pytest.param([20.0, 40.0, 60.0, 80.0], [False, False, True, True], id="underconfident"),
+]
+
+
+@pytest.mark.parametrize("probabilities, labels", TEMPERATURE_CASES)
+def test_optimize_temperature_is_no_worse_than_reference(probabilities, labels):
+    temperature = BatchCalibrator(method="temperature")._optimize_temperature(probabilities, labels)
+    reference = _reference_temperature(probabilities, labels)
+
+    assert 0.1 <= temperature <= 10.0
+    assert _reference_nll(temperature, probabilities, labels) <= (
+        _reference_nll(reference, probabilities, labels) + IDENTITY_TOLERANCE
+    )
+
+
+@pytest.mark.parametrize("probabilities, labels", TEMPERATURE_CASES[:2])
+def test_optimize_temperature_keeps_identity_when_gain_is_negligible(probabilities, labels):
+    assert BatchCalibrator(method="temperature")._optimize_temperature(probabilities, labels) == 1.0
+
+
+def test_optimize_temperature_still_fits_overconfident_batches():
+    probabilities, labels = [90.0] * 10, [True, False] * 5
+    temperature = BatchCalibrator(method="temperature")._optimize_temperature(probabilities, labels)
+    assert temperature == pytest.approx(_reference_temperature(probabilities, labels), rel=1e-3)
+    assert temperature > 1.0
+
+
+@pytest.mark.parametrize("probabilities", [
+    pytest.param([45.3, 12.1, 87.7], id="batch"),
+    pytest.param([42.0], id="single-value"),
+    pytest.param([60.0] * 5, id="all-identical"),
+    pytest.param([0.0, 100.0], id="bounds"),
+    pytest.param([], id="empty"),
+])
+def test_identity_temperature_returns_inputs(probabilities):
+    calibrator = BatchCalibrator(method="temperature")
+    calibrator.temperature = 1.0
+    calibrator.is_fitted = True
+
+    calibrated = calibrator.calibrate_batch(probabilities)
+
+    assert calibrated == probabilities
+    assert all(type(value) is float for value in calibrated)
+    assert [calibrator.calibrate(p) for p in probabilities] == pytest.approx(probabilities, abs=1e-12)
+
+
+def test_temperature_calibration_matches_reference():
+    probabilities = [0.0, 12.1, 45.3, 50.0, 87.7, 100.0]
+    calibrator = BatchCalibrator(method="temperature")
+    calibrator.temperature = 1.7
+    calibrator.is_fitted = True
+
+    expected = expit(logit(np.clip(np.array(probabilities) / 100.0, 1e-7, 1 - 1e-7)) / 1.7) * 100
+    np.testing.assert_allclose(calibrator.calibrate_batch(probabilities), expected, atol=1e-9)
+
+
+def test_ensemble_models_get_their_own_calibrators():
+    calibrator = MultiModelCalibrator()
+    predictions = {"a": [45.3, 12.1, 87.7], "b": [45.3, 12.1, 87.7], "c": [45.4, 12.1, 87.7]}
+
+    calibrated = calibrator.calibrate_ensemble(predictions)
+
+    # Batches in the same quantization buckets reuse one fit...
+    assert len(calibrator._fit_cache) == 1
+    assert calibrated["a"] == calibrated["b"]
+    temperatures = {model: c.temperature for model, c in calibrator.model_calibrators.items()}
+    assert len(set(temperatures.values())) == 1
+
+    # ...but every model keeps its own calibrator instance
+    instances = list(calibrator.model_calibrators.values())
+    assert len({id(c) for c in instances}) == len(predictions)
+    calibrator.model_calibrators["a"].temperature = 3.0
+    assert calibrator.model_calibrators["b"].temperature == temperatures["b"]
+
+
+def test_ensemble_calibration_matches_fresh_fits():
+    predictions = {"a": [45.3, 12.1, 87.7], "b": [60.1, 70.2], "c": [45.3, 12.1, 87.7]}
+    calibrated = MultiModelCalibrator().calibrate_ensemble(predictions)
+
+    for model, values in predictions.items():
+        expected = BatchCalibrator(method="temperature").calibrate_batch(values)
+        assert calibrated[model] == pytest.approx(expected, abs=1e-12)
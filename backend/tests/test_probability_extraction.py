@@ -0,0 +1,66 @@
+"""Tests for probability extraction from model responses"""
+import pytest
+
+from services.core.api_client import OpenRouterClient
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Extraction reads no client state, so skip the HTTP setup of __init__
+    return OpenRouterClient.__new__(OpenRouterClient)
+
+
+# Expected values are what the original, ungated extraction returned
+EXTRACTION_CASES = [
+    # HAUPTPROGNOSE tier
+    pytest.param("Analysis...\nHAUPTPROGNOSE: 42%", "", 42.0, id="hauptprognose"),
+    pytest.param("**HAUPTPROGNOSE: 37.5%**", "", 37.5, id="hauptprognose-bold"),
+    pytest.param("hauptprognose: 12", "", 12.0, id="hauptprognose-lowercase"),
+    pytest.param("HAUPTPROGNOSE: 61%\nPROGNOSE: 20%\n{\"probability\": 5}", "", 61.0, id="hauptprognose-first"),
+    pytest.param("HAUPTPROGNOSE: 150", "", None, id="hauptprognose-out-of-range"),
+    # PROGNOSE tier
+    pytest.param("HAUPTPROGNOSE: 150\nPROGNOSE: 55 %", "", 55.0, id="prognose-after-invalid"),
+    pytest.param("PROGNOSE: **71.2%**", "", 71.2, id="prognose-bold-value"),
+    pytest.param("Prognose: 0.4", "", 0.4, id="prognose-fraction"),
+    # Final_Probability tier
+    pytest.param("Final_Probability = (40 × 0.5) = 20%", "", 20.0, id="final-probability"),
+    pytest.param("Final_Probability = 23", "", 23.0, id="final-probability-plain"),
+    # Model-specific tiers
+    pytest.param("My reasoning... probability is 66% or so", "deepseek/deepseek-r1:free", 66.0, id="deepseek"),
+    pytest.param("Estimated probability: 9.5%", "deepseek/deepseek-r1:free", 9.5, id="deepseek-estimate"),
+    pytest.param("My final estimate: 44%", "qwen/qwen3-8b:free", 44.0, id="qwen"),
+    pytest.param("My assessment: 27%", "qwen/qwen3-8b:free", 27.0, id="qwen-assessment"),
+    # JSON tier
+    pytest.param('{"probability": 48}', "", 48.0, id="json"),
+    pytest.param('"probability": "35"%', "", 35.0, id="json-like"),
+    pytest.param("probability: 29", "", 29.0, id="json-unquoted"),
+    # Keyword and fallback tiers
+    pytest.param("Forecast:\n about 40-60", "", 60.0, id="forecast-keyword"),
+    pytest.param("Wahrscheinlichkeit: 0.7", "", 0.7, id="german-keyword"),
+    pytest.param("Answer:\n62 %", "", 62.0, id="answer-keyword"),
+    pytest.param("probability: 180%\nResult: 15%", "", 15.0, id="skips-out-of-range"),
+    pytest.param("In conclusion, 41%", "", 41.0, id="conclusion"),
+    pytest.param("approximately 83%", "", 83.0, id="percent-fallback"),
+    pytest.param("x = 45", "", 45.0, id="equation-fallback"),
+    pytest.param("text with 7.25 numbers", "", 7.25, id="bare-number"),
+    pytest.param("some text 250 and 75", "", 75.0, id="bare-number-in-range"),
+    pytest.param("50-50 chance", "", 50.0, id="range"),
+    # Nothing to extract
+    pytest.param("nothing here", "", None, id="no-number"),
+    pytest.param("Rejected: I cannot comply with this", "", None, id="rejection"),
+    pytest.param("", "", None, id="empty"),
+]
+
+
+@pytest.mark.parametrize("content, model, expected", EXTRACTION_CASES)
+def test_extract_probability(client, content, model, expected):
+    assert client._extract_probability(content, model) == expected
+
+
+@pytest.mark.parametrize("content, model, expected", EXTRACTION_CASES)
+def test_extract_probability_with_precomputed_lowercase(client, content, model, expected):
+    assert client._extract_probability(content, model, content.lower()) == expected
+
+
+def test_extract_probability_none_content(client):
+    assert client._extract_probability(None) is None
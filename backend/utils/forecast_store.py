@@ -0,0 +1,133 @@
+"""
+Shared forecast state for multi-worker deployments
+
+The worker running a forecast keeps its state in memory; when REDIS_URL is set,
+every state change is mirrored to Redis with a TTL so that any worker can
+answer status polls and accept cancellations. The same connection backs a
+shared cache of model responses.
+"""
+import time
+import orjson
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+try:
+    import zstandard
+    _cctx = zstandard.ZstdCompressor(level=3)
+    _dctx = zstandard.ZstdDecompressor()
+except ImportError:
+    zstandard = None
+
+# Leading byte of cached responses, identifying how the payload is encoded
+_RAW = b"\x00"
+_ZSTD = b"\x01"
+
+
+def _pack(value: Dict[str, Any]) -> bytes:
+    payload = orjson.dumps(value, default=str)
+    if zstandard is None:
+        return _RAW + payload
+    return _ZSTD + _cctx.compress(payload)
+
+
+def _unpack(blob: bytes) -> Optional[Dict[str, Any]]:
+    codec, payload = blob[:1], blob[1:]
+    if codec == _RAW:
+        return orjson.loads(payload)
+    if codec == _ZSTD and zstandard is not None:
+        return orjson.loads(_dctx.decompress(payload))
+    # Unknown encoding (e.g. written by a newer worker): treat as a miss
+    return None
+
+
+# Coalesced progress writes are flushed once progress moves this far or this long has passed
+PROGRESS_STEP = 5
+PROGRESS_INTERVAL = 0.25
+
+
+class ForecastStore:
+    """Optional Redis mirror of forecast state"""
+
+    def __init__(self, url: Optional[str] = None, ttl: int = 3600):
+        self.ttl = ttl
+        self._redis = aioredis.from_url(url) if url and REDIS_AVAILABLE else None
+        # forecast_id -> (progress, monotonic time) of the last write
+        self._last_flush: Dict[str, Tuple[int, float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    @staticmethod
+    def _key(forecast_id: str) -> str:
+        return f"forecast:{forecast_id}"
+
+    def _due(self, forecast_id: str, progress: int, now: float) -> bool:
+        last = self._last_flush.get(forecast_id)
+        return (
+            last is None
+            or progress - last[0] >= PROGRESS_STEP
+            or now - last[1] >= PROGRESS_INTERVAL
+        )
+
+    async def save(self, forecast_id: str, state: Dict[str, Any], coalesce: bool = False) -> bool:
+        """
+        Store the forecast state, refreshing its TTL
+
+        With coalesce=True the write is skipped unless progress has advanced enough
+        since the last one. The state write and the cancellation check share one
+        pipelined round trip; returns whether another worker requested cancellation.
+        """
+        if self._redis is None:
+            return False
+
+        now = time.monotonic()
+        if coalesce and not self._due(forecast_id, state["progress"], now):
+            return False
+        if state["status"] == "running":
+            self._last_flush[forecast_id] = (state["progress"], now)
+        else:
+            self._last_flush.pop(forecast_id, None)
+
+        key = self._key(forecast_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(key, orjson.dumps(state, default=str), ex=self.ttl)
+            pipe.exists(f"{key}:cancel")
+            _, cancelled = await pipe.execute()
+        return bool(cancelled)
+
+    async def load(self, forecast_id: str) -> Optional[Dict[str, Any]]:
+        """Load forecast state written by any worker"""
+        if self._redis is None:
+            return None
+        payload = await self._redis.get(self._key(forecast_id))
+        return orjson.loads(payload) if payload else None
+
+    async def request_cancel(self, forecast_id: str):
+        """Flag a forecast owned by another worker for cancellation"""
+        if self._redis is None:
+            return
+        await self._redis.set(f"{self._key(forecast_id)}:cancel", 1, ex=self.ttl)
+
+    async def get_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """Fetch a cached model response shared between workers"""
+        if self._redis is None:
+            return None
+        blob = await self._redis.get(key)
+        return _unpack(blob) if blob else None
+
+    async def set_response(self, key: str, response: Dict[str, Any], ttl: int):
+        """Cache a model response, zstd-compressed when available"""
+        if self._redis is None:
+            return
+        await self._redis.set(key, _pack(response), ex=ttl)
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
@@ -310,7 +310,9 @@ class ForesightVisuals:
                 model_probs[model].append(response.probability)
 
         if model_probs:
-            ax2.boxplot(model_probs.values(), labels=model_probs.keys())
+            # Tick labels are set separately: boxplot's labels= was removed in matplotlib 3.11
+            ax2.boxplot(list(model_probs.values()))
+            ax2.set_xticks(range(1, len(model_probs) + 1), labels=list(model_probs))
             ax2.set_ylabel('Probability (%)')
             ax2.set_title('Probability Range by Model', fontsize=14, fontweight='bold')
             ax2.tick_params(axis='x', rotation=45)
@@ -357,8 +359,8 @@ class ForesightVisuals:
             ax.scatter(model_times, model_probs, label=model,
                       color=colors[i], s=60, alpha=0.7)
 
-        # Add trend line
-        if len(timestamps) > 1:
+        # Add trend line (needs at least two distinct sample times)
+        if len(set(timestamps)) > 1:
             # Convert timestamps to numbers for trend calculation
             time_nums = [(t - timestamps[0]).total_seconds() for t in timestamps]
             z = np.polyfit(time_nums, probabilities, 1)